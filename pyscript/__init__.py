@@ -6,18 +6,19 @@ This language is not isolated and is directly integrated with the Python's libra
 if __import__('sys').version_info < (3, 10):
     raise ImportError("Python version 3.10 and above is required to run PyScript")
 
+# `python -m pyscript` runs in the fork server when there is one, before importing the core
+if __import__('os').environ.get('PYSCRIPT_SERVER'):
+    from . import server
+    server.run_as_client()
+
 from . import core
 
 from .core.constants import (
     DEFAULT, NO_COLOR, DEBUG, SILENT, RETURN_RESULT, DONT_SHOW_BANNER_ON_SHELL, CLASSIC_LINE_SHELL, NO_COLOR_PROMPT,
-    NOTEBOOK, LEXER_HIGHLIGHT, DICT_TO_JSDICT
+    COMPILE_CLOSURE, NOTEBOOK, LEXER_HIGHLIGHT, DICT_TO_JSDICT, OPTIMIZE
 )
 from .core.cache import undefined
-from .core.highlight import (
-    HLFMT_HTML, HLFMT_ANSI, HLFMT_BBCODE, pys_highlight, PygmentsPyScriptStyle, PygmentsPyScriptLexer,
-    PygmentsPyScriptShellLexer
-)
-from .core.runner import pys_runner, pys_exec, pys_eval, pys_require, pys_shell
+from .core.runner import pys_runner, pys_compile, pys_exec, pys_eval, pys_require, pys_shell
 from .core.version import version, version_info, __version__, __date__, __author__
 
 __all__ = (
@@ -30,9 +31,11 @@ __all__ = (
     'DONT_SHOW_BANNER_ON_SHELL',
     'CLASSIC_LINE_SHELL',
     'NO_COLOR_PROMPT',
+    'COMPILE_CLOSURE',
     'NOTEBOOK',
     'LEXER_HIGHLIGHT',
     'DICT_TO_JSDICT',
+    'OPTIMIZE',
     'HLFMT_HTML',
     'HLFMT_ANSI',
     'HLFMT_BBCODE',
@@ -40,7 +43,9 @@ __all__ = (
     'version',
     'version_info',
     'pys_highlight',
+    'pys_highlight_iter',
     'pys_runner',
+    'pys_compile',
     'pys_exec',
     'pys_eval',
     'pys_require',
@@ -48,4 +53,24 @@ __all__ = (
     'PygmentsPyScriptStyle',
     'PygmentsPyScriptLexer',
     'PygmentsPyScriptShellLexer'
-)
\ No newline at end of file
+)
+
+# imported on first use (PEP 562), the highlighter loads pygments
+_LAZY_ATTRIBUTES = {
+    name: 'highlight'
+    for name in (
+        'HLFMT_HTML', 'HLFMT_ANSI', 'HLFMT_BBCODE', 'pys_highlight', 'pys_highlight_iter', 'PygmentsPyScriptStyle',
+        'PygmentsPyScriptLexer', 'PygmentsPyScriptShellLexer'
+    )
+}
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name, None)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = globals()[name] = getattr(getattr(core, module), name)
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
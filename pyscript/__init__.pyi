@@ -6,6 +6,8 @@ if TYPE_CHECKING:
     from .core.context import PysContext
     from .core.highlight import PysHighlightFormatter
     from .core.position import PysPosition
+    from .core.profiler import PysProfiler
+    from .core.pystypes import PysCompiledCode
     from .core.results import PysExecuteResult
     from .core.symtab import PysSymbolTable
     from .core.version import PysVersionInfo
@@ -28,9 +30,11 @@ RETURN_RESULT: int
 DONT_SHOW_BANNER_ON_SHELL: int
 CLASSIC_LINE_SHELL: int
 NO_COLOR_PROMPT: int
+COMPILE_CLOSURE: int
 NOTEBOOK: int
 LEXER_HIGHLIGHT: int
 DICT_TO_JSDICT: int
+OPTIMIZE: int
 
 HLFMT_HTML: PysHighlightFormatter
 HLFMT_ANSI: PysHighlightFormatter
@@ -59,24 +63,34 @@ def pys_highlight(
 ) -> str: ...
 
 def pys_runner(
-    file: PysFileBuffer,
+    file: PysFileBuffer | PysCompiledCode,
     mode: Literal['exec', 'eval', 'single'],
     symbol_table: PysSymbolTable,
     flags: Optional[int] = None,
     parser_flags: int = DEFAULT,
     context_parent: Optional[PysContext] = None,
-    context_parent_entry_position: Optional[PysPosition] = None
+    context_parent_entry_position: Optional[PysPosition] = None,
+    use_cache: bool = False,
+    compile_cache: bool = False,
+    profiler: Optional[PysProfiler] = None
 ) -> PysExecuteResult: ...
 
-def pys_exec(
+def pys_compile(
     source: str | bytes | bytearray | Iterable | BuiltinMethodType | IOBase | PysFileBuffer,
+    mode: Literal['exec', 'eval', 'single'] = 'exec',
+    flags: int = DEFAULT,
+    parser_flags: int = DEFAULT
+) -> PysCompiledCode: ...
+
+def pys_exec(
+    source: str | bytes | bytearray | Iterable | BuiltinMethodType | IOBase | PysFileBuffer | PysCompiledCode,
     globals: Optional[dict[str, Any] | PysSymbolTable | PysUndefined] = None,
     flags: int = DEFAULT,
     parser_flags: int = DEFAULT
 ) -> None | PysExecuteResult: ...
 
 def pys_eval(
-    source: str | bytes | bytearray | Iterable | BuiltinMethodType | IOBase | PysFileBuffer,
+    source: str | bytes | bytearray | Iterable | BuiltinMethodType | IOBase | PysFileBuffer | PysCompiledCode,
     globals: Optional[dict[str, Any] | PysSymbolTable | PysUndefined] = None,
     flags: int = DEFAULT,
     parser_flags: int = DEFAULT
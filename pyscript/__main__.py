@@ -2,13 +2,9 @@ from .core.buffer import PysFileBuffer
 from .core.cache import pys_sys, undefined
 from .core.constants import (
     ENV_PYSCRIPT_NO_COLOR_PROMPT, ENV_PYSCRIPT_CLASSIC_LINE_SHELL, DEFAULT, DEBUG, NO_COLOR, DONT_SHOW_BANNER_ON_SHELL,
-    CLASSIC_LINE_SHELL, NO_COLOR_PROMPT, NOTEBOOK
-)
-from .core.editor.gui import PysGUIEditor, GUI_SUPPORT
-from .core.editor.terminal import PysTerminalEditor, TERMINAL_SUPPORT
-from .core.highlight import (
-    PYGMENTS, HLFMT_HTML, HLFMT_ANSI, HLFMT_BBCODE, pys_highlight, PygmentsPyScriptStyle, PygmentsPyScriptLexer
+    CLASSIC_LINE_SHELL, NO_COLOR_PROMPT, COMPILE_CLOSURE, NOTEBOOK, OPTIMIZE
 )
+from .core.profiler import PysProfiler
 from .core.runner import _namespace_to_symbol_table, pys_runner, pys_shell
 from .core.utils.debug import USE_NOTEBOOK
 from .core.utils.generic import is_environ
@@ -16,41 +12,44 @@ from .core.utils.module import find_module_path, remove_python_path
 from .core.utils.path import getcwd, base, normpath
 from .core.version import __version__
 
-if PYGMENTS:
-    from pygments import highlight
-    from pygments.formatters import (
-        BBCodeFormatter, HtmlFormatter, LatexFormatter, TerminalFormatter, TerminalTrueColorFormatter,
-        Terminal256Formatter
-    )
-
-    FORMATER_PYGMENTS_MAP = {
-        'pm-bbcode': BBCodeFormatter,
-        'pm-html': HtmlFormatter,
-        'pm-latex': LatexFormatter,
-        'pm-terminal': TerminalFormatter,
-        'pm-true-terminal': TerminalTrueColorFormatter,
-        'pm-256-terminal': Terminal256Formatter
-    }
-
 from argparse import OPTIONAL, REMAINDER, ArgumentParser
+from importlib import import_module
+from importlib.machinery import PathFinder
 
 import sys
 
+# the editors, the highlighter and pygments are imported when they are used, the optional packages are only looked up
+PYGMENTS = PathFinder.find_spec('pygments') is not None
+# some builds ship the tkinter package without its extension module, tkinter cannot be imported there
+TKINTER = (
+    PathFinder.find_spec('tkinter') is not None and
+    ('_tkinter' in sys.builtin_module_names or PathFinder.find_spec('_tkinter') is not None)
+)
+
 FORMATER_HIGHLIGHT_MAP = {
-    'html': HLFMT_HTML,
-    'ansi': HLFMT_ANSI,
-    'bbcode': HLFMT_BBCODE
+    'html': 'HLFMT_HTML',
+    'ansi': 'HLFMT_ANSI',
+    'bbcode': 'HLFMT_BBCODE'
+}
+
+FORMATER_PYGMENTS_MAP = {
+    'pm-bbcode': 'BBCodeFormatter',
+    'pm-html': 'HtmlFormatter',
+    'pm-latex': 'LatexFormatter',
+    'pm-terminal': 'TerminalFormatter',
+    'pm-true-terminal': 'TerminalTrueColorFormatter',
+    'pm-256-terminal': 'Terminal256Formatter'
 }
 
 EDITOR_MAP = {
     name: cls
     for support, name, cls in [
-        (GUI_SUPPORT,      'gui',      PysGUIEditor),
-        (TERMINAL_SUPPORT, 'terminal', PysTerminalEditor)
+        (TKINTER,                                                         'gui',      'PysGUIEditor'),
+        (PYGMENTS and PathFinder.find_spec('prompt_toolkit') is not None, 'terminal', 'PysTerminalEditor')
     ] if support
 }
 
-arguments_requiring_value = {'-l', '--highlight', '-r', '--py-recursion'}
+arguments_requiring_value = {'-l', '--highlight', '-r', '--py-recursion', '--profile-output'}
 
 parser = ArgumentParser(
     prog=f'{base(sys.executable)} -m pyscript',
@@ -119,6 +118,12 @@ parser.add_argument(
     help="suppress colored output"
 )
 
+parser.add_argument(
+    '-o', '--optimize',
+    action='store_true',
+    help="fold constant expressions and remove unreachable branches before running the code"
+)
+
 parser.add_argument(
     '-p', '--no-color-prompt',
     action='store_true',
@@ -151,12 +156,45 @@ parser.add_argument(
     version=f"PyScript {__version__}",
 )
 
+parser.add_argument(
+    '-C', '--compile-closure',
+    action='store_true',
+    help="compile the code into Python closures before running it, faster on loop-heavy code"
+)
+
 parser.add_argument(
     '-P',
     action='store_true',
     help="don't prepend a potentially unsafe path to sys.path (python sys.path)"
 )
 
+parser.add_argument(
+    '--profile',
+    action='store_true',
+    help="profile the program and print the time spent in each function and line to stderr"
+)
+
+parser.add_argument(
+    '--profile-output',
+    type=str,
+    default=None,
+    metavar='FILE',
+    help="profile the program and write the result to a file, in the collapsed stack format (flamegraph) if the file "
+         "ends with .folded or .collapsed, otherwise in the pstats format"
+)
+
+parser.add_argument(
+    '--server',
+    type=str,
+    nargs=OPTIONAL,
+    const='',
+    default=None,
+    metavar='SOCKET',
+    help="run a server that keeps PyScript imported and forks a process for each `python -m pyscript` started with "
+         "the PYSCRIPT_SERVER environment variable set to its Unix socket (default: PYSCRIPT_SERVER or a file in the "
+         "temporary directory)"
+)
+
 parser.add_argument(
     'file',
     type=str,
@@ -199,6 +237,14 @@ while index < argc:
 args = parser.parse_args(argv if arg_index == -1 else argv[:arg_index])
 arg  = args.arg               if arg_index == -1 else argv[arg_index:]
 
+if args.server is not None:
+    from .server import pys_server
+
+    try:
+        sys.exit(pys_server(args.server or None, args.q))
+    except OSError as e:
+        argument_error('--server', e)
+
 if args.terminal:
 
     for fd in (sys.stdout, sys.stderr, sys.stdin):
@@ -240,11 +286,14 @@ for condition, flag in [
     (args.no_color           or is_environ('NO_COLOR'),                      NO_COLOR),
     (args.no_color_prompt    or is_environ(ENV_PYSCRIPT_NO_COLOR_PROMPT),    NO_COLOR_PROMPT),
     (args.debug,                                                             DEBUG),
+    (args.compile_closure,                                                   COMPILE_CLOSURE),
     (args.q,                                                                 DONT_SHOW_BANNER_ON_SHELL)
 ]:
     if condition:
         flags |= flag
 
+parser_flags = OPTIMIZE if args.optimize else DEFAULT
+
 if args.P:
     for cwd in {'', '.', getcwd()}:
         remove_python_path(cwd)
@@ -255,16 +304,14 @@ def clean_up() -> None:
     g = globals()
 
     for name in {
-        'ArgumentParser', 'BBCodeFormatter', 'CLASSIC_LINE_SHELL', 'DEBUG', 'DEFAULT', 'EDITOR_MAP',
+        'ArgumentParser', 'CLASSIC_LINE_SHELL', 'COMPILE_CLOSURE', 'DEBUG', 'DEFAULT', 'EDITOR_MAP',
         'ENV_PYSCRIPT_CLASSIC_LINE_SHELL', 'ENV_PYSCRIPT_NO_COLOR_PROMPT', 'FORMATER_HIGHLIGHT_MAP',
-        'FORMATER_PYGMENTS_MAP', 'GUI_SUPPORT', 'HLFMT_ANSI', 'HLFMT_BBCODE', 'HLFMT_HTML', 'HtmlFormatter',
-        'LatexFormatter', 'NOTEBOOK', 'NO_COLOR', 'NO_COLOR_PROMPT', 'OPTIONAL', 'PYGMENTS', 'PygmentsPyScriptLexer',
-        'PygmentsPyScriptStyle', 'PysFileBuffer', 'PysGUIEditor', 'PysTerminalEditor', 'REMAINDER', 'TERMINAL_SUPPORT',
-        'Terminal256Formatter', 'TerminalFormatter', 'TerminalTrueColorFormatter', 'USE_NOTEBOOK', '__version__',
+        'FORMATER_PYGMENTS_MAP', 'NOTEBOOK', 'NO_COLOR', 'NO_COLOR_PROMPT', 'OPTIMIZE', 'OPTIONAL', 'PYGMENTS',
+        'PysFileBuffer', 'PysProfiler', 'REMAINDER', 'TKINTER', 'USE_NOTEBOOK', '__version__',
         '_namespace_to_symbol_table', 'arg', 'arg_index', 'argc', 'args', 'argument_error', 'arguments_requiring_value',
-        'argv', 'base', 'clean_up', 'condition', 'ctypes', 'execute', 'fd', 'file', 'find_module_path', 'flag',
-        'getcwd', 'highlight', 'i', 'index', 'is_environ', 'kernel32', 'load_file', 'module_path', 'parser',
-        'pys_highlight', 'pys_sys', 'remove_python_path'
+        'argv', 'base', 'clean_up', 'condition', 'ctypes', 'execute', 'fd', 'file', 'find_module_path', 'PathFinder',
+        'flag', 'getcwd', 'i', 'import_module', 'index', 'is_environ', 'kernel32', 'load_file', 'module_path',
+        'parser', 'pys_server', 'pys_sys', 'remove_python_path'
     }:
         try:
             del g[name]
@@ -297,6 +344,9 @@ def execute(file: PysFileBuffer) -> None:
     global code
 
     inspect = args.inspect
+    profile = args.profile
+    profile_output = args.profile_output
+    profiler = PysProfiler() if profile or profile_output else None
     symtab = _namespace_to_symbol_table(undefined, file)
 
     clean_up()
@@ -305,11 +355,22 @@ def execute(file: PysFileBuffer) -> None:
         file=file,
         mode='exec',
         symbol_table=symtab,
-        flags=flags
+        flags=flags,
+        parser_flags=parser_flags,
+        profiler=profiler
     )
 
     code, _ = result.end_process()
 
+    if profile_output:
+        try:
+            profiler.dump(profile_output)
+        except OSError as e:
+            print(f"Can't write profile output: {e}", file=sys.stderr)
+
+    if profile:
+        profiler.print_stats(file=sys.stderr)
+
     if inspect:
         if sys.stdout.closed or sys.stderr.closed:
             code = 1
@@ -329,30 +390,39 @@ if args.file is not None:
 
     if EDITOR_MAP and args.editor:
         try:
-            EDITOR_MAP[args.editor](file=file, colored=not (flags & NO_COLOR)).run()
+            getattr(import_module(f'.core.editor.{args.editor}', __package__), EDITOR_MAP[args.editor])(
+                file=file,
+                colored=not (flags & NO_COLOR)
+            ).run()
         except BaseException as e:
             argument_error('-e/--editor', e)
 
     elif args.highlight:
         try:
+            from .core import highlight
+
+            # the highlighted code is written to stdout as it is made
             if args.highlight in FORMATER_HIGHLIGHT_MAP:
-                print(
-                    pys_highlight(
-                        source=file,
-                        formatter=FORMATER_HIGHLIGHT_MAP[args.highlight]
-                    )
+                highlight.pys_highlight(
+                    source=file,
+                    formatter=getattr(highlight, FORMATER_HIGHLIGHT_MAP[args.highlight]),
+                    file=sys.stdout
                 )
             else:
-                print(
-                    highlight(
-                        code=file.text,
-                        lexer=PygmentsPyScriptLexer(),
-                        formatter=FORMATER_PYGMENTS_MAP[args.highlight](
-                            style=PygmentsPyScriptStyle,
-                            full=True
-                        )
-                    )
+                import pygments
+                import pygments.formatters
+
+                pygments.highlight(
+                    code=file.text,
+                    lexer=highlight.PygmentsPyScriptLexer(),
+                    formatter=getattr(pygments.formatters, FORMATER_PYGMENTS_MAP[args.highlight])(
+                        style=highlight.PygmentsPyScriptStyle,
+                        full=True
+                    ),
+                    outfile=sys.stdout
                 )
+
+            print()
         except BaseException as e:
             argument_error('-l/--highlight', e)
 
@@ -376,7 +446,8 @@ else:
     clean_up()
     code = pys_shell(
         globals=undefined,
-        flags=flags
+        flags=flags,
+        parser_flags=parser_flags
     )
 
 # goodbye ;)
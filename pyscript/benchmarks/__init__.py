@@ -0,0 +1,14 @@
+"""
+Performance benchmarks of PyScript, run the whole suite with `python -m pyscript.benchmarks`, the lexer throughput
+benchmark with `python -m pyscript.benchmarks.lexer`, the parser benchmark with `python -m pyscript.benchmarks.parser`,
+the import time benchmark with `python -m pyscript.benchmarks.imports`, the type checking benchmark with
+`python -m pyscript.benchmarks.typecheck` or the fused node patterns microbenchmark with
+`python -m pyscript.benchmarks.patterns` (all are run as main modules, so they are not imported here).
+"""
+
+from . import corpus, suite
+
+__all__ = (
+    'corpus',
+    'suite'
+)
\ No newline at end of file
@@ -0,0 +1,104 @@
+from ..core.constants import DEFAULT, COMPILE_CLOSURE
+from .corpus import get_corpus
+from .suite import benchmark_script, compare_baseline, format_results, load_baseline, new_baseline, save_baseline
+
+from argparse import ArgumentParser
+from fnmatch import fnmatch
+
+import sys
+
+parser = ArgumentParser(
+    prog='python -m pyscript.benchmarks',
+    description="PyScript benchmark suite, times the lexer, parser, analyzer and execution stages of each script"
+)
+
+parser.add_argument(
+    '-b', '--baseline',
+    type=str,
+    default=None,
+    metavar='FILE',
+    help="compare the results with a JSON baseline and exit with status 1 if a stage regresses"
+)
+
+parser.add_argument(
+    '-k', '--select',
+    type=str,
+    default=None,
+    metavar='PATTERN',
+    help="only run the scripts whose name matches a glob pattern"
+)
+
+parser.add_argument(
+    '-n', '--repeat',
+    type=int,
+    default=5,
+    help="number of runs per stage, the best time is reported (default: 5)"
+)
+
+parser.add_argument(
+    '-o', '--output',
+    type=str,
+    default=None,
+    metavar='FILE',
+    help="save the results as a JSON baseline"
+)
+
+parser.add_argument(
+    '-s', '--scale',
+    type=int,
+    default=1,
+    help="size multiplier of the synthetic scripts (default: 1)"
+)
+
+parser.add_argument(
+    '-t', '--threshold',
+    type=float,
+    default=0.25,
+    help="allowed growth of time and peak memory over the baseline (default: 0.25, 25%%)"
+)
+
+parser.add_argument(
+    '-C', '--compile-closure',
+    action='store_true',
+    help="execute the scripts with closures (COMPILE_CLOSURE) instead of the tree-walk interpreter"
+)
+
+parser.add_argument(
+    '-E', '--no-examples',
+    action='store_true',
+    help="only run the synthetic scripts"
+)
+
+parser.add_argument(
+    '-M', '--no-memory',
+    action='store_true',
+    help="don't measure the peak memory (the measurement runs every stage once more)"
+)
+
+args = parser.parse_args()
+flags = COMPILE_CLOSURE if args.compile_closure else DEFAULT
+results = {}
+
+for script in get_corpus(args.scale, not args.no_examples):
+    if args.select is None or fnmatch(script.name, args.select):
+        results[script.name] = benchmark_script(script, args.repeat, flags, not args.no_memory)
+
+format_results(results)
+
+if args.output:
+    save_baseline(args.output, new_baseline(results, flags, args.scale))
+
+if args.baseline:
+    baseline = load_baseline(args.baseline)
+    regressions = compare_baseline(results, baseline, args.threshold)
+
+    if baseline.get('flags') != flags or baseline.get('scale') != args.scale:
+        print(f"\nwarning: {args.baseline} was recorded with other options (-C or -s)", file=sys.stderr)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.baseline}:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"\nno regressions over {args.baseline}")
\ No newline at end of file
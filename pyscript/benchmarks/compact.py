@@ -0,0 +1,99 @@
+"""
+Memory benchmark of the compact tree form, reports the traced memory per node of the analyzed nodes and of their
+compact form (`pyscript.core.compact`). This is the memory at rest: a compact code object replaces its compact form
+with the expanded node when it is executed for the first time (see `PysCompiledCode.get_node`).
+
+Usage: python -m pyscript.benchmarks.compact [FILE ...]
+Without files, the PyScript scripts of the standard library are used.
+"""
+
+from ..core.analyzer import PysAnalyzer
+from ..core.buffer import PysFileBuffer
+from ..core.compact import compact_node
+from ..core.constants import SILENT
+from ..core.lexer import PysLexer
+from ..core.nodes import PysNode
+from ..core.parser import PysParser
+from .lexer import get_library_files
+
+from argparse import ArgumentParser
+from typing import Any, Callable, Optional
+
+import gc
+import os
+import tracemalloc
+
+def parse_file(file: PysFileBuffer) -> PysNode:
+    tokens, error = PysLexer(file, SILENT).make_tokens()
+    if error:
+        raise SyntaxError(f"{file.name}: {error.exception}")
+
+    parser = PysParser(tokens, SILENT)
+    node, error = parser.parse()
+
+    if not error:
+        error = PysAnalyzer(node, parser.flags).analyze()
+    if error:
+        raise SyntaxError(f"{file.name}: {error.exception}")
+
+    return node
+
+def measure(make: Callable[[], Any]) -> int:
+
+    """
+    Returns the traced memory in bytes kept by the object that `make` returns.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        value = make()
+        # the collection also empties the free lists that keep the temporary objects of `make`
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del value
+    return size
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(prog='python -m pyscript.benchmarks.compact', description="PyScript compact tree benchmark")
+    parser.add_argument('files', nargs='*', help="files to parse (default: the standard library scripts)")
+    args = parser.parse_args(argv)
+
+    total_nodes = 0
+    total_nodes_size = 0
+    total_compact_size = 0
+
+    print(f"{'file':<40} {'nodes':>7} {'node B':>8} {'compact B':>10} {'ratio':>7}")
+
+    for path in args.files or get_library_files():
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+
+        file = PysFileBuffer(text, path)
+        tree = compact_node(parse_file(file))
+        count = len(tree)
+
+        # both forms are made from the same tree, so the interned constants are shared and not counted
+        nodes_size = measure(tree.expand)
+        compact_size = measure(lambda : compact_node(tree.expand()))
+
+        total_nodes += count
+        total_nodes_size += nodes_size
+        total_compact_size += compact_size
+
+        print(
+            f"{os.path.basename(path)[-40:]:<40} {count:7} {nodes_size / count:8.1f} {compact_size / count:10.1f} "
+            f"{nodes_size / compact_size:6.2f}x"
+        )
+
+    print(
+        f"{'total':<40} {total_nodes:7} {total_nodes_size / total_nodes:8.1f} {total_compact_size / total_nodes:10.1f} "
+        f"{total_nodes_size / total_compact_size:6.2f}x"
+    )
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Scripts measured by the benchmark suite: synthetic stress scripts and the examples of the repository.
+"""
+
+from ..core.bases import Pys
+from ..core.constants import PYSCRIPT_PATH
+
+import os
+
+EXAMPLES_PATH = os.path.join(os.path.dirname(PYSCRIPT_PATH), 'examples')
+
+# examples that run quickly without user input, a display or third-party packages, the others are only compiled
+EXECUTABLE_EXAMPLES = frozenset({
+    'add-bitwise', 'breadth-first-search', 'custom-base', 'denxor', 'factorial', 'fibonaci', 'sha256', 'trigonometry'
+})
+
+class PysBenchmarkScript(Pys):
+
+    __slots__ = ('name', 'text', 'executable')
+
+    def __init__(self, name: str, text: str, executable: bool = True) -> None:
+        self.name = name
+        self.text = text
+        self.executable = executable
+
+    def __repr__(self) -> str:
+        return f'<BenchmarkScript {self.name!r}>'
+
+def deep_recursion(scale: int = 1) -> PysBenchmarkScript:
+    # a PyScript call takes several Python frames, about 160 levels fit in the default recursion limit of Python
+    return PysBenchmarkScript(
+        'deep-recursion',
+        "func depth(n) {\n"
+        "    if (n == 0) {\n"
+        "        return 0\n"
+        "    }\n"
+        "    return 1 + depth(n - 1)\n"
+        "}\n"
+        "\n"
+        "total = 0\n"
+        f"for (i = 0; i < {60 * scale}; i++) {{\n"
+        "    total += depth(100)\n"
+        "}\n"
+    )
+
+def tight_loops(scale: int = 1) -> PysBenchmarkScript:
+    return PysBenchmarkScript(
+        'tight-loops',
+        "total = 0\n"
+        "i = 0\n"
+        f"while (i < {50000 * scale}) {{\n"
+        "    total += i * 2 % 7\n"
+        "    i++\n"
+        "}\n"
+        "\n"
+        f"for (j of range({50000 * scale})) {{\n"
+        "    if (j & 1) {\n"
+        "        total -= j >> 3\n"
+        "    } else {\n"
+        "        total += 1\n"
+        "    }\n"
+        "}\n"
+    )
+
+def big_literals(scale: int = 1) -> PysBenchmarkScript:
+    numbers = ', '.join(str(number * 7919 % 100003) for number in range(5000 * scale))
+    table = ', '.join(f"'key{index}': [{index}, {index}.5, 'value{index}']" for index in range(1000 * scale))
+    string = 'lorem ipsum dolor sit amet ' * (200 * scale)
+
+    return PysBenchmarkScript(
+        'big-literals',
+        f"numbers = [{numbers}]\n"
+        f"table = {{{table}}}\n"
+        f"text = '{string}'\n"
+        "total = len(numbers) + len(table) + len(text)\n"
+    )
+
+def many_functions(scale: int = 1) -> PysBenchmarkScript:
+    count = 1000 * scale
+
+    return PysBenchmarkScript(
+        'many-functions',
+        ''.join(
+            f"func f{index}(a, b = {index}) {{\n"
+            "    c = a + b\n"
+            "    return c * 2\n"
+            "}\n"
+            for index in range(count)
+        ) +
+        "\n"
+        "total = 0\n" +
+        ''.join(f"total += f{index}({index})\n" for index in range(count))
+    )
+
+def exception_handling(scale: int = 1) -> PysBenchmarkScript:
+    return PysBenchmarkScript(
+        'exception-handling',
+        "total = 0\n"
+        f"for (i = 0; i < {10000 * scale}; i++) {{\n"
+        "    try {\n"
+        "        throw ValueError(i)\n"
+        "    } catch (ValueError as error) {\n"
+        "        total += 1\n"
+        "    }\n"
+        "\n"
+        "    try {\n"
+        "        total += {}[i]\n"
+        "    } catch (KeyError) {\n"
+        "        total += 2\n"
+        "    }\n"
+        "}\n"
+    )
+
+def method_calls(scale: int = 1) -> PysBenchmarkScript:
+    return PysBenchmarkScript(
+        'method-calls',
+        "class Counter {\n"
+        "    constructor(step) {\n"
+        "        self.count = 0\n"
+        "        self.step = step\n"
+        "    }\n"
+        "\n"
+        "    func add(self, value) {\n"
+        "        self.count += value * self.step\n"
+        "    }\n"
+        "\n"
+        "    func get(self) {\n"
+        "        return self.count\n"
+        "    }\n"
+        "}\n"
+        "\n"
+        "class Doubler(Counter) {\n"
+        "    func add(self, value) {\n"
+        "        Counter.add(self, value * 2)\n"
+        "    }\n"
+        "}\n"
+        "\n"
+        "counters = [Counter(1), Doubler(3)]\n"
+        "total = 0\n"
+        f"for (i = 0; i < {10000 * scale}; i++) {{\n"
+        "    counter = counters[i & 1]\n"
+        "    counter.add(i)\n"
+        "    total += counter.get()\n"
+        "}\n"
+    )
+
+SYNTHETIC_SCRIPTS = (deep_recursion, tight_loops, big_literals, many_functions, exception_handling, method_calls)
+
+def get_examples() -> list[PysBenchmarkScript]:
+
+    """
+    Returns the examples of the repository, an empty list if the examples directory is not available (installed
+    package).
+    """
+
+    if not os.path.isdir(EXAMPLES_PATH):
+        return []
+
+    scripts = []
+
+    for name in sorted(os.listdir(EXAMPLES_PATH)):
+        path = os.path.join(EXAMPLES_PATH, name)
+        if not (name.endswith('.pys') and os.path.isfile(path)):
+            continue
+
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+
+        name = name.removesuffix('.pys')
+        scripts.append(PysBenchmarkScript(f'examples/{name}', text, name in EXECUTABLE_EXAMPLES))
+
+    return scripts
+
+def get_corpus(scale: int = 1, examples: bool = True) -> list[PysBenchmarkScript]:
+    return [script(scale) for script in SYNTHETIC_SCRIPTS] + (get_examples() if examples else [])
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Import time benchmark, runs `python -X importtime -m pyscript -c "1"` (or the given arguments) and reports the
+cumulative import time of the modules of PyScript and of the third-party packages, the total import time, and whether
+the integrations loaded on first use (shells, editors, highlighter, pygments, prompt_toolkit) were imported.
+
+Usage: python -m pyscript.benchmarks.imports [-n REPEAT] [-a] [COMMAND ...]
+Without a command, `-c 1` is run.
+"""
+
+from argparse import ArgumentParser
+from subprocess import DEVNULL, PIPE, run
+from typing import Optional
+
+import os
+import sys
+
+# modules that a plain execution must not import
+LAZY_MODULES = (
+    'pyscript.core.shell',
+    'pyscript.core.editor.gui',
+    'pyscript.core.editor.terminal',
+    'pyscript.core.highlight',
+    'pygments',
+    'prompt_toolkit',
+    'tkinter'
+)
+
+def get_import_times(arguments: list[str]) -> dict[str, tuple[int, int, int]]:
+
+    """
+    Runs `python -X importtime -m pyscript` with `arguments`. Returns the imported modules in import order, as
+    {name: (self time, cumulative time, depth)}, the times in microseconds.
+    """
+
+    # the fork server would run the arguments without importing anything
+    environ = {name: value for name, value in os.environ.items() if name != 'PYSCRIPT_SERVER'}
+    process = run(
+        [sys.executable, '-X', 'importtime', '-m', 'pyscript', *arguments],
+        stdin=DEVNULL, stdout=DEVNULL, stderr=PIPE, env=environ, text=True
+    )
+
+    modules = {}
+
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        try:
+            self_time, cumulative_time, name = line.removeprefix('import time:').split('|')
+            self_time = int(self_time)
+            cumulative_time = int(cumulative_time)
+        except ValueError:
+            # the header of the report
+            continue
+
+        stripped_name = name.lstrip()
+        modules[stripped_name] = (self_time, cumulative_time, (len(name) - len(stripped_name) - 1) // 2)
+
+    return modules
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(prog='python -m pyscript.benchmarks.imports', description="PyScript import time benchmark")
+    parser.add_argument('-n', '--repeat', type=int, default=5, help="number of runs, the best is reported")
+    parser.add_argument('-a', '--all', action='store_true', help="report every module")
+    parser.add_argument('command', nargs='*', help="arguments of python -m pyscript (default: -c 1)")
+    args = parser.parse_args(argv)
+
+    arguments = args.command or ['-c', '1']
+    best = None
+
+    for _ in range(args.repeat):
+        modules = get_import_times(arguments)
+        if best is None or sum(times[0] for times in modules.values()) < sum(times[0] for times in best.values()):
+            best = modules
+
+    if not best:
+        print("no import time reported", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{'module':<40} {'cumulative (ms)':>16}")
+
+    for name, (_, cumulative_time, depth) in best.items():
+        # the modules of PyScript and the slow top-level modules, indented like in the report of Python
+        if (
+            args.all or
+            (name.startswith('pyscript') and cumulative_time >= 1000) or
+            (depth == 0 and cumulative_time >= 5000)
+        ):
+            print(f"{'  ' * depth + name:<40} {cumulative_time / 1000:16.2f}")
+
+    print(f"\n{'total':<40} {sum(times[0] for times in best.values()) / 1000:16.2f}\n")
+
+    for name in LAZY_MODULES:
+        print(f"{name:<40} {'imported' if name in best else 'not imported':>16}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Lexer throughput benchmark, reports the tokens per second of `PysLexer.make_tokens`.
+
+Usage: python -m pyscript.benchmarks.lexer [-n REPEAT] [-s SCALE] [-l] [FILE ...]
+Without files, the PyScript scripts of the standard library are used.
+"""
+
+from ..core.buffer import PysFileBuffer
+from ..core.constants import DEFAULT, SILENT, LEXER_HIGHLIGHT, LIBRARIES_PATH
+from ..core.lexer import PysLexer
+
+from argparse import ArgumentParser
+from math import inf
+from time import perf_counter
+from typing import Optional
+
+import os
+
+def get_library_files() -> list[str]:
+    return sorted(
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(LIBRARIES_PATH)
+        for name in names
+        if name.endswith('.pys')
+    )
+
+def benchmark_lexer(file: PysFileBuffer, parser_flags: int = DEFAULT, repeat: int = 5) -> tuple[int, float]:
+
+    """
+    Tokenizes a file `repeat` times. Returns the number of tokens and the best time in seconds.
+    """
+
+    tokens = None
+    best = inf
+
+    for _ in range(repeat):
+        start = perf_counter()
+        tokens, _ = PysLexer(file, SILENT, parser_flags).make_tokens()
+        best = min(best, perf_counter() - start)
+
+    return (0 if tokens is None else len(tokens)), best
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(prog='python -m pyscript.benchmarks.lexer', description="PyScript lexer benchmark")
+    parser.add_argument('-n', '--repeat', type=int, default=5, help="number of runs per file, the best is reported")
+    parser.add_argument('-s', '--scale', type=int, default=1, help="repeat the text of each file to make it larger")
+    parser.add_argument('-l', '--highlight', action='store_true', help="tokenize in the highlight (tolerant) mode")
+    parser.add_argument('files', nargs='*', help="files to tokenize (default: the standard library scripts)")
+    args = parser.parse_args(argv)
+
+    parser_flags = LEXER_HIGHLIGHT if args.highlight else DEFAULT
+    total_tokens = 0
+    total_time = 0.0
+
+    print(f"{'file':<40} {'KiB':>8} {'tokens':>9} {'seconds':>9} {'tokens/s':>12}")
+
+    for path in args.files or get_library_files():
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+
+        if args.scale > 1:
+            text = '\n'.join([text] * args.scale)
+
+        count, best = benchmark_lexer(PysFileBuffer(text, path), parser_flags, args.repeat)
+        total_tokens += count
+        total_time += best
+
+        print(
+            f"{os.path.basename(path)[-40:]:<40} {len(text) / 1024:8.1f} {count:9} {best:9.4f} "
+            f"{count / best if best else 0:12,.0f}"
+        )
+
+    print(
+        f"{'total':<40} {'':>8} {total_tokens:9} {total_time:9.4f} "
+        f"{total_tokens / total_time if total_time else 0:12,.0f}"
+    )
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
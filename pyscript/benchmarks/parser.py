@@ -0,0 +1,118 @@
+"""
+Parser benchmark, reports the time of `PysParser.parse` on pathological inputs of growing sizes (the time of a linear
+parser doubles with the size) and the tokens per second on real scripts.
+
+Usage: python -m pyscript.benchmarks.parser [-n REPEAT] [-d DOUBLINGS] [FILE ...]
+Without files, the PyScript scripts of the standard library are used.
+"""
+
+from ..core.buffer import PysFileBuffer
+from ..core.constants import SILENT
+from ..core.lexer import PysLexer
+from ..core.parser import PysParser
+from .lexer import get_library_files
+
+from argparse import ArgumentParser
+from math import inf
+from time import perf_counter
+from typing import Callable, Optional
+
+import os
+
+# inputs that backtrack or nest deeply, by size. The parser recurses on every nesting level (about 37 levels fit in the
+# default recursion limit of Python), the sizes that go past the limit are reported as skipped
+PATHOLOGICAL_INPUTS = {
+    'nested-dicts-sets': lambda size : 'x = ' + '{' * size + '1' + '}' * size,
+    'nested-tuples': lambda size : 'x = ' + '(' * size + '1' + ', 1)' * size,
+    'nested-parentheses': lambda size : 'x = ' + '(' * size + '1' + ')' * size,
+    'comma-list': lambda size : 'x = ' + ', '.join(['a'] * (size * 100)),
+    'dict-list': lambda size : 'x = [' + ', '.join(['{a: {b}}'] * (size * 20)) + ']'
+}
+
+def benchmark_parser(file: PysFileBuffer, repeat: int = 5) -> tuple[int, float]:
+
+    """
+    Parses a file `repeat` times. Returns the number of tokens and the best time in seconds.
+    """
+
+    tokens, error = PysLexer(file, SILENT).make_tokens()
+    if error:
+        raise SyntaxError(f"{file.name}: {error.exception}")
+
+    best = inf
+
+    for _ in range(repeat):
+        start = perf_counter()
+        _, error = PysParser(tokens, SILENT).parse()
+        best = min(best, perf_counter() - start)
+
+        if error:
+            raise SyntaxError(f"{file.name}: {error.exception}")
+
+    return len(tokens), best
+
+def benchmark_growth(
+    generate: Callable[[int], str],
+    doublings: int = 4,
+    start: int = 8,
+    repeat: int = 5
+) -> list[tuple[int, float | None]]:
+
+    """
+    Parses the generated input at `doublings` sizes starting from `start`, each size twice the previous one. Returns
+    the sizes with their best time in seconds, or None if the input nests beyond the recursion limit.
+    """
+
+    results = []
+
+    for size in (start << index for index in range(doublings)):
+        try:
+            best = benchmark_parser(PysFileBuffer(generate(size), f'<size {size}>'), repeat)[1]
+        except RecursionError:
+            best = None
+
+        results.append((size, best))
+
+    return results
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(prog='python -m pyscript.benchmarks.parser', description="PyScript parser benchmark")
+    parser.add_argument('-n', '--repeat', type=int, default=5, help="number of runs per input, the best is reported")
+    parser.add_argument('-d', '--doublings', type=int, default=4, help="number of sizes of the pathological inputs")
+    parser.add_argument('files', nargs='*', help="files to parse (default: the standard library scripts)")
+    args = parser.parse_args(argv)
+
+    print(f"{'input':<24} {'size':>6} {'seconds':>9} {'growth':>8}")
+
+    for name, generate in PATHOLOGICAL_INPUTS.items():
+        previous = None
+
+        for size, best in benchmark_growth(generate, args.doublings, repeat=args.repeat):
+            if best is None:
+                print(f"{name:<24} {size:6} {'skipped (recursion limit)':>27}")
+                previous = None
+                continue
+
+            growth = '-' if previous is None else f'x{best / previous:.2f}'
+            previous = best
+            print(f"{name:<24} {size:6} {best:9.4f} {growth:>8}")
+
+    total_tokens = 0
+    total_time = 0.0
+
+    print(f"\n{'file':<40} {'tokens':>9} {'seconds':>9} {'tokens/s':>12}")
+
+    for path in args.files or get_library_files():
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+
+        count, best = benchmark_parser(PysFileBuffer(text, path), args.repeat)
+        total_tokens += count
+        total_time += best
+
+        print(f"{os.path.basename(path)[-40:]:<40} {count:9} {best:9.4f} {count / best if best else 0:12,.0f}")
+
+    print(f"{'total':<40} {total_tokens:9} {total_time:9.4f} {total_tokens / total_time if total_time else 0:12,.0f}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Microbenchmark of the node patterns fused by the tree-walk interpreter: the augmented assignment of a local name
+(`n += 1`), the subscript of local names (`a[j]`) and the method calls (`o.m(j)`, on a PyScript object and on a Python
+object). Every pattern runs in a loop of a function, so its names are locals, and the time of the empty loop is
+subtracted. The closure compiler (`COMPILE_CLOSURE`) is reported for reference.
+
+Usage: python -m pyscript.benchmarks.patterns [-n REPEAT] [-s SCALE]
+"""
+
+from ..core.constants import DEFAULT, COMPILE_CLOSURE
+from .corpus import PysBenchmarkScript
+from .suite import benchmark_script
+
+from argparse import ArgumentParser
+from typing import Optional
+
+LOOPS = 100000
+
+PATTERNS = {
+    'loop': '',
+    'augmented-assignment': 'n += 1',
+    'subscript': 'a[j]',
+    'method-call': 'o.m(j)',
+    'python-method-call': 'd.get(j)'
+}
+
+MODES = {
+    'tree-walk': DEFAULT,
+    'closures': COMPILE_CLOSURE
+}
+
+def get_pattern_script(name: str, scale: int = 1) -> PysBenchmarkScript:
+    return PysBenchmarkScript(
+        name,
+        "class Object {\n"
+        "    func m(self, value) {\n"
+        "        return value\n"
+        "    }\n"
+        "}\n"
+        "\n"
+        "func main() {\n"
+        "    n = 0\n"
+        "    j = 0\n"
+        "    a = [0]\n"
+        "    d = {0: 0}\n"
+        "    o = Object()\n"
+        "\n"
+        f"    for (k of range({LOOPS * scale})) {{\n"
+        f"        {PATTERNS[name]}\n"
+        "    }\n"
+        "}\n"
+        "\n"
+        "main()\n"
+    )
+
+def benchmark_patterns(repeat: int = 5, scale: int = 1) -> dict[str, dict[str, float]]:
+
+    """
+    Runs every pattern with every mode. Returns a dictionary of pattern name to a dictionary of mode name to the time
+    of one pattern in nanoseconds, the loop excluded (the loop itself is the time of one iteration).
+    """
+
+    results = {}
+    loops = LOOPS * scale
+
+    for name in PATTERNS:
+        script = get_pattern_script(name, scale)
+        results[name] = {
+            mode: benchmark_script(script, repeat, flags, memory=False)['execution']['seconds'] * 1e9 / loops
+            for mode, flags in MODES.items()
+        }
+
+    reference = results['loop']
+
+    for name, times in results.items():
+        if name != 'loop':
+            for mode in times:
+                times[mode] -= reference[mode]
+
+    return results
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(
+        prog='python -m pyscript.benchmarks.patterns',
+        description="PyScript fused node patterns microbenchmark"
+    )
+    parser.add_argument('-n', '--repeat', type=int, default=5, help="number of runs, the best is reported")
+    parser.add_argument('-s', '--scale', type=int, default=1, help="multiplier of the number of loops")
+    args = parser.parse_args(argv)
+
+    print(f"{'pattern':<22}" + ''.join(f" {f'{mode} (ns)':>16}" for mode in MODES))
+
+    for name, times in benchmark_patterns(args.repeat, args.scale).items():
+        print(f"{name:<22}" + ''.join(f" {times[mode]:16.0f}" for mode in MODES))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
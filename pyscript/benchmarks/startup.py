@@ -0,0 +1,101 @@
+"""
+Startup benchmark, reports the time of `python -m pyscript -c "1"` started normally and forked by a server
+(`python -m pyscript --server`), with the startup of Python alone (`python -c "pass"`) for reference.
+
+Usage: python -m pyscript.benchmarks.startup [-n REPEAT] [COMMAND ...]
+Without a command, `-c 1` is run.
+"""
+
+from ..server import ENV_PYSCRIPT_SERVER, SERVER_SUPPORT
+
+from argparse import ArgumentParser
+from math import inf
+from statistics import mean
+from subprocess import DEVNULL, Popen, run
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+from typing import Optional
+
+import os
+import signal
+import sys
+
+# time allowed to the server to import and warm up PyScript
+SERVER_TIMEOUT = 60
+
+def benchmark_command(command: list[str], repeat: int = 10, environ: Optional[dict[str, str]] = None) -> list[float]:
+
+    """
+    Runs a command `repeat` times. Returns the wall time of each run in seconds.
+    """
+
+    times = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        run(command, stdout=DEVNULL, env=environ, check=True)
+        times.append(perf_counter() - start)
+
+    return times
+
+def benchmark_server(arguments: list[str], repeat: int = 10) -> list[float]:
+
+    """
+    Starts a server on a temporary socket and runs `python -m pyscript` with `arguments` `repeat` times as its client.
+    Returns the wall time of each run in seconds.
+    """
+
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'server.sock')
+        server = Popen([sys.executable, '-m', 'pyscript', '--server', path, '-q'], stdin=DEVNULL, stdout=DEVNULL)
+
+        try:
+            deadline = perf_counter() + SERVER_TIMEOUT
+
+            while not os.path.exists(path):
+                if server.poll() is not None:
+                    raise RuntimeError(f"the server exited with code {server.returncode}")
+                if perf_counter() > deadline:
+                    raise TimeoutError("the server is not listening")
+                sleep(0.05)
+
+            return benchmark_command(
+                [sys.executable, '-m', 'pyscript', *arguments],
+                repeat,
+                {**os.environ, ENV_PYSCRIPT_SERVER: path}
+            )
+
+        finally:
+            server.send_signal(signal.SIGINT)
+            server.wait()
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(prog='python -m pyscript.benchmarks.startup', description="PyScript startup benchmark")
+    parser.add_argument('-n', '--repeat', type=int, default=10, help="number of runs per command")
+    parser.add_argument('command', nargs='*', help="arguments of python -m pyscript (default: -c 1)")
+    args = parser.parse_args(argv)
+
+    arguments = args.command or ['-c', '1']
+    # the normal startup, even if a server is used by the current environment
+    environ = {name: value for name, value in os.environ.items() if name != ENV_PYSCRIPT_SERVER}
+
+    results = {
+        'python': benchmark_command([sys.executable, '-c', 'pass'], args.repeat, environ),
+        'pyscript': benchmark_command([sys.executable, '-m', 'pyscript', *arguments], args.repeat, environ)
+    }
+
+    if SERVER_SUPPORT:
+        results['pyscript (server)'] = benchmark_server(arguments, args.repeat)
+    else:
+        print("the server is not supported on this platform\n", file=sys.stderr)
+
+    print(f"{'command':<20} {'best':>9} {'mean':>9} {'speedup':>8}")
+
+    reference = min(results['pyscript'])
+
+    for name, times in results.items():
+        best = min(times, default=inf)
+        print(f"{name:<20} {best:9.4f} {mean(times):9.4f} {f'x{reference / best:.2f}':>8}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""
+Stage timing of the benchmark suite and the JSON baselines.
+"""
+
+from ..core.analyzer import PysAnalyzer
+from ..core.buffer import PysFileBuffer
+from ..core.cache import pys_sys
+from ..core.compiler import compile_node
+from ..core.constants import DEFAULT, SILENT, COMPILE_CLOSURE
+from ..core.context import PysContext
+from ..core.exceptions import PysSignal
+from ..core.interpreter import get_visitor
+from ..core.lexer import PysLexer
+from ..core.parser import PysParser
+from ..core.results import PysRunTimeResult
+from ..core.symtab import new_module_namespace
+from ..core.version import __version__
+from .corpus import PysBenchmarkScript
+
+from contextlib import redirect_stdout
+from io import StringIO
+from math import inf
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+import json
+import platform
+import sys
+import tracemalloc
+
+STAGES = ('lexer', 'parser', 'analyzer', 'execution')
+
+def _check(error: Any) -> None:
+    if error:
+        raise PysSignal(PysRunTimeResult().failure(error))
+
+def _measure(stage: Callable[[Any], Any], setup: Callable[[], Any], repeat: int, memory: bool) -> tuple[float, int]:
+    best = inf
+
+    for _ in range(repeat):
+        argument = setup()
+        start = perf_counter()
+        stage(argument)
+        best = min(best, perf_counter() - start)
+
+    peak = 0
+
+    if memory:
+        argument = setup()
+        tracemalloc.start()
+        try:
+            stage(argument)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return best, peak
+
+def benchmark_script(
+    script: PysBenchmarkScript,
+    repeat: int = 5,
+    flags: int = DEFAULT,
+    memory: bool = True
+) -> dict[str, dict[str, float | int | None]]:
+
+    """
+    Measures each stage of pys_runner separately: PysLexer.make_tokens, PysParser.parse, PysAnalyzer.analyze and the
+    execution (tree-walk, or closures with COMPILE_CLOSURE). Every stage gets fresh inputs from the previous stages,
+    so the analyzer never sees an already analyzed node.
+
+    Returns a dictionary of stage name to its best time in seconds, the peak of traced memory in bytes and the
+    throughput in tokens per second (None for the execution).
+    """
+
+    file = PysFileBuffer(script.text, script.name)
+    flags |= SILENT
+
+    def lex(_=None):
+        tokens, error = PysLexer(file, flags).make_tokens()
+        _check(error)
+        return tokens
+
+    tokens = lex()
+
+    def parse(_=None):
+        parser = PysParser(tokens, flags)
+        node, error = parser.parse()
+        _check(error)
+        return node, parser.flags
+
+    def analyze(parsed):
+        node, analyzer_flags = parsed
+        _check(PysAnalyzer(node, analyzer_flags).analyze())
+        return node
+
+    node = analyze(parse())
+
+    def new_context():
+        symbol_table, _ = new_module_namespace(file=script.name, name='__main__')
+        return PysContext(file=file, name='<program>', flags=flags, symbol_table=symbol_table)
+
+    def execute(context):
+        pys_sys.flags = flags
+        with redirect_stdout(StringIO()):
+            if flags & COMPILE_CLOSURE:
+                result = compile_node(node)(context)
+            else:
+                result = get_visitor(node.__class__)(node, context)
+        _check(result.error)
+
+    stages = {
+        'lexer': (lex, lambda : None),
+        'parser': (parse, lambda : None),
+        'analyzer': (analyze, parse),
+        'execution': (execute, new_context)
+    }
+
+    results = {}
+    count = len(tokens)
+
+    for name in STAGES:
+        if name == 'execution' and not script.executable:
+            continue
+
+        stage, setup = stages[name]
+        seconds, peak = _measure(stage, setup, repeat, memory)
+
+        results[name] = {
+            'seconds': seconds,
+            'peak': peak,
+            'throughput': None if name == 'execution' else (count / seconds if seconds else None)
+        }
+
+    return results
+
+def new_baseline(results: dict[str, dict[str, dict]], flags: int = DEFAULT, scale: int = 1) -> dict[str, Any]:
+    return {
+        'pyscript': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        # the deepest recursion the scripts can reach depends on it
+        'recursion_limit': sys.getrecursionlimit(),
+        'flags': flags,
+        'scale': scale,
+        'results': results
+    }
+
+def save_baseline(path: str, baseline: dict[str, Any]) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=2)
+
+def load_baseline(path: str) -> dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def compare_baseline(
+    results: dict[str, dict[str, dict]],
+    baseline: dict[str, Any],
+    threshold: float = 0.25,
+    minimum_seconds: float = 0.001,
+    minimum_peak: int = 65536
+) -> list[str]:
+
+    """
+    Compares the results with a baseline. Returns the regressions, every stage whose time or peak memory grows beyond
+    `threshold` (0.25 is 25% slower or larger). Stages faster than `minimum_seconds` or smaller than `minimum_peak` in
+    the baseline are too noisy to be compared.
+    """
+
+    regressions = []
+    base_results = baseline.get('results', {})
+
+    for script, stages in results.items():
+        base_stages = base_results.get(script, {})
+
+        for stage, result in stages.items():
+            base = base_stages.get(stage, None)
+            if base is None:
+                continue
+
+            for key, minimum, unit in (('seconds', minimum_seconds, 's'), ('peak', minimum_peak, ' bytes')):
+                old = base.get(key, 0)
+                new = result.get(key, 0)
+
+                if old >= minimum and new > old * (1 + threshold):
+                    regressions.append(
+                        f"{script}: {stage} {'time' if key == 'seconds' else 'peak memory'} "
+                        f"{old:g}{unit} -> {new:g}{unit} (+{(new / old - 1) * 100:.1f}%)"
+                    )
+
+    return regressions
+
+def format_results(results: dict[str, dict[str, dict]], file: Optional[Any] = None) -> None:
+    print(f"{'script':<36} {'stage':<10} {'seconds':>9} {'tokens/s':>12} {'peak KiB':>10}", file=file)
+
+    for script, stages in results.items():
+        for stage, result in stages.items():
+            throughput = result['throughput']
+            print(
+                f"{script[-36:]:<36} {stage:<10} {result['seconds']:9.4f} "
+                f"{'-' if throughput is None else format(throughput, ',.0f'):>12} {result['peak'] / 1024:10.1f}",
+                file=file
+            )
\ No newline at end of file
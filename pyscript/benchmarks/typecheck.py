@@ -0,0 +1,133 @@
+"""
+Type checking benchmark, reports the lexer and parser throughput (tokens per second) of the PyScript scripts of the
+standard library with each type checking mode: without beartype (`PYSCRIPT_NO_TYPECHECK`), with beartype on the public
+API only (the default) and with beartype on the internal constructors too (`PYSCRIPT_DEBUG_TYPECHECK`). The decorators
+are applied when the core is imported, so every mode runs in its own process (the core imported by this process is not
+measured).
+
+Usage: python -m pyscript.benchmarks.typecheck [-n REPEAT] [FILE ...]
+Without files, the PyScript scripts of the standard library are used.
+"""
+
+from ..core.buffer import PysFileBuffer
+from ..core.constants import SILENT, ENV_PYSCRIPT_NO_TYPECHECK, ENV_PYSCRIPT_DEBUG_TYPECHECK
+from ..core.lexer import PysLexer
+from ..core.parser import PysParser
+from ..core.utils.decorators import BEARTYPE
+from .lexer import get_library_files
+
+from argparse import ArgumentParser
+from math import inf
+from subprocess import PIPE, run
+from time import perf_counter
+from typing import Optional
+
+import os
+import sys
+
+MODES = {
+    'no beartype': {ENV_PYSCRIPT_NO_TYPECHECK: '1'},
+    'public API': {},
+    'debug': {ENV_PYSCRIPT_DEBUG_TYPECHECK: '1'}
+}
+
+def benchmark_files(paths: list[str], repeat: int = 5) -> tuple[int, float, float]:
+
+    """
+    Lexes and parses the files `repeat` times in the current process. Returns the number of tokens and the best times
+    in seconds of the lexer and of the parser.
+    """
+
+    files = []
+
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            files.append(PysFileBuffer(file.read(), path))
+
+    count = 0
+    lexer_time = parser_time = inf
+
+    for _ in range(repeat):
+        count = 0
+        lexer_total = parser_total = 0
+
+        for file in files:
+            start = perf_counter()
+            tokens, error = PysLexer(file, SILENT).make_tokens()
+            lexer_total += perf_counter() - start
+
+            if error:
+                raise SyntaxError(f"{file.name}: {error.exception}")
+
+            start = perf_counter()
+            _, error = PysParser(tokens, SILENT).parse()
+            parser_total += perf_counter() - start
+
+            if error:
+                raise SyntaxError(f"{file.name}: {error.exception}")
+
+            count += len(tokens)
+
+        lexer_time = min(lexer_time, lexer_total)
+        parser_time = min(parser_time, parser_total)
+
+    return count, lexer_time, parser_time
+
+def benchmark_mode(environ: dict[str, str], paths: list[str], repeat: int = 5) -> tuple[int, float, float] | None:
+
+    """
+    Runs `benchmark_files` in a new process with the environment variables `environ`. Returns None if the mode is not
+    available (the process reports that beartype is not used).
+    """
+
+    environ = {
+        name: value
+        for name, value in os.environ.items()
+        if name not in (ENV_PYSCRIPT_NO_TYPECHECK, ENV_PYSCRIPT_DEBUG_TYPECHECK)
+    } | environ
+
+    process = run(
+        [sys.executable, '-m', 'pyscript.benchmarks.typecheck', '--child', '-n', str(repeat), *paths],
+        stdout=PIPE, env=environ, text=True, check=True
+    )
+
+    beartype, count, lexer_time, parser_time = process.stdout.split()
+
+    if beartype == 'False' and ENV_PYSCRIPT_NO_TYPECHECK not in environ:
+        return None
+
+    return int(count), float(lexer_time), float(parser_time)
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(
+        prog='python -m pyscript.benchmarks.typecheck',
+        description="PyScript type checking benchmark"
+    )
+    parser.add_argument('-n', '--repeat', type=int, default=5, help="number of runs, the best is reported")
+    parser.add_argument('--child', action='store_true', help="run the files in the current process (used internally)")
+    parser.add_argument('files', nargs='*', help="PyScript files (default: the standard library)")
+    args = parser.parse_args(argv)
+
+    paths = args.files or get_library_files()
+
+    if args.child:
+        print(BEARTYPE, *benchmark_files(paths, args.repeat))
+        return
+
+    print(f"{'mode':<14} {'lexer (tokens/s)':>18} {'parser (tokens/s)':>18} {'lex+parse (tokens/s)':>21}")
+
+    for name, environ in MODES.items():
+        result = benchmark_mode(environ, paths, args.repeat)
+
+        if result is None:
+            print(f"{name:<14} {'beartype is not installed':>59}")
+            continue
+
+        count, lexer_time, parser_time = result
+        print(
+            f"{name:<14} {count / lexer_time:18,.0f} {count / parser_time:18,.0f} "
+            f"{count / (lexer_time + parser_time):21,.0f}"
+        )
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,35 +1,9 @@
 """
-The Core of PyScript Implementations.
+The Core of PyScript Implementations. The modules are imported on first use (PEP 562), so the shell, the editors and
+the highlighter are not loaded to run a program.
 """
 
-from . import (
-    analyzer,
-    bases,
-    buffer,
-    cache,
-    checks,
-    constants,
-    context,
-    editor,
-    exceptions,
-    handlers,
-    highlight,
-    interpreter,
-    lexer,
-    mapping,
-    nodes,
-    parser,
-    position,
-    pysbuiltins,
-    pystypes,
-    results,
-    runner,
-    shell,
-    symtab,
-    token,
-    utils,
-    version
-)
+from importlib import import_module
 
 __all__ = (
     'analyzer',
@@ -37,6 +11,8 @@ __all__ = (
     'buffer',
     'cache',
     'checks',
+    'compact',
+    'compiler',
     'constants',
     'context',
     'editor',
@@ -47,15 +23,28 @@ __all__ = (
     'lexer',
     'mapping',
     'nodes',
+    'optimizer',
+    'parallel',
     'parser',
     'position',
+    'profiler',
     'pysbuiltins',
     'pystypes',
     'results',
     'runner',
+    'serializer',
     'shell',
     'symtab',
     'token',
     'utils',
     'version'
-)
\ No newline at end of file
+)
+
+def __getattr__(name: str):
+    if name in __all__:
+        # the submodule is set as an attribute of the package when it is imported
+        return import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -1,18 +1,44 @@
 from .bases import Pys
-from .checks import is_sequence
+from .checks import is_sequence, is_literal
 from .constants import DEFAULT
 from .context import PysContext
 from .exceptions import PysTraceback
+from .mapping import GET_VALUE_FROM_CONSTANT_KEYWORDS
 from .nodes import *
 from .position import PysPosition
 from .token import TOKENS
-from .utils.decorators import typecheck
+from .utils.decorators import debug_typecheck
+from .utils.generic import setimuattr
 
-from typing import Optional
+from typing import Any, Optional
+
+def get_case_indexes(case_cases: tuple[tuple[PysNode, PysNode], ...]) -> dict[Any, tuple[int, ...]] | None:
+
+    """
+    Returns the jump table of a switch: each case label value to the indexes of the cases equal to it, in order. Returns
+    None if a label is not a literal (the labels are compared in order at runtime).
+    """
+
+    case_indexes = {}
+
+    for index, (condition, _) in enumerate(case_cases):
+        type = condition.__class__
+
+        if is_literal(type):
+            value = condition.value.value
+        elif type is PysKeywordNode:
+            value = GET_VALUE_FROM_CONSTANT_KEYWORDS(condition.name.value)
+        else:
+            return None
+
+        # equal labels (1, 1.0 and true) share the same entry
+        case_indexes[value] = case_indexes.get(value, ()) + (index,)
+
+    return case_indexes or None
 
 class PysAnalyzer(Pys):
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         node: PysNode,
@@ -26,13 +52,16 @@ class PysAnalyzer(Pys):
         self.context_parent = context_parent
         self.context_parent_entry_position = context_parent_entry_position
 
-    @typecheck
+    @debug_typecheck
     def analyze(self) -> PysTraceback | None:
         self.in_loop = 0
         self.in_function = 0
         self.in_class = 0
         self.in_switch = 0
         self.function_parameters = set()
+        self.local_names = None
+        self.local_identifiers = None
+        self.global_names = None
         self.error = None
 
         self.visit(self.node)
@@ -56,6 +85,16 @@ class PysAnalyzer(Pys):
         if not self.error and func:
             func(node)
 
+    def add_local(self, name: str) -> None:
+        local_names = self.local_names
+        if local_names is not None:
+            local_names[name] = None
+
+    def visit_IdentifierNode(self, node: PysIdentifierNode) -> None:
+        local_identifiers = self.local_identifiers
+        if local_identifiers is not None:
+            local_identifiers.append(node)
+
     def visit_DictionaryNode(self, node: PysDictionaryNode) -> None:
         for key, value in node.pairs:
 
@@ -168,6 +207,20 @@ class PysAnalyzer(Pys):
             if self.error:
                 return
 
+    def visit_ImportNode(self, node: PysImportNode) -> None:
+        name, as_name = node.name
+        packages = node.packages
+
+        if packages == 'all':
+            return
+
+        elif packages:
+            for package, as_package in packages:
+                self.add_local((package if as_package is None else as_package).value)
+
+        elif not (name.type == TOKENS['STRING'] and as_name is None):
+            self.add_local((name if as_name is None else as_name).value)
+
     def visit_AssignmentNode(self, node: PysAssignmentNode) -> None:
         self.visit_declaration_from_AssignmentNode(
             node.target,
@@ -214,6 +267,8 @@ class PysAnalyzer(Pys):
 
         self.in_switch -= 1
 
+        setimuattr(node, 'case_indexes', get_case_indexes(node.case_cases))
+
     def visit_MatchNode(self, node: PysMatchNode) -> None:
         if node.target:
             self.visit(node.target)
@@ -237,7 +292,10 @@ class PysAnalyzer(Pys):
         if self.error:
             return
 
-        for _, body in node.catch_cases:
+        for (_, parameter), body in node.catch_cases:
+            if parameter:
+                self.add_local(parameter.value)
+
             self.visit(body)
             if self.error:
                 return
@@ -251,11 +309,14 @@ class PysAnalyzer(Pys):
             self.visit(node.finally_body)
 
     def visit_WithNode(self, node: PysWithNode) -> None:
-        for context, _ in node.contexts:
+        for context, alias in node.contexts:
             self.visit(context)
             if self.error:
                 return
 
+            if alias:
+                self.add_local(alias.value)
+
         self.visit(node.body)
 
     def visit_ForNode(self, node: PysForNode) -> None:
@@ -348,12 +409,19 @@ class PysAnalyzer(Pys):
             if self.error:
                 return
 
+        self.add_local(node.name.value)
+
         in_loop, in_function, in_switch = self.in_loop, self.in_function, self.in_switch
+        local_names, local_identifiers = self.local_names, self.local_identifiers
 
         self.in_loop = 0
         self.in_function = 0
         self.in_switch = 0
 
+        # names in the class body are attributes of the class, not locals of the enclosing function
+        self.local_names = None
+        self.local_identifiers = None
+
         self.in_class += 1
 
         self.visit(node.body)
@@ -366,6 +434,9 @@ class PysAnalyzer(Pys):
         self.in_function = in_function
         self.in_switch = in_switch
 
+        self.local_names = local_names
+        self.local_identifiers = local_identifiers
+
     def visit_FunctionNode(self, node: PysFunctionNode) -> None:
         if node.constructor and self.in_class == 0:
             self.throw("constructor function outside of class", node.name.position)
@@ -376,6 +447,9 @@ class PysAnalyzer(Pys):
             if self.error:
                 return
 
+        if node.name:
+            self.add_local(node.name.value)
+
         parameter_names = set()
 
         for element in node.parameters:
@@ -394,6 +468,7 @@ class PysAnalyzer(Pys):
                     return
 
         in_loop, in_class, in_switch, parameters = self.in_loop, self.in_class, self.in_switch, self.function_parameters
+        local_names, local_identifiers, global_names = self.local_names, self.local_identifiers, self.global_names
 
         self.in_loop = 0
         self.in_class = 0
@@ -402,10 +477,20 @@ class PysAnalyzer(Pys):
         self.in_function += 1
         self.function_parameters = parameter_names
 
+        # parameters take the first slots in the order of positional binding (see PysFunction)
+        self.local_names = dict.fromkeys(
+            [element.value for element in node.parameters if element.__class__ is not tuple] +
+            [element[0].value for element in node.parameters if element.__class__ is tuple]
+        )
+        self.local_identifiers = []
+        self.global_names = set()
+
         self.visit(node.body)
         if self.error:
             return
 
+        self.resolve_locals(node)
+
         self.in_function -= 1
         self.function_parameters = parameters
 
@@ -413,6 +498,10 @@ class PysAnalyzer(Pys):
         self.in_class = in_class
         self.in_switch = in_switch
 
+        self.local_names = local_names
+        self.local_identifiers = local_identifiers
+        self.global_names = global_names
+
     def visit_GlobalNode(self, node: PysGlobalNode) -> None:
         if self.in_function == 0:
             self.throw("global outside of function", node.position)
@@ -422,6 +511,9 @@ class PysAnalyzer(Pys):
                 self.throw(f"name {identifier.value!r} is parameter and global", identifier.position)
                 return
 
+            if self.global_names is not None:
+                self.global_names.add(identifier.value)
+
     def visit_ReturnNode(self, node: PysReturnNode) -> None:
         if self.in_function == 0:
             self.throw("return outside of function", node.position)
@@ -476,6 +568,18 @@ class PysAnalyzer(Pys):
                 self.throw("cannot delete literal", target.position)
                 return
 
+    def resolve_locals(self, node: PysFunctionNode) -> None:
+        global_names = self.global_names
+        local_names = tuple(name for name in self.local_names if name not in global_names)
+        indexes = {name: index for index, name in enumerate(local_names)}
+
+        for identifier in self.local_identifiers:
+            index = indexes.get(identifier.name.value, None)
+            if index is not None:
+                setimuattr(identifier, 'index', index)
+
+        setimuattr(node, 'local_names', local_names)
+
     def visit_ContinueNode(self, node: PysContinueNode) -> None:
         if self.in_loop == 0:
             self.throw("continue outside of loop", node.position)
@@ -543,5 +647,9 @@ class PysAnalyzer(Pys):
         elif type is PysDebugNode:
             self.throw(f"cannot {operator_name} to __debug__", node.position)
 
-        elif type is not PysIdentifierNode:
+        elif type is PysIdentifierNode:
+            self.add_local(node.name.value)
+            self.visit_IdentifierNode(node)
+
+        else:
             self.throw(message, node.position)
\ No newline at end of file
@@ -4,6 +4,7 @@ from .utils.generic import setimuattr
 from .utils.string import normstr
 
 from io import IOBase
+from itertools import accumulate
 from types import BuiltinMethodType
 from typing import Iterable, Optional, Union
 
@@ -13,7 +14,7 @@ class PysBuffer(Pys):
 
 class PysFileBuffer(PysBuffer):
 
-    __slots__ = ('text', 'name')
+    __slots__ = ('text', 'name', '_line_starts')
 
     def __new__(
         cls,
@@ -36,8 +37,27 @@ class PysFileBuffer(PysBuffer):
 
         setimuattr(instance, 'text', text)
         setimuattr(instance, 'name', name)
+        setimuattr(instance, '_line_starts', None)
 
         return instance
 
+    @property
+    def line_starts(self) -> list[int]:
+
+        """
+        Offsets of the first character of each line, computed once per text.
+        """
+
+        text = self.text
+        cache = self._line_starts
+
+        if cache is None or cache[0] is not text:
+            line_starts = [0]
+            line_starts.extend(accumulate(len(line) + 1 for line in text.split('\n')))
+            line_starts.pop()
+            setimuattr(self, '_line_starts', cache := (text, line_starts))
+
+        return cache[1]
+
     def __repr__(self) -> str:
         return f'<FileBuffer from {self.name!r}>'
\ No newline at end of file
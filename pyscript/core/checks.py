@@ -24,6 +24,11 @@ is_literal = frozenset([
     PysNumberNode, PysStringNode
 ]).__contains__
 
+# switch targets looked up in the jump table of the cases (builtin types, the hash always agrees with the equality)
+is_jump_table_type = frozenset([
+    int, float, complex, str, bytes, bool, type(None)
+]).__contains__
+
 is_keyword = frozenset(KEYWORDS).__contains__
 is_constant_keyword = frozenset(CONSTANT_KEYWORDS).__contains__
 
@@ -0,0 +1,294 @@
+"""
+Compact form of an analyzed tree. The nodes, tokens and positions are stored by index in flat arrays instead of
+objects: a node is a class index, a position index and a run of cells (one per slot), a token is a type, a position
+index and a constant, and every distinct (start, end) position is stored once. The constants (identifier names, literal
+values) are interned, so a tree at rest keeps a fraction of the memory of its nodes. It is expanded back into nodes to
+be executed or inspected.
+"""
+
+from .bases import Pys
+from .buffer import PysFileBuffer
+from .cache import intern_object
+from .nodes import PysNode
+from .position import PysPosition
+from .serializer import NODE_CLASSES, NODE_SLOTS, NODE_TRANSIENT_SLOTS
+from .token import PysToken
+from .utils.generic import setimuattr
+
+from array import array
+from typing import Any, Iterator
+
+# kinds of cells
+C_CONSTANT = 0
+C_NODE = 1
+C_TOKEN = 2
+C_POSITION = 3
+C_TUPLE = 4
+C_LIST = 5
+C_SLICE = 6
+C_DICT = 7
+
+NODE_CLASS_LIST = tuple(NODE_CLASSES.values())
+NODE_CLASS_INDEXES = {class_node: index for index, class_node in enumerate(NODE_CLASS_LIST)}
+# the slots stored in the cells of a node, the position is stored apart
+NODE_CELL_SLOTS = tuple(NODE_SLOTS[class_node][1:] for class_node in NODE_CLASS_LIST)
+NODE_EMPTY_SLOTS = tuple(NODE_TRANSIENT_SLOTS[class_node] for class_node in NODE_CLASS_LIST)
+INTERNED_TYPES = frozenset([int, float, complex, str, bytes])
+
+class PysCompactTree(Pys):
+
+    """
+    A tree in compact form, made by `compact_node`. The root node has the index 0 and the nodes are numbered in
+    pre-order, so the nodes of a subtree follow its root.
+    """
+
+    __slots__ = (
+        'file', 'node_classes', 'node_positions', 'node_cells', 'token_types', 'token_positions', 'token_values',
+        'positions', 'cell_kinds', 'cell_values', 'container_starts', 'container_sizes', 'constants'
+    )
+
+    def __init__(self, file: PysFileBuffer) -> None:
+        self.file = file
+        self.node_classes = array('H')
+        self.node_positions = array('I')
+        self.node_cells = array('I')
+        self.token_types = array('H')
+        self.token_positions = array('I')
+        self.token_values = array('I')
+        self.positions = array('q')
+        self.cell_kinds = bytearray()
+        self.cell_values = array('I')
+        self.container_starts = array('I')
+        self.container_sizes = array('I')
+        self.constants = []
+
+    def __repr__(self) -> str:
+        return f'<CompactTree of {len(self)} nodes from {self.file.name!r}>'
+
+    def __len__(self) -> int:
+        return len(self.node_classes)
+
+    def get_class(self, index: int) -> type[PysNode]:
+        return NODE_CLASS_LIST[self.node_classes[index]]
+
+    def get_position(self, index: int) -> tuple[int, int]:
+        position = self.node_positions[index] * 2
+        return self.positions[position], self.positions[position + 1]
+
+    def get_size(self) -> int:
+
+        """
+        Returns the size in bytes of the arrays of the tree (the constants are shared with the interned objects).
+        """
+
+        return sum(
+            getattr(self, name).__sizeof__()
+            for name in self.__slots__
+            if name != 'file'
+        )
+
+    def iter_nodes(self) -> Iterator[tuple[int, type[PysNode], tuple[int, int]]]:
+
+        """
+        Iterates over the nodes in pre-order without expanding them, as (index, class, (start, end)) items.
+        """
+
+        for index in range(len(self.node_classes)):
+            yield index, self.get_class(index), self.get_position(index)
+
+    def expand(self, index: int = 0) -> PysNode:
+
+        """
+        Expands a node (the root by default) and its subtree back into node objects. The tokens and nodes at the same
+        position share the same position object.
+        """
+
+        positions = [None] * (len(self.positions) // 2)
+        return self._expand_node(index, positions)
+
+    def _expand_position(self, index: int, positions: list[PysPosition | None]) -> PysPosition:
+        position = positions[index]
+        if position is None:
+            start = index * 2
+            position = positions[index] = PysPosition(self.file, self.positions[start], self.positions[start + 1])
+        return position
+
+    def _expand_node(self, index: int, positions: list[PysPosition | None]) -> PysNode:
+        class_index = self.node_classes[index]
+        node = object.__new__(NODE_CLASS_LIST[class_index])
+        cell = self.node_cells[index]
+
+        setimuattr(node, 'position', self._expand_position(self.node_positions[index], positions))
+
+        for offset, slot in enumerate(NODE_CELL_SLOTS[class_index]):
+            setimuattr(node, slot, self._expand_cell(cell + offset, positions))
+
+        for slot in NODE_EMPTY_SLOTS[class_index]:
+            setimuattr(node, slot, None)
+
+        return node
+
+    def _expand_cell(self, cell: int, positions: list[PysPosition | None]) -> Any:
+        kind = self.cell_kinds[cell]
+        value = self.cell_values[cell]
+
+        if kind == C_CONSTANT:
+            return self.constants[value]
+
+        elif kind == C_NODE:
+            return self._expand_node(value, positions)
+
+        elif kind == C_TOKEN:
+            return PysToken(
+                self.token_types[value],
+                self._expand_position(self.token_positions[value], positions),
+                self.constants[self.token_values[value]]
+            )
+
+        elif kind == C_POSITION:
+            return self._expand_position(value, positions)
+
+        start = self.container_starts[value]
+        elements = [self._expand_cell(cell, positions) for cell in range(start, start + self.container_sizes[value])]
+
+        if kind == C_TUPLE:
+            return tuple(elements)
+        elif kind == C_LIST:
+            return elements
+        elif kind == C_SLICE:
+            return slice(*elements)
+        elif kind == C_DICT:
+            return dict(zip(elements[0::2], elements[1::2]))
+
+        raise ValueError(f"invalid cell kind: {kind!r}")
+
+class PysCompactor(Pys):
+
+    """
+    Writes a node and its subtree into a PysCompactTree.
+    """
+
+    __slots__ = ('tree', 'position_indexes', 'constant_indexes')
+
+    def __init__(self, file: PysFileBuffer) -> None:
+        self.tree = PysCompactTree(file)
+        self.position_indexes = {}
+        self.constant_indexes = {}
+
+    def add_position(self, position: PysPosition) -> int:
+        key = (position.start, position.end)
+        index = self.position_indexes.get(key, None)
+
+        if index is None:
+            index = self.position_indexes[key] = len(self.position_indexes)
+            self.tree.positions.extend(key)
+
+        return index
+
+    def add_constant(self, value: Any) -> int:
+        if value.__class__ in INTERNED_TYPES:
+            value = intern_object(value)
+
+        # by identity, equal constants of other types (1 and True, 0.0 and -0.0) must not be merged
+        key = id(value)
+        index = self.constant_indexes.get(key, None)
+
+        if index is None:
+            constants = self.tree.constants
+            index = self.constant_indexes[key] = len(constants)
+            constants.append(value)
+
+        return index
+
+    def add_node(self, node: PysNode) -> int:
+        tree = self.tree
+        class_index = NODE_CLASS_INDEXES[node.__class__]
+        slots = NODE_CELL_SLOTS[class_index]
+
+        index = len(tree.node_classes)
+        tree.node_classes.append(class_index)
+        tree.node_positions.append(self.add_position(node.position))
+
+        # the cells of a node are contiguous, they are reserved before the children add their own
+        cell = self.reserve_cells(len(slots))
+        tree.node_cells.append(cell)
+
+        for offset, slot in enumerate(slots):
+            self.set_cell(cell + offset, getattr(node, slot))
+
+        return index
+
+    def add_token(self, token: PysToken) -> int:
+        tree = self.tree
+        index = len(tree.token_types)
+
+        tree.token_types.append(token.type)
+        tree.token_positions.append(self.add_position(token.position))
+        tree.token_values.append(self.add_constant(token.value))
+
+        return index
+
+    def reserve_cells(self, count: int) -> int:
+        tree = self.tree
+        cell = len(tree.cell_kinds)
+
+        tree.cell_kinds.extend(bytes(count))
+        tree.cell_values.extend([0] * count)
+
+        return cell
+
+    def set_cell(self, cell: int, value: Any) -> None:
+        tree = self.tree
+        vtype = value.__class__
+
+        if vtype is PysToken:
+            kind = C_TOKEN
+            value = self.add_token(value)
+
+        elif vtype in NODE_CLASS_INDEXES:
+            kind = C_NODE
+            value = self.add_node(value)
+
+        elif vtype is PysPosition:
+            kind = C_POSITION
+            value = self.add_position(value)
+
+        elif vtype is tuple or vtype is list or vtype is slice or vtype is dict:
+            if vtype is tuple:
+                kind = C_TUPLE
+                elements = value
+            elif vtype is list:
+                kind = C_LIST
+                elements = value
+            elif vtype is slice:
+                kind = C_SLICE
+                elements = (value.start, value.stop, value.step)
+            else:
+                kind = C_DICT
+                elements = [element for item in value.items() for element in item]
+
+            start = self.reserve_cells(len(elements))
+
+            for offset, element in enumerate(elements):
+                self.set_cell(start + offset, element)
+
+            value = len(tree.container_starts)
+            tree.container_starts.append(start)
+            tree.container_sizes.append(len(elements))
+
+        else:
+            kind = C_CONSTANT
+            value = self.add_constant(value)
+
+        tree.cell_kinds[cell] = kind
+        tree.cell_values[cell] = value
+
+def compact_node(node: PysNode, file: PysFileBuffer | None = None) -> PysCompactTree:
+
+    """
+    Returns the compact form of a node and its subtree. The file defaults to the file of the node position.
+    """
+
+    compactor = PysCompactor(node.position.file if file is None else file)
+    compactor.add_node(node)
+    return compactor.tree
\ No newline at end of file
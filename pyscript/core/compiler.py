@@ -0,0 +1,1552 @@
+# Closure Compiler
+
+from .constants import DEBUG
+from .cache import undefined
+from .checks import is_expression, is_sequence, is_equal, is_jump_table_type
+from .context import PysContext, PysClassContext
+from .exceptions import PysTraceback, PysSignal
+from .handlers import handle_call, get_cached_method, is_handled_call, set_call_site
+from .interpreter import get_visitor
+from .mapping import GET_BINARY_FUNCTION, GET_UNARY_FUNCTION, GET_VALUE_FROM_CONSTANT_KEYWORDS
+from .nodes import *
+from .pysbuiltins import ce, nce, increment, decrement
+from .pystypes import PysFunction
+from .results import PysRunTimeResult
+from .symtab import PysClassSymbolTable, find_closest
+from .token import TOKENS
+from .utils.debug import get_traceback_info
+from .utils.generic import setimuattr, dkeys, dsetitem, is_object_of
+from .utils.similarity import get_closest
+
+from collections.abc import Iterable
+from typing import Any, Callable
+
+T_AND = TOKENS['DOUBLE_AMPERSAND']
+T_INCREMENT = TOKENS['DOUBLE_PLUS']
+T_NULLISH = TOKENS['DOUBLE_QUESTION']
+T_OR = TOKENS['DOUBLE_PIPE']
+T_CE = TOKENS['EQUAL_TILDE']
+T_NCE = TOKENS['EXCLAMATION_TILDE']
+
+# Every node is compiled once into a closure that only takes the context. Expression closures return the value
+# directly, statement closures return None or a PysRunTimeResult that carries a return, break or continue signal.
+# Errors travel as PysSignal, in the same way PysFunction already reports them through the Python call stack.
+
+BREAK = PysRunTimeResult().success_break()
+CONTINUE = PysRunTimeResult().success_continue()
+NONE = PysRunTimeResult().success(None)
+
+def failure(exception: BaseException | type[BaseException], context: PysContext, position: Any) -> PysSignal:
+    return PysSignal(PysRunTimeResult().failure(PysTraceback(exception, context, position)))
+
+def unpack(signal: PysSignal) -> tuple[PysRunTimeResult | None, PysTraceback | None]:
+    result = signal.result
+    error = result.error
+    if error:
+        return None, error
+    return (result if result.should_return() else None), None
+
+def capture(statement: Callable[[PysContext], Any], context: PysContext) -> tuple[Any, PysTraceback | None]:
+    try:
+        return statement(context), None
+    except PysSignal as signal:
+        return unpack(signal)
+
+def name_error(symbol_table: Any, name: str) -> NameError:
+    closest_symbol = get_closest(dkeys(symbol_table.symbols), name)
+    return NameError(
+        (
+            f"name {name!r} is not defined"
+            if symbol_table.get(name) is undefined else
+            f"name {name!r} is not defined on local"
+        )
+        +
+        (
+            ''
+            if closest_symbol is None else
+            f". Did you mean {closest_symbol!r}?"
+        )
+    )
+
+def compile_NumberNode(node: PysNumberNode) -> Callable[[PysContext], Any]:
+    value = node.value.value
+    return lambda context : value
+
+compile_StringNode = compile_NumberNode
+
+def compile_KeywordNode(node: PysKeywordNode) -> Callable[[PysContext], Any]:
+    value = GET_VALUE_FROM_CONSTANT_KEYWORDS(node.name.value)
+    return lambda context : value
+
+def compile_DebugNode(node: PysDebugNode) -> Callable[[PysContext], Any]:
+    return lambda context : True if context.flags & DEBUG else False
+
+def compile_IdentifierNode(node: PysIdentifierNode) -> Callable[[PysContext], Any]:
+    position = node.position
+    name = node.name.value
+
+    def identifier(context):
+        symbol_table = context.symbol_table
+
+        try:
+            value = symbol_table.get(name)
+
+            if value is undefined:
+                closest_symbol = find_closest(symbol_table, name)
+                raise NameError(
+                    f"name {name!r} is not defined" +
+                    ('' if closest_symbol is None else f". Did you mean {closest_symbol!r}?")
+                )
+
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+        return value
+
+    index = node.index
+
+    if index >= 0:
+
+        def local_identifier(context):
+            value = context.symbol_table.values[index]
+            return identifier(context) if value is undefined else value
+
+        return local_identifier
+
+    return identifier
+
+def compile_DictionaryNode(node: PysDictionaryNode) -> Callable[[PysContext], Any]:
+    class_type = node.class_type
+    pairs = tuple((compile_expression(nkey), compile_expression(nvalue), nkey.position) for nkey, nvalue in node.pairs)
+
+    def dictionary(context):
+        elements = class_type()
+        setitem = elements.__setitem__
+
+        for key, value, position in pairs:
+            key = key(context)
+            value = value(context)
+
+            try:
+                setitem(key, value)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+        return elements
+
+    return dictionary
+
+def compile_SetNode(node: PysSetNode) -> Callable[[PysContext], Any]:
+    elements = tuple((compile_expression(nelement), nelement.position) for nelement in node.elements)
+
+    def set_(context):
+        result = set()
+        add = result.add
+
+        for element, position in elements:
+            try:
+                add(element(context))
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+        return result
+
+    return set_
+
+def compile_ListNode(node: PysListNode) -> Callable[[PysContext], Any]:
+    elements = tuple(compile_expression(nelement) for nelement in node.elements)
+    return lambda context : [element(context) for element in elements]
+
+def compile_TupleNode(node: PysTupleNode) -> Callable[[PysContext], Any]:
+    elements = tuple(compile_expression(nelement) for nelement in node.elements)
+    return lambda context : tuple([element(context) for element in elements])
+
+def compile_AttributeNode(node: PysAttributeNode) -> Callable[[PysContext], Any]:
+    target = compile_expression(node.target)
+    nattribute = node.attribute
+    attribute = nattribute.value
+    position = nattribute.position
+
+    def attribute_(context):
+        value = target(context)
+
+        try:
+            return getattr(value, attribute)
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+    return attribute_
+
+def compile_SubscriptNode(node: PysSubscriptNode) -> Callable[[PysContext], Any]:
+    target = compile_expression(node.target)
+    slice = compile_slice(node.slice)
+    position = node.position
+
+    def subscript(context):
+        value = target(context)
+        index = slice(context)
+
+        try:
+            return value[index]
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+    return subscript
+
+def compile_method_call(node: PysCallNode) -> Callable[[PysContext], Any]:
+    # a PyScript method is called with the object, without binding it (see get_cached_method)
+    ntarget = node.target
+    target = compile_expression(ntarget.target)
+    nattribute = ntarget.attribute
+    attribute = nattribute.value
+    attribute_position = nattribute.position
+    position = node.position
+    cache = {}
+
+    b_tuple = tuple
+
+    nodes = b_tuple(
+        (nargument[0].value, compile_expression(nargument[1]))
+        if nargument.__class__ is b_tuple else
+        (None, compile_expression(nargument))
+        for nargument in node.arguments
+    )
+
+    def get_method(context, value):
+        try:
+            return getattr(value, attribute)
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, attribute_position)
+
+    if all(keyword is None for keyword, _ in nodes):
+        arguments = b_tuple(value for _, value in nodes)
+
+        def method_call(context):
+            value = target(context)
+            method = get_cached_method(cache, value, attribute)
+            function = get_method(context, value) if method is None else None
+            args = [argument(context) for argument in arguments] if arguments else ()
+
+            try:
+                if method is None:
+                    handle_call(function, context, position)
+                    return function(*args)
+
+                code = method.__code__
+                code.call_site = site = (context, position)
+                set_call_site((code, site))
+                return method(value, *args)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    else:
+
+        def method_call(context):
+            value = target(context)
+            method = get_cached_method(cache, value, attribute)
+            function = get_method(context, value) if method is None else None
+            args = []
+            kwargs = {}
+
+            add_arg = args.append
+
+            for keyword, argument in nodes:
+                if keyword is None:
+                    add_arg(argument(context))
+                else:
+                    kwargs[keyword] = argument(context)
+
+            try:
+                if method is None:
+                    handle_call(function, context, position)
+                    return function(*args, **kwargs)
+
+                code = method.__code__
+                code.call_site = site = (context, position)
+                set_call_site((code, site))
+                return method(value, *args, **kwargs)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    return method_call
+
+def compile_CallNode(node: PysCallNode) -> Callable[[PysContext], Any]:
+    if node.target.__class__ is PysAttributeNode:
+        return compile_method_call(node)
+
+    target = compile_expression(node.target)
+    position = node.position
+
+    b_tuple = tuple
+
+    # keyword arguments are evaluated in the written order, so only the calls without them are specialized
+    positional = all(nargument.__class__ is not b_tuple for nargument in node.arguments)
+    arguments = b_tuple(compile_expression(nargument) for nargument in node.arguments) if positional else None
+
+    if positional and not arguments:
+
+        def call(context):
+            function = target(context)
+
+            try:
+                handle_call(function, context, position)
+                return function()
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    elif positional and len(arguments) == 1:
+        argument, = arguments
+
+        def call(context):
+            function = target(context)
+            value = argument(context)
+
+            try:
+                handle_call(function, context, position)
+                return function(value)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    elif positional:
+
+        def call(context):
+            function = target(context)
+            args = [argument(context) for argument in arguments]
+
+            try:
+                handle_call(function, context, position)
+                return function(*args)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    else:
+        nodes = b_tuple(
+            (nargument[0].value, compile_expression(nargument[1]))
+            if nargument.__class__ is b_tuple else
+            (None, compile_expression(nargument))
+            for nargument in node.arguments
+        )
+
+        def call(context):
+            function = target(context)
+            args = []
+            kwargs = {}
+
+            add_arg = args.append
+
+            for keyword, value in nodes:
+                if keyword is None:
+                    add_arg(value(context))
+                else:
+                    kwargs[keyword] = value(context)
+
+            try:
+                handle_call(function, context, position)
+                return function(*args, **kwargs)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    return call
+
+def compile_ChainOperatorNode(node: PysChainOperatorNode) -> Callable[[PysContext], Any]:
+    expressions = node.expressions
+    first = compile_expression(expressions[0])
+    position = node.position
+
+    operations = []
+
+    for i, toperand in enumerate(node.operations, start=1):
+        otype = toperand.type
+        operations.append((
+            ce if otype == T_CE else nce if otype == T_NCE else GET_BINARY_FUNCTION(otype),
+            otype == T_CE or otype == T_NCE,
+            compile_expression(expressions[i])
+        ))
+
+    operations = tuple(operations)
+
+    def chain_operator(context):
+        left = first(context)
+
+        try:
+
+            for function, is_builtin, expression in operations:
+                right = expression(context)
+
+                if is_builtin:
+                    handle_call(function, context, position)
+
+                value = function(left, right)
+
+                if not value:
+                    break
+
+                left = right
+
+            return value
+
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+    return chain_operator
+
+def compile_TernaryOperatorNode(node: PysTernaryOperatorNode) -> Callable[[PysContext], Any]:
+    condition = compile_expression(node.condition)
+    valid = compile_expression(node.valid)
+    invalid = compile_expression(node.invalid)
+    position = node.position
+
+    def ternary_operator(context):
+        value = condition(context)
+
+        try:
+            return valid(context) if value else invalid(context)
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+    return ternary_operator
+
+def compile_BinaryOperatorNode(node: PysBinaryOperatorNode) -> Callable[[PysContext], Any]:
+    left = compile_expression(node.left)
+    right = compile_expression(node.right)
+    otype = node.operand.type
+    position = node.position
+
+    if otype == T_AND:
+
+        def binary_operator(context):
+            value = left(context)
+
+            try:
+                return right(context) if value else value
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    elif otype == T_OR:
+
+        def binary_operator(context):
+            value = left(context)
+
+            try:
+                return value if value else right(context)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    elif otype == T_NULLISH:
+
+        def binary_operator(context):
+            value = left(context)
+            return right(context) if value is None else value
+
+    else:
+        function = GET_BINARY_FUNCTION(otype)
+
+        def binary_operator(context):
+            lvalue = left(context)
+            rvalue = right(context)
+
+            try:
+                return function(lvalue, rvalue)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    return binary_operator
+
+def compile_UnaryOperatorNode(node: PysUnaryOperatorNode) -> Callable[[PysContext], Any]:
+    value = compile_expression(node.value)
+    function = GET_UNARY_FUNCTION(node.operand.type)
+    position = node.position
+
+    def unary_operator(context):
+        operand = value(context)
+
+        try:
+            return function(operand)
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+    return unary_operator
+
+def compile_IncrementalNode(node: PysIncrementalNode) -> Callable[[PysContext], Any]:
+    ntarget = node.target
+    target = compile_expression(ntarget)
+    declaration = compile_declaration(ntarget, TOKENS['EQUAL'])
+    function = increment if node.operand.type == T_INCREMENT else decrement
+    left = node.operand_position == 'left'
+    position = node.position
+
+    def incremental(context):
+        value = target(context)
+
+        try:
+            handle_call(function, context, position)
+            increast_value = function(value)
+            declaration(context, increast_value)
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+        return increast_value if left else value
+
+    return incremental
+
+def compile_StatementsNode(node: PysStatementsNode) -> Callable[[PysContext], Any]:
+    body = tuple(compile_statement(nelement) for nelement in node.body)
+
+    if len(body) == 1:
+        return body[0]
+
+    def statements(context):
+        for statement in body:
+            result = statement(context)
+            if result is not None:
+                return result
+
+    return statements
+
+def compile_AssignmentNode(node: PysAssignmentNode, expression: bool = False) -> Callable[[PysContext], Any]:
+    value = compile_expression(node.value)
+    declaration = compile_declaration(node.target, node.operand.type)
+
+    if expression:
+
+        def assignment(context):
+            result = value(context)
+            declaration(context, result)
+            return result
+
+    else:
+
+        def assignment(context):
+            declaration(context, value(context))
+
+    return assignment
+
+def compile_IfNode(node: PysIfNode) -> Callable[[PysContext], Any]:
+    cases_body = tuple(
+        (compile_expression(ncondition), compile_statement(body), ncondition.position)
+        for ncondition, body in node.cases_body
+    )
+    else_body = compile_statement(node.else_body) if node.else_body else None
+
+    def if_(context):
+        for condition, body, position in cases_body:
+            value = condition(context)
+
+            try:
+                if value:
+                    return body(context)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+        if else_body is not None:
+            return else_body(context)
+
+    return if_
+
+def compile_SwitchNode(node: PysSwitchNode) -> Callable[[PysContext], Any]:
+    target = compile_expression(node.target)
+    case_cases = tuple(
+        (compile_expression(ncondition), compile_statement(body), ncondition.position)
+        for ncondition, body in node.case_cases
+    )
+    default_body = compile_statement(node.default_body) if node.default_body else None
+    case_indexes = node.case_indexes
+    length = len(case_cases)
+
+    def switch(context):
+        value = target(context)
+
+        fall_through = False
+        no_match_found = True
+
+        if case_indexes is not None and is_jump_table_type(value.__class__):
+            # every label is a literal, jump to the cases equal to the target instead of comparing each label
+            matches = case_indexes.get(value, ())
+            index = matches[0] if matches else length
+            no_match_found = not matches
+
+            while index < length:
+                _, body, position = case_cases[index]
+                fall_through = True
+                index += 1
+
+                try:
+                    result = body(context)
+                except PysSignal:
+                    raise
+                except BaseException as exception:
+                    raise failure(exception, context, position)
+
+                if result is not None:
+                    if result.should_break:
+                        fall_through = False
+                        # the following cases are still compared after a break
+                        index = next((match for match in matches if match >= index), length)
+                    else:
+                        return result
+
+        else:
+
+            for condition, body, position in case_cases:
+
+                if not fall_through:
+                    case = condition(context)
+
+                try:
+
+                    if fall_through or value == case:
+                        fall_through = True
+                        no_match_found = False
+
+                        result = body(context)
+                        if result is not None:
+                            if result.should_break:
+                                fall_through = False
+                            else:
+                                return result
+
+                except PysSignal:
+                    raise
+                except BaseException as exception:
+                    raise failure(exception, context, position)
+
+        if (fall_through or no_match_found) and default_body is not None:
+            result = default_body(context)
+            if result is not None and not result.should_break:
+                return result
+
+    return switch
+
+def compile_MatchNode(node: PysMatchNode) -> Callable[[PysContext], Any]:
+    target = compile_expression(node.target) if node.target else None
+    cases = tuple(
+        (compile_expression(ncondition), compile_expression(nvalue), ncondition.position)
+        for ncondition, nvalue in node.cases
+    )
+    default = compile_expression(node.default) if node.default else None
+
+    def match(context):
+        compare = target is not None
+
+        if compare:
+            value = target(context)
+
+        for condition, case_value, position in cases:
+            case = condition(context)
+
+            try:
+                if value == case if compare else (True if case else False):
+                    return case_value(context)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+        if default is not None:
+            return default(context)
+
+    return match
+
+def compile_TryNode(node: PysTryNode) -> Callable[[PysContext], Any]:
+    body = compile_statement(node.body)
+    catch_cases = tuple(
+        (
+            tuple((compile_IdentifierNode(nerror_class), nerror_class.position) for nerror_class in targets),
+            tparameter,
+            compile_statement(catch_body)
+        )
+        for (targets, tparameter), catch_body in node.catch_cases
+    )
+    else_body = compile_statement(node.else_body) if node.else_body else None
+    finally_body = compile_statement(node.finally_body) if node.finally_body else None
+
+    b_isinstance = isinstance
+    b_issubclass = issubclass
+    b_type = type
+    b_BaseException = BaseException
+
+    def try_(context):
+        result, error = capture(body, context)
+
+        if error:
+            current_error = None
+            exception = error.exception
+            exception_class = exception if b_isinstance(exception, b_type) else b_type(exception)
+
+            for targets, tparameter, catch_body in catch_cases:
+                handle_exception = True
+                stop = False
+
+                if targets:
+                    handle_exception = False
+
+                    for get_error_class, position in targets:
+                        error_class, current_error = capture(get_error_class, context)
+                        if current_error:
+                            setimuattr(current_error, 'primary', error)
+                            stop = True
+                            break
+
+                        if not (b_isinstance(error_class, b_type) and b_issubclass(error_class, b_BaseException)):
+                            current_error = PysTraceback(
+                                TypeError("catching classes that do not inherit from BaseException is not allowed"),
+                                context,
+                                position,
+                                error
+                            )
+                            stop = True
+                            break
+
+                        if b_issubclass(exception_class, error_class):
+                            handle_exception = True
+                            break
+
+                if stop:
+                    break
+
+                elif handle_exception:
+
+                    if tparameter:
+                        symbol_table = context.symbol_table
+                        parameter = tparameter.value
+
+                        try:
+                            symbol_table.set(parameter, exception)
+                        except PysSignal as signal:
+                            result, current_error = unpack(signal)
+                            break
+                        except BaseException as exc:
+                            current_error = PysTraceback(exc, context, tparameter.position)
+                            break
+
+                    result, current_error = capture(catch_body, context)
+                    if current_error:
+                        setimuattr(current_error, 'primary', error)
+
+                    if tparameter:
+                        try:
+                            symbol_table.remove(parameter)
+                        except PysSignal as signal:
+                            result, current_error = unpack(signal)
+                        except BaseException as exc:
+                            result = None
+                            current_error = PysTraceback(exc, context, tparameter.position)
+
+                    break
+
+            else:
+                current_error = error
+
+            error = current_error
+
+        elif else_body is not None:
+            result, error = capture(else_body, context)
+
+        if finally_body is not None:
+            finally_result, finally_error = capture(finally_body, context)
+            if finally_error:
+                setimuattr(finally_error, 'primary', error)
+                raise PysSignal(PysRunTimeResult().failure(finally_error))
+            elif finally_result is not None:
+                return finally_result
+
+        if error:
+            raise PysSignal(PysRunTimeResult().failure(error))
+
+        return result
+
+    return try_
+
+def compile_WithNode(node: PysWithNode) -> Callable[[PysContext], Any]:
+    contexts = tuple(
+        (compile_expression(ncontext), ncontext.position, nalias)
+        for ncontext, nalias in node.contexts
+    )
+    body = compile_statement(node.body)
+
+    def with_(context):
+        exit_functions = []
+
+        append_exit_function = exit_functions.append
+        set_symbol = context.symbol_table.set
+        result = error = None
+
+        for context_expression, position, nalias in contexts:
+            context_value, error = capture(context_expression, context)
+            if error:
+                break
+
+            try:
+                enter = getattr(context_value, '__enter__', undefined)
+                exit = getattr(context_value, '__exit__', undefined)
+
+                missed_enter = enter is undefined
+                missed_exit = exit is undefined
+
+                if missed_enter or missed_exit:
+                    message = f"{type(context_value).__name__!r} object does not support the context manager protocol"
+
+                    if missed_enter and missed_exit:
+                        pass
+                    elif missed_enter:
+                        message += " (missed __enter__ method)"
+                    elif missed_exit:
+                        message += " (missed __exit__ method)"
+
+                    error = PysTraceback(TypeError(message), context, position)
+                    break
+
+                handle_call(enter, context, position)
+                enter_value = enter()
+                append_exit_function((exit, position))
+
+            except PysSignal as signal:
+                result, error = unpack(signal)
+                break
+            except BaseException as exception:
+                error = PysTraceback(exception, context, position)
+                break
+
+            if nalias:
+                try:
+                    set_symbol(nalias.value, enter_value)
+                except PysSignal as signal:
+                    result, error = unpack(signal)
+                    break
+                except BaseException as exception:
+                    error = PysTraceback(exception, context, nalias.position)
+                    break
+
+        else:
+            result, error = capture(body, context)
+
+        current_error = error
+
+        for exit, position in reversed(exit_functions):
+            try:
+                handle_call(exit, context, position)
+                if exit(*get_traceback_info(error)):
+                    result = current_error = error = None
+            except PysSignal as signal:
+                result, current_error = unpack(signal)
+            except BaseException as exception:
+                result = None
+                current_error = PysTraceback(exception, context, position)
+
+        if current_error:
+            if current_error is not error:
+                setimuattr(current_error, 'primary', error)
+            raise PysSignal(PysRunTimeResult().failure(current_error))
+
+        return result
+
+    return with_
+
+def compile_ForNode(node: PysForNode) -> Callable[[PysContext], Any]:
+    nheader = node.header
+    body = compile_statement(node.body)
+    else_body = compile_statement(node.else_body) if node.else_body else None
+
+    if len(nheader) == 2:
+        ndeclaration, niteration = nheader
+        iteration = compile_expression(niteration)
+        declaration = compile_declaration(ndeclaration, TOKENS['EQUAL'])
+        position = niteration.position
+
+        b_StopIteration = StopIteration
+
+        def for_(context):
+            iterable = iteration(context)
+
+            try:
+                handle_call(getattr(iterable, '__iter__', None), context, position)
+                next = iter(iterable).__next__
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+            # native iterators do not need their call site
+            handled = is_handled_call(next)
+
+            while True:
+
+                try:
+                    if handled:
+                        handle_call(next, context, position)
+                    declaration(context, next())
+                except PysSignal as signal:
+                    error = signal.result.error
+                    if error and is_object_of(error.exception, b_StopIteration):
+                        break
+                    raise
+                except b_StopIteration:
+                    break
+                except BaseException as exception:
+                    raise failure(exception, context, position)
+
+                result = body(context)
+                if result is not None:
+                    if result.should_continue:
+                        continue
+                    elif result.should_break:
+                        return
+                    return result
+
+            if else_body is not None:
+                return else_body(context)
+
+    else:
+        ndeclaration, ncondition, nupdate = nheader
+        declaration = compile_statement(ndeclaration) if ndeclaration else None
+        condition = compile_expression(ncondition) if ncondition else None
+        update = compile_statement(nupdate) if nupdate else None
+        position = ncondition.position if ncondition else None
+
+        def for_(context):
+            if declaration is not None:
+                result = declaration(context)
+                if result is not None:
+                    return result
+
+            while True:
+
+                if condition is not None:
+                    value = condition(context)
+
+                    try:
+                        if not value:
+                            break
+                    except PysSignal:
+                        raise
+                    except BaseException as exception:
+                        raise failure(exception, context, position)
+
+                result = body(context)
+                if result is not None:
+                    if result.should_break:
+                        return
+                    elif not result.should_continue:
+                        return result
+
+                if update is not None:
+                    result = update(context)
+                    if result is not None:
+                        return result
+
+            if else_body is not None:
+                return else_body(context)
+
+    return for_
+
+def compile_WhileNode(node: PysWhileNode) -> Callable[[PysContext], Any]:
+    condition = compile_expression(node.condition)
+    position = node.condition.position
+    body = compile_statement(node.body)
+    else_body = compile_statement(node.else_body) if node.else_body else None
+
+    def while_(context):
+        while True:
+            value = condition(context)
+
+            try:
+                if not value:
+                    break
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+            result = body(context)
+            if result is not None:
+                if result.should_break:
+                    return
+                elif not result.should_continue:
+                    return result
+
+        if else_body is not None:
+            return else_body(context)
+
+    return while_
+
+def compile_DoWhileNode(node: PysDoWhileNode) -> Callable[[PysContext], Any]:
+    condition = compile_expression(node.condition)
+    position = node.condition.position
+    body = compile_statement(node.body)
+    else_body = compile_statement(node.else_body) if node.else_body else None
+
+    def do_while(context):
+        while True:
+            result = body(context)
+            if result is not None:
+                if result.should_break:
+                    return
+                elif not result.should_continue:
+                    return result
+
+            value = condition(context)
+
+            try:
+                if not value:
+                    break
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+        if else_body is not None:
+            return else_body(context)
+
+    return do_while
+
+def compile_RepeatNode(node: PysRepeatNode) -> Callable[[PysContext], Any]:
+    condition = compile_expression(node.condition)
+    position = node.condition.position
+    body = compile_statement(node.body) if node.body else None
+    else_body = compile_statement(node.else_body) if node.body and node.else_body else None
+
+    def repeat(context):
+        while True:
+            if body is not None:
+                result = body(context)
+                if result is not None:
+                    if result.should_break:
+                        return
+                    elif not result.should_continue:
+                        return result
+
+            value = condition(context)
+
+            try:
+                if value:
+                    break
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+        if else_body is not None:
+            return else_body(context)
+
+    return repeat
+
+def compile_ClassNode(node: PysClassNode) -> Callable[[PysContext], Any]:
+    bases = tuple(compile_expression(nbase) for nbase in node.bases)
+    decorators = tuple(
+        (compile_expression(ndecorator), ndecorator.position)
+        for ndecorator in reversed(node.decorators)
+    )
+    body = compile_statement(node.body)
+    position = node.position
+    name = node.name.value
+
+    def class_(context):
+        class_bases = tuple([base(context) for base in bases])
+        symbol_table = context.symbol_table
+
+        class_context = PysClassContext(
+            name=name,
+            symbol_table=PysClassSymbolTable(symbol_table),
+            parent=context,
+            parent_entry_position=position
+        )
+
+        result = body(class_context)
+        if result is not None:
+            return result
+
+        try:
+            cls = type(name, class_bases, class_context.symbol_table.symbols)
+            cls.__qualname__ = class_context.qualname
+            cls.__module__ = 'pyscript'
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+        for decorator, dposition in decorators:
+            function = decorator(context)
+
+            try:
+                handle_call(function, context, dposition)
+                cls = function(cls)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, dposition)
+
+        try:
+            symbol_table.set(name, cls)
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, position)
+
+    return class_
+
+def compile_function_body(
+    nbody: PysNode
+) -> Callable[[type[PysNode]], Callable[[PysNode, PysContext], PysRunTimeResult]]:
+
+    """
+    Compiles the body of a function, returns the `get_visitor` of PysFunction that runs the compiled body.
+    """
+
+    if nbody.__class__ is PysReturnNode and nbody.value:
+        # arrow function, the returned expression is called directly
+        value = compile_expression(nbody.value)
+
+        def visit_body(node, context):
+            try:
+                return PysRunTimeResult().success_return(value(context))
+            except PysSignal as signal:
+                return signal.result
+
+    else:
+        body = compile_statement(nbody)
+
+        def visit_body(node, context):
+            try:
+                result = body(context)
+            except PysSignal as signal:
+                return signal.result
+            return NONE if result is None else result
+
+    return {nbody.__class__: visit_body}.__getitem__
+
+def compile_FunctionNode(node: PysFunctionNode) -> Callable[[PysContext], Any]:
+    b_tuple = tuple
+
+    parameters = b_tuple(
+        (nparameter[0].value, compile_expression(nparameter[1]))
+        if nparameter.__class__ is b_tuple else
+        nparameter.value
+        for nparameter in node.parameters
+    )
+    decorators = b_tuple(
+        (compile_expression(ndecorator), ndecorator.position)
+        for ndecorator in reversed(node.decorators)
+    )
+    name = None if node.name is None else node.name.value
+    position = node.position
+    local_names = node.local_names
+    nbody = node.body
+    get_body_visitor = compile_function_body(nbody)
+
+    def function_(context):
+        function = PysFunction(
+            name=name,
+            qualname=context.qualname,
+            parameters=[
+                (parameter[0], parameter[1](context)) if parameter.__class__ is b_tuple else parameter
+                for parameter in parameters
+            ],
+            body=nbody,
+            context=context,
+            position=position,
+            get_visitor=get_body_visitor,
+            local_names=local_names
+        )
+
+        for decorator, dposition in decorators:
+            value = decorator(context)
+
+            try:
+                handle_call(value, context, dposition)
+                function = value(function)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, dposition)
+
+        if name:
+            try:
+                context.symbol_table.set(name, function)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+        return function
+
+    return function_
+
+def compile_GlobalNode(node: PysGlobalNode) -> Callable[[PysContext], Any]:
+    identifiers = tuple(name.value for name in node.identifiers)
+
+    def global_(context):
+        context.symbol_table.globals.update(identifiers)
+
+    return global_
+
+def compile_ReturnNode(node: PysReturnNode) -> Callable[[PysContext], Any]:
+    if node.value:
+        value = compile_expression(node.value)
+        return lambda context : PysRunTimeResult().success_return(value(context))
+
+    return lambda context : PysRunTimeResult().success_return(None)
+
+def compile_ThrowNode(node: PysThrowNode) -> Callable[[PysContext], Any]:
+    target = compile_expression(node.target)
+    target_position = node.target.position
+    primary = compile_expression(node.primary) if node.primary else None
+    primary_position = node.primary.position if node.primary else None
+    position = node.position
+
+    b_BaseException = BaseException
+
+    def throw(context):
+        exception = target(context)
+
+        if not is_object_of(exception, b_BaseException):
+            raise failure(TypeError("exceptions must derive from BaseException"), context, target_position)
+
+        if primary is None:
+            traceback = None
+
+        else:
+            traceback = primary(context)
+
+            if not is_object_of(traceback, b_BaseException):
+                raise failure(TypeError("exceptions must derive from BaseException"), context, primary_position)
+
+            traceback = PysTraceback(traceback, context, primary_position)
+
+        raise PysSignal(
+            PysRunTimeResult().failure(
+                PysTraceback(
+                    exception,
+                    context,
+                    position,
+                    traceback,
+                    primary is not None
+                )
+            )
+        )
+
+    return throw
+
+def compile_AssertNode(node: PysAssertNode) -> Callable[[PysContext], Any]:
+    condition = compile_expression(node.condition)
+    message = compile_expression(node.message) if node.message else None
+    condition_position = node.condition.position
+    position = node.position
+
+    def assert_(context):
+        if context.flags & DEBUG:
+            return
+
+        value = condition(context)
+
+        try:
+            if not value:
+                if message is None:
+                    raise failure(AssertionError, context, position)
+                raise failure(AssertionError(message(context)), context, position)
+        except PysSignal:
+            raise
+        except BaseException as exception:
+            raise failure(exception, context, condition_position)
+
+    return assert_
+
+def compile_DeleteNode(node: PysDeleteNode) -> Callable[[PysContext], Any]:
+    targets = []
+
+    for ntarget in node.targets:
+        ntarget_type = ntarget.__class__
+
+        if ntarget_type is PysIdentifierNode:
+            targets.append((ntarget_type, ntarget.name.value, None, ntarget.position))
+        elif ntarget_type is PysAttributeNode:
+            targets.append(
+                (ntarget_type, compile_expression(ntarget.target), ntarget.attribute.value, ntarget.position)
+            )
+        elif ntarget_type is PysSubscriptNode:
+            targets.append(
+                (ntarget_type, compile_expression(ntarget.target), compile_slice(ntarget.slice), ntarget.position)
+            )
+
+    targets = tuple(targets)
+
+    def delete(context):
+        symbol_table = context.symbol_table
+
+        for ntarget_type, target, operand, position in targets:
+
+            if ntarget_type is PysIdentifierNode:
+                try:
+                    if not symbol_table.remove(target):
+                        raise name_error(symbol_table, target)
+                except PysSignal:
+                    raise
+                except BaseException as exception:
+                    raise failure(exception, context, position)
+
+            elif ntarget_type is PysAttributeNode:
+                value = target(context)
+
+                try:
+                    delattr(value, operand)
+                except PysSignal:
+                    raise
+                except BaseException as exception:
+                    raise failure(exception, context, position)
+
+            else:
+                value = target(context)
+                index = operand(context)
+
+                try:
+                    del value[index]
+                except PysSignal:
+                    raise
+                except BaseException as exception:
+                    raise failure(exception, context, position)
+
+    return delete
+
+def compile_ImportNode(node: PysImportNode) -> Callable[[PysContext], Any]:
+    return compile_visitor(node)
+
+def compile_EllipsisNode(node: PysEllipsisNode) -> Callable[[PysContext], Any]:
+    return lambda context : ...
+
+def compile_ContinueNode(node: PysContinueNode) -> Callable[[PysContext], Any]:
+    return lambda context : CONTINUE
+
+def compile_BreakNode(node: PysBreakNode) -> Callable[[PysContext], Any]:
+    return lambda context : BREAK
+
+def compile_visitor(node: PysNode) -> Callable[[PysContext], Any]:
+    visitor = get_visitor(node.__class__)
+
+    def visit(context):
+        result = visitor(node, context)
+        if result.should_return():
+            if result.error:
+                raise PysSignal(result)
+            return result
+        return result.value
+
+    return visit
+
+def compile_slice(node: PysNode | slice | tuple[PysNode | slice, ...]) -> Callable[[PysContext], Any]:
+    ntype = node.__class__
+
+    if ntype is slice:
+        start = None if node.start is None else compile_expression(node.start)
+        stop = None if node.stop is None else compile_expression(node.stop)
+        step = None if node.step is None else compile_expression(node.step)
+
+        return lambda context : slice(
+            None if start is None else start(context),
+            None if stop is None else stop(context),
+            None if step is None else step(context)
+        )
+
+    elif ntype is tuple:
+        indices = tuple(compile_slice(element) for element in node)
+        return lambda context : tuple([index(context) for index in indices])
+
+    return compile_expression(node)
+
+def compile_declaration(
+    node: PysIdentifierNode | PysAttributeNode | PysSubscriptNode | PysSetNode | PysListNode | PysTupleNode,
+    operand: int
+) -> Callable[[PysContext, Any], None]:
+
+    ntype = node.__class__
+    position = node.position
+
+    if ntype is PysIdentifierNode:
+        name = node.name.value
+        index = node.index
+
+        if index >= 0 and is_equal(operand):
+
+            def declaration(context, value):
+                context.symbol_table.values[index] = value
+
+        elif is_equal(operand):
+
+            def declaration(context, value):
+                symbol_table = context.symbol_table
+
+                try:
+                    if name in symbol_table.globals:
+                        if not symbol_table.set(name, value, operand=operand):
+                            raise name_error(symbol_table, name)
+                    else:
+                        dsetitem(symbol_table.symbols, name, value)
+                except PysSignal:
+                    raise
+                except BaseException as exception:
+                    raise failure(exception, context, position)
+
+        else:
+
+            def declaration(context, value):
+                symbol_table = context.symbol_table
+
+                try:
+                    if not symbol_table.set(name, value, operand=operand):
+                        raise name_error(symbol_table, name)
+                except PysSignal:
+                    raise
+                except BaseException as exception:
+                    raise failure(exception, context, position)
+
+    elif ntype is PysAttributeNode:
+        target = compile_expression(node.target)
+        attribute = node.attribute.value
+        function = None if is_equal(operand) else GET_BINARY_FUNCTION(operand)
+
+        def declaration(context, value):
+            object = target(context)
+
+            try:
+                setattr(object, attribute, value if function is None else function(getattr(object, attribute), value))
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    elif ntype is PysSubscriptNode:
+        target = compile_expression(node.target)
+        slice = compile_slice(node.slice)
+        function = None if is_equal(operand) else GET_BINARY_FUNCTION(operand)
+
+        def declaration(context, value):
+            object = target(context)
+            index = slice(context)
+
+            try:
+                object[index] = value if function is None else function(object[index], value)
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+    elif is_sequence(ntype):
+        elements = tuple(compile_declaration(element, operand) for element in node.elements)
+        length = len(elements)
+
+        def declaration(context, value):
+            if not isinstance(value, Iterable):
+                raise failure(TypeError(f"cannot unpack non-iterable {type(value).__name__} object"), context, position)
+
+            count = 0
+
+            try:
+                for element, element_value in zip(elements, value):
+                    element(context, element_value)
+                    count += 1
+            except PysSignal:
+                raise
+            except BaseException as exception:
+                raise failure(exception, context, position)
+
+            if count < length:
+                raise failure(
+                    ValueError(f"not enough values to unpack (expected {length}, got {count})"),
+                    context,
+                    position
+                )
+
+            elif count > length:
+                raise failure(ValueError(f"to many values to unpack (expected {length})"), context, position)
+
+    else:
+
+        def declaration(context, value):
+            pass
+
+    return declaration
+
+def compile_expression(node: PysNode) -> Callable[[PysContext], Any]:
+    ntype = node.__class__
+
+    if is_expression(ntype):
+        return get_compiler(ntype)(node)
+    elif ntype is PysAssignmentNode:
+        return compile_AssignmentNode(node, True)
+
+    return compile_visitor(node)
+
+def compile_statement(node: PysNode) -> Callable[[PysContext], Any]:
+    compiled = get_compiler(node.__class__)(node)
+
+    if is_expression(node.__class__):
+        def statement(context):
+            compiled(context)
+        return statement
+
+    return compiled
+
+def compile_node(node: PysNode) -> Callable[[PysContext], PysRunTimeResult]:
+
+    """
+    Compile an analyzed node into a closure that has the same behavior as the tree-walk interpreter
+    (`pyscript.core.interpreter`). The closure takes a context and returns a PysRunTimeResult object.
+    """
+
+    ntype = node.__class__
+    expression = is_expression(ntype) or ntype is PysAssignmentNode
+    compiled = compile_expression(node) if expression else compile_statement(node)
+
+    def run(context):
+        try:
+            value = compiled(context)
+        except PysSignal as signal:
+            return signal.result
+        if expression:
+            return PysRunTimeResult().success(value)
+        return PysRunTimeResult().success(None) if value is None else value
+
+    return run
+
+get_compiler: Callable[[type[PysNode]], Callable[[PysNode], Callable[[PysContext], Any]]] = {
+    class_node: globals()['compile_' + class_node.__name__.removeprefix('Pys')]
+    for class_node in PysNode.__subclasses__()
+}.__getitem__
\ No newline at end of file
@@ -13,11 +13,14 @@ ENV_PYSCRIPT_NO_EXCEPTHOOK = 'PYSCRIPT_NO_EXCEPTHOOK'
 ENV_PYSCRIPT_NO_GIL = 'PYSCRIPT_NO_GIL'
 ENV_PYSCRIPT_NO_READLINE = 'PYSCRIPT_NO_READLINE'
 ENV_PYSCRIPT_NO_TYPECHECK = 'PYSCRIPT_NO_TYPECHECK'
+ENV_PYSCRIPT_DEBUG_TYPECHECK = 'PYSCRIPT_DEBUG_TYPECHECK'
 ENV_PYSCRIPT_NO_COLOR_PROMPT = 'PYSCRIPT_NO_COLOR_PROMPT'
 ENV_PYSCRIPT_MAXIMUM_TRACEBACK_LINE = 'PYSCRIPT_MAXIMUM_TRACEBACK_LINE'
 ENV_PYSCRIPT_CLASSIC_LINE_SHELL = 'PYSCRIPT_CLASSIC_LINE_SHELL'
 ENV_PYSCRIPT_HISTORY_PATH = 'PYSCRIPT_HISTORY_PATH'
 ENV_PYSCRIPT_MAXIMUM_HISTORY_LINE = 'PYSCRIPT_MAXIMUM_HISTORY_LINE'
+ENV_PYSCRIPT_NO_CACHE = 'PYSCRIPT_NO_CACHE'
+ENV_PYSCRIPT_CACHE_PATH = 'PYSCRIPT_CACHE_PATH'
 
 KEYWORDS = (
     '__debug__', 'False', 'None', 'True', 'and', 'as', 'assert', 'break', 'case', 'catch', 'class', 'constructor',
@@ -40,7 +43,9 @@ RETURN_RESULT = 1 << 3
 DONT_SHOW_BANNER_ON_SHELL = 1 << 4
 CLASSIC_LINE_SHELL = 1 << 5
 NO_COLOR_PROMPT = 1 << 6
+COMPILE_CLOSURE = 1 << 7
 NOTEBOOK = CLASSIC_LINE_SHELL | NO_COLOR_PROMPT
 
 LEXER_HIGHLIGHT = 1 << 0
-DICT_TO_JSDICT = 1 << 1
\ No newline at end of file
+DICT_TO_JSDICT = 1 << 1
+OPTIMIZE = 1 << 2
\ No newline at end of file
@@ -1,15 +1,20 @@
 """
-All Editor Application Implementations for PyScript.
+All Editor Application Implementations for PyScript. The editors are imported on first use (PEP 562), they load
+tkinter or prompt_toolkit.
 """
 
-from . import (
-    bases,
-    gui,
-    terminal
-)
+from importlib import import_module
 
 __all__ = (
     'bases',
     'gui',
     'terminal'
-)
\ No newline at end of file
+)
+
+def __getattr__(name: str):
+    if name in __all__:
+        return import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
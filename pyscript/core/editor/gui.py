@@ -1,7 +1,7 @@
 from .bases import PysEditor
 from ..buffer import PysFileBuffer
 from ..constants import ICON_PATH
-from ..highlight import PygmentsPyScriptStyle, PygmentsPyScriptLexer
+from ..highlight import PygmentsPyScriptStyle, PygmentsPyScriptLexer, PysIncrementalHighlighter
 from ..utils.generic import boundary
 from ..version import __version__
 
@@ -87,7 +87,6 @@ try:
                 text.insert('insert', '\n' + line[:len(line) - len(line.lstrip())])
                 return 'break'
 
-            self.lexer = PygmentsPyScriptLexer()
             self.font = Font(family='Consolas', size=boundary(self.get_configuration('gui-size-font', 10), 1, 127))
             self.scrollbar = Scrollbar(self)
             self.text = Text(
@@ -144,32 +143,54 @@ try:
             self.wm_protocol('WM_DELETE_WINDOW', on_close)
 
             if colored:
+                self.lexer = PygmentsPyScriptLexer()
+                self.highlighter = PysIncrementalHighlighter(self.lexer)
+
+                # the tags of the token types with a color, the other tokens are not tagged
+                tags = {}
                 tag_configure = self.text.tag_configure
                 for token, style in PygmentsPyScriptStyle.list_styles():
                     color = style['color']
                     if color:
-                        tag_configure(str(token), foreground=f'#{color}')
+                        tags[token] = str(token)
+                        tag_configure(tags[token], foreground=f'#{color}')
 
                 def update():
                     self.title(f'PyScript {__version__} - {self.basename}{"*" if self.modified else ""}')
 
-                    index = '1.0'
-
                     text = self.text
-                    text_tag_add = text.tag_add
+                    start, stop = self.highlighter.update(text.get('1.0', 'end-1c'))
+
+                    if start == stop:
+                        return
+
+                    # only the lines lexed again are tagged again, the tags of the others follow their text
+                    first_index = f'{start + 1}.0'
+                    last_index = f'{stop + 1}.0'
                     text_tag_remove = text.tag_remove
-                    text_index = text.index
-                    get_length = len
-                    to_string = str
-
-                    for tag in text.tag_names():
-                        if tag != 'sel':
-                            text_tag_remove(tag, '1.0', 'end')
-
-                    for type, value in self.lexer.get_tokens(text.get('1.0', 'end')):
-                        end_index = text_index(f'{index} + {get_length(value)} chars')
-                        text_tag_add(to_string(type), index, end_index)
-                        index = end_index
+
+                    for tag in tags.values():
+                        text_tag_remove(tag, first_index, last_index)
+
+                    indexes = {}
+                    get_line_tokens = self.highlighter.get_line_tokens
+
+                    for line in range(start, stop):
+                        column = 0
+                        for type, value in get_line_tokens(line):
+                            end = column + len(value)
+                            tag = tags.get(type, None)
+                            if tag is not None:
+                                tag_indexes = indexes.get(tag, None)
+                                if tag_indexes is None:
+                                    tag_indexes = indexes[tag] = []
+                                tag_indexes.append(f'{line + 1}.{column}')
+                                tag_indexes.append(f'{line + 1}.{end}')
+                            column = end
+
+                    text_tag_add = text.tag_add
+                    for tag, tag_indexes in indexes.items():
+                        text_tag_add(tag, *tag_indexes)
 
             else:
                 def update():
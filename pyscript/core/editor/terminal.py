@@ -1,6 +1,6 @@
 from .bases import PysEditor
 from ..buffer import PysFileBuffer
-from ..highlight import PYGMENTS, PygmentsPyScriptStyle, PygmentsPyScriptLexer
+from ..highlight import PYGMENTS, PygmentsPyScriptStyle, PysIncrementalHighlighter
 from ..version import __version__
 
 try:
@@ -12,11 +12,42 @@ try:
     from prompt_toolkit.layout.containers import ConditionalContainer
     from prompt_toolkit.layout.controls import FormattedTextControl
     from prompt_toolkit.layout.processors import TabsProcessor
-    from prompt_toolkit.lexers import PygmentsLexer
+    from prompt_toolkit.lexers import Lexer
     from prompt_toolkit.output.color_depth import ColorDepth
-    from prompt_toolkit.styles.pygments import style_from_pygments_cls
+    from prompt_toolkit.styles.pygments import pygments_token_to_classname, style_from_pygments_cls
     from prompt_toolkit.widgets import TextArea
 
+    class PysTerminalLexer(Lexer):
+
+        """
+        prompt_toolkit lexer of the terminal editor, on the incremental highlighter of the editors.
+        """
+
+        def __init__(self) -> None:
+            self.highlighter = PysIncrementalHighlighter()
+            self.styles = {}
+
+        def get_style(self, type) -> str:
+            style = self.styles.get(type, None)
+            if style is None:
+                style = self.styles[type] = 'class:' + pygments_token_to_classname(type)
+            return style
+
+        def lex_document(self, document):
+            highlighter = self.highlighter
+            highlighter.update(document.text)
+
+            # the lines of the highlighter are replaced by the next update, the document keeps its own
+            tokens = highlighter.tokens[:]
+            get_style = self.get_style
+
+            def get_line(line):
+                if 0 <= line < len(tokens):
+                    return [(get_style(type), value) for type, value in tokens[line]]
+                return []
+
+            return get_line
+
     class PysTerminalEditor(PysEditor, Application):
 
         def __init__(self, file: PysFileBuffer, colored: bool = True) -> None:
@@ -41,7 +72,7 @@ try:
 
                 if PYGMENTS:
                     text_other_keyword.update({
-                        'lexer': PygmentsLexer(PygmentsPyScriptLexer),
+                        'lexer': PysTerminalLexer(),
                     })
                     app_other_keyword.update({
                         'style': style_from_pygments_cls(PygmentsPyScriptStyle)
@@ -25,22 +25,27 @@ class PysTraceback(Pys):
         primary: Optional['PysTraceback'] = None,
         implicit: bool = False
     ) -> None:
-        # circular import problem solved
-        from .cache import pys_sys
-
+        # a lightweight record, the frames are formatted by string_traceback and sys.last_* is set by set_last only
+        # when the traceback reaches the top level
         setimuattr(self, 'exception', exception)
         setimuattr(self, 'context', context)
         setimuattr(self, 'position', position)
         setimuattr(self, 'primary', primary)
         setimuattr(self, 'implicit', implicit)
 
+    def __repr__(self) -> str:
+        return f'<traceback of {self.exception!r}>'
+
+    def set_last(self) -> None:
+        # circular import problem solved
+        from .cache import pys_sys
+
+        exception = self.exception
+
         pys_sys.last_type = type(exception) if isinstance(exception, BaseException) else exception
         pys_sys.last_value = exception if isinstance(exception, BaseException) else None
         pys_sys.last_traceback = self
 
-    def __repr__(self) -> str:
-        return f'<traceback of {self.exception!r}>'
-
     def string_traceback(self) -> str:
         # circular import problem solved
         from .mapping import GET_ACOLOR
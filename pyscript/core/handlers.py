@@ -1,66 +1,115 @@
-from .cache import pys_sys
+from .cache import pys_sys, undefined
 from .constants import ENV_PYSCRIPT_NO_GIL
 from .context import PysContext
 from .position import PysPosition
-from .pystypes import PysFunction
+from .pystypes import PysFunction, call_site
 from .utils.generic import is_environ
 
 from types import MethodType
 from typing import Any
 
 wrapper_function = (MethodType, classmethod, staticmethod)
+object_getattribute = object.__getattribute__
 
-if is_environ(ENV_PYSCRIPT_NO_GIL):
+# types kept by a method cache, the cache is cleared beyond (megamorphic call site)
+METHOD_CACHE_SIZE = 8
 
-    def handle_call(object: Any, context: PysContext, position: PysPosition) -> None:
-        ins = isinstance
+set_call_site = call_site.set
 
-        if ins(object, PysFunction):
-            code = object.__code__
-            code.context = context
-            code.position = position
+def handle_call(object: Any, context: PysContext, position: PysPosition) -> None:
 
-        elif ins(object, wrapper_function):
-            handle_call(object.__func__, context, position)
+    """
+    Registers the call site (context and position) of a function before it is called. The call site is kept per thread
+    (and per asyncio task), so the calls do not share any lock and concurrent calls get their own traceback.
+    """
 
-        elif ins(object, type):
-            gt = getattr
+    ins = isinstance
 
-            method = gt(object, '__new__', None)
-            if method is not None:
-                handle_call(method, context, position)
+    if ins(object, PysFunction):
+        code = object.__code__
+        # the last call site is kept on the code for functions called back outside of the interpreter
+        code.call_site = site = (context, position)
+        set_call_site((code, site))
 
-            method = gt(object, '__init__', None)
-            if method is not None:
-                handle_call(method, context, position)
+    elif ins(object, wrapper_function):
+        handle_call(object.__func__, context, position)
 
-    GIL = pys_sys.gil = False
+    elif ins(object, type):
+        gt = getattr
 
-else:
-    from threading import RLock
-    gil_lock = RLock()
+        method = gt(object, '__new__', None)
+        if method is not None:
+            handle_call(method, context, position)
 
-    def handle_call(object: Any, context: PysContext, position: PysPosition) -> None:
-        with gil_lock:
-            ins = isinstance
+        method = gt(object, '__init__', None)
+        if method is not None:
+            handle_call(method, context, position)
 
-            if ins(object, PysFunction):
-                code = object.__code__
-                code.context = context
-                code.position = position
+def get_cached_method(cache: dict[type, tuple | None], object: Any, name: str) -> PysFunction | None:
 
-            elif ins(object, wrapper_function):
-                handle_call(object.__func__, context, position)
+    """
+    Returns the PyScript function found by `object.name` in the class of the object, for the call site to call it with
+    the object instead of binding a method, or None if the attribute is anything else (the caller then gets it with
+    getattr). The lookup is kept in `cache` by type and checked again at every call against the dictionaries of the
+    classes it went through and of the object, so an assigned or deleted attribute is seen at once.
+    """
 
-            elif ins(object, type):
-                gt = getattr
+    otype = type(object)
+    entry = cache.get(otype, undefined)
 
-                method = gt(object, '__new__', None)
-                if method is not None:
-                    handle_call(method, context, position)
+    if entry is None:
+        return None
 
-                method = gt(object, '__init__', None)
-                if method is not None:
-                    handle_call(method, context, position)
+    elif entry is not undefined:
+        mro, owner, shadows, function, has_dict = entry
 
-    GIL = pys_sys.gil = True
\ No newline at end of file
+        if (
+            otype.__mro__ is mro and
+            owner.get(name, None) is function and
+            otype.__getattribute__ is object_getattribute and
+            not (has_dict and name in object.__dict__)
+        ):
+            for shadow in shadows:
+                if name in shadow:
+                    break
+            else:
+                return function
+
+    if len(cache) >= METHOD_CACHE_SIZE:
+        cache.clear()
+
+    entry = None
+    mro = otype.__mro__
+
+    if otype.__getattribute__ is object_getattribute:
+        for index, base in enumerate(mro):
+            owner = base.__dict__
+            if name in owner:
+                function = owner[name]
+                if function.__class__ is PysFunction:
+                    entry = (
+                        mro, owner, tuple(base.__dict__ for base in mro[:index]), function, otype.__dictoffset__ != 0
+                    )
+                break
+
+    # the other attributes are never cached again for this type, they are got by getattr
+    cache[otype] = entry
+
+    if entry is None or (entry[4] and name in object.__dict__):
+        return None
+
+    return entry[3]
+
+def is_handled_call(object: Any) -> bool:
+
+    """
+    Returns whether handle_call registers anything for the object (PyScript functions, their wrappers and classes).
+    Native callables never need their call site.
+    """
+
+    if isinstance(object, wrapper_function):
+        return is_handled_call(object.__func__)
+
+    return isinstance(object, (PysFunction, type))
+
+GIL = pys_sys.gil = not is_environ(ENV_PYSCRIPT_NO_GIL)
\ No newline at end of file
@@ -13,7 +13,10 @@ from .utils.string import normstr
 
 from html import escape as html_escape
 from types import MappingProxyType
-from typing import Callable, Optional
+from typing import Any, Callable, Iterator, Optional, Protocol, runtime_checkable
+
+# number of formatted pieces joined into one chunk by pys_highlight_iter
+HIGHLIGHT_CHUNK_SIZE = 4096
 
 HIGHLIGHT_MAP = MappingProxyType({
     'default': '#D4D4D4',
@@ -356,6 +359,203 @@ try:
             (r'\A/(clear|clean|exit)\Z', Generic.Prompt)
         ] + tokens['root']
 
+    class PysIncrementalHighlighter(Pys):
+
+        """
+        Incremental highlighter of the editors. The document is lexed with a Pygments RegexLexer (the PyScript lexer by
+        default) like RegexLexer.get_tokens_unprocessed on the whole document followed by a newline, the tokens are
+        kept by line (split at the newlines). The rules are matched on the whole document, so the rules that look past
+        a newline (a function call or a class name on the next line) give the tokens of the whole document.
+
+        The state of the lexer is cached at a checkpoint of each line, the first match of the line that starts with a
+        non-whitespace character. After an edit, the document is lexed again from the checkpoint of the last line
+        before the first changed line, until the checkpoint of an unchanged line has the cached state, the tokens of
+        the following lines are reused. This relies on the rules of the lexer looking past their match only over
+        whitespace and then at most one word, as the rules of the PyScript lexer do: the tokens before a checkpoint do
+        not depend on the text after its line.
+        """
+
+        __slots__ = ('lexer', 'tokendefs', 'text', 'lines', 'tokens', 'checkpoints')
+
+        def __init__(self, lexer: Optional[RegexLexer] = None) -> None:
+            self.lexer = lexer = PygmentsPyScriptLexer() if lexer is None else lexer
+            # the compiled rules, made by the public method of the metaclass of RegexLexer (not its private cache)
+            lexer_class = lexer.__class__
+            self.tokendefs = lexer_class.process_tokendef('', lexer_class.get_tokendefs())
+            self.text = ''
+            self.lines = ['']
+            self.tokens = [()]
+            # the (column, number of tokens before, state stack) of the checkpoint of each line, None without one
+            self.checkpoints = [None]
+
+        def update(self, text: str) -> tuple[int, int]:
+
+            """
+            Highlights the new text of the document. Returns the range (start, stop) of the lines whose tokens changed.
+            """
+
+            if text == self.text:
+                return 0, 0
+
+            lines = text.split('\n')
+            old_lines = self.lines
+            tokens = self.tokens
+            checkpoints = self.checkpoints
+
+            count = len(lines)
+            limit = min(count, len(old_lines))
+
+            first = 0
+            while first < limit and lines[first] == old_lines[first]:
+                first += 1
+
+            suffix = 0
+            while suffix < limit - first and lines[-1 - suffix] == old_lines[-1 - suffix]:
+                suffix += 1
+
+            unchanged = count - suffix
+            shift = count - len(old_lines)
+
+            # the lexer restarts at the checkpoint of the last line before the first changed line
+            start = first - 1
+            while start >= 0 and checkpoints[start] is None:
+                start -= 1
+
+            if start < 0:
+                start = column = 0
+                stack = ('root',)
+                checkpoint = None
+                line_tokens = []
+            else:
+                checkpoint = checkpoints[start]
+                column, index, stack = checkpoint
+                line_tokens = list(tokens[start][:index])
+
+            lexer = self.lexer
+            tokendefs = self.tokendefs
+            token_type = Whitespace.__class__
+
+            source = text + '\n'
+            size = len(text)
+            line = start
+            line_start = sum(map(len, lines[:start])) + start
+            next_line_start = line_start + len(lines[start]) + 1
+            position = line_start + column
+
+            statestack = list(stack)
+            statetokens = tokendefs[statestack[-1]]
+            new_tokens = []
+            new_checkpoints = []
+            stop = None
+
+            while True:
+                if checkpoint is None and position < next_line_start and position < size and \
+                   not source[position].isspace():
+                    checkpoint = (position - line_start, len(line_tokens), tuple(statestack))
+
+                    # synchronized, the following text is unchanged and lexed from the same state
+                    if line >= unchanged and checkpoint == checkpoints[line - shift]:
+                        line_tokens.extend(tokens[line - shift][checkpoint[1]:])
+                        new_tokens.append(tuple(line_tokens))
+                        new_checkpoints.append(checkpoint)
+                        stop = line + 1
+                        break
+
+                for rexmatch, action, new_state in statetokens:
+                    match = rexmatch(source, position)
+                    if match:
+                        if action is None:
+                            match_tokens = ()
+                        elif action.__class__ is token_type:
+                            match_tokens = ((position, action, match.group()),)
+                        else:
+                            match_tokens = action(lexer, match)
+
+                        position = match.end()
+
+                        if new_state is not None:
+                            if isinstance(new_state, tuple):
+                                for state in new_state:
+                                    if state == '#pop':
+                                        if len(statestack) > 1:
+                                            statestack.pop()
+                                    elif state == '#push':
+                                        statestack.append(statestack[-1])
+                                    else:
+                                        statestack.append(state)
+                            elif isinstance(new_state, int):
+                                if abs(new_state) >= len(statestack):
+                                    del statestack[1:]
+                                else:
+                                    del statestack[new_state:]
+                            elif new_state == '#push':
+                                statestack.append(statestack[-1])
+                            statetokens = tokendefs[statestack[-1]]
+
+                        break
+
+                else:
+                    if position >= len(source):
+                        break
+
+                    character = source[position]
+
+                    if character == '\n':
+                        # an unmatched newline resets the state
+                        statestack = ['root']
+                        statetokens = tokendefs['root']
+                        match_tokens = ((position, Whitespace, character),)
+                    else:
+                        match_tokens = ((position, Error, character),)
+
+                    position += 1
+
+                # the tokens are split at the newlines, the newlines are not part of the tokens of a line
+                for token_position, type, value in match_tokens:
+                    while True:
+                        newline = value.find('\n')
+
+                        while token_position >= next_line_start:
+                            new_tokens.append(tuple(line_tokens))
+                            new_checkpoints.append(checkpoint)
+                            line += 1
+                            line_tokens = []
+                            checkpoint = None
+                            line_start = next_line_start
+                            next_line_start += len(lines[line]) + 1 if line < count else 1
+
+                        if newline < 0:
+                            if value:
+                                line_tokens.append((type, value))
+                            break
+
+                        if newline > 0:
+                            line_tokens.append((type, value[:newline]))
+
+                        token_position += newline + 1
+                        value = value[newline + 1:]
+
+            if stop is None:
+                while line < count:
+                    new_tokens.append(tuple(line_tokens))
+                    new_checkpoints.append(checkpoint)
+                    line += 1
+                    line_tokens = []
+                    checkpoint = None
+
+                stop = count
+
+            tokens[start:stop - shift] = new_tokens
+            checkpoints[start:stop - shift] = new_checkpoints
+
+            self.text = text
+            self.lines = lines
+
+            return start, stop
+
+        def get_line_tokens(self, line: int) -> tuple[tuple[Any, str], ...]:
+            return self.tokens[line]
+
     del (
         _set_constant_keywords, _keywords, _unicode_name, _newlines, _integer, _scientific, _imaginary, _dollar,
         _follow_identifier, _raw_string_prefixes, _string_or_bytes_prefixes
@@ -377,6 +577,10 @@ except BaseException as e:
     class PygmentsPyScriptShellLexer(PygmentsPyScriptLexer):
         pass
 
+    class PysIncrementalHighlighter(Pys):
+        def __new__(cls, *args, **kwargs):
+            raise ImportError(f"cannot import module pygments: {_error}") from _error
+
     PYGMENTS = False
 
 @typecheck
@@ -393,6 +597,9 @@ class PysHighlightFormatter(Pys):
         self.open_block = open_block
         self.close_block = close_block
 
+        self.reset()
+
+    def reset(self) -> None:
         self._type = 'start'
         self._open = False
 
@@ -442,45 +649,25 @@ HLFMT_BBCODE = PysHighlightFormatter(
 
 del _ansi_open_block
 
-@typecheck
-def pys_highlight(
-    source,
-    formatter: Optional[Callable[[str, PysPosition, str], str]] = None,
-    max_bracket_level: int = 3
-) -> str:
-    """
-    Highlight a PyScript code from source given.
-
-    Parameters
-    ----------
-    - source : A PyScript source code (tolerant of syntax errors).
-
-    - formatter : A function to format the code form.
-
-    - max_bracket_level : Maximum difference level of brackets (with circular indexing).
-
-    Returns
-    -------
-    Highlighted code as a string.
-    """
-
-    file = PysFileBuffer(source)
-
-    if max_bracket_level < 0:
-        raise ValueError("pys_highlight(): max_bracket_level must be grather than 0")
+def _iter_highlight(
+    file: PysFileBuffer,
+    formatter: Callable[[str, PysPosition, str], str],
+    max_bracket_level: int
+) -> Iterator[str]:
 
-    if formatter is None:
-        formatter = HLFMT_HTML
+    if isinstance(formatter, PysHighlightFormatter):
+        # a previous highlight may have been stopped before its end token
+        formatter.reset()
 
-    lexer = PysLexer(
+    tokens = PysLexer(
         file=file,
         parser_flags=LEXER_HIGHLIGHT
-    )
+    ).iter_tokens()
 
-    tokens, _ = lexer.make_tokens()
     text = file.text
 
-    result = ''
+    chunk = []
+    append = chunk.append
     last_index = 0
     brackets_stack = []
 
@@ -495,9 +682,15 @@ def pys_highlight(
     T_NONE = TOKENS['NONE']
     T_WHITESPACES = frozenset([T_NEWLINE, T_COMMENT])
 
-    for i, token in enumerate(tokens):
+    # the tokens are streamed from the lexer, an identifier looks behind at the last token that is not a whitespace
+    # and ahead at the next token
+    last_token = None
+    token = next(tokens)
+
+    while True:
         ttype = token.type
         tvalue = token.value
+        next_token = None if ttype == T_NULL else next(tokens, None)
 
         if ttype == T_NULL:
             type_format = 'end'
@@ -510,21 +703,14 @@ def pys_highlight(
                 type_format = 'identifier-type'
             elif tvalue in BUILTIN_FUNCTIONS:
                 type_format = 'identifier-function'
+            elif last_token is not None and last_token.match(T_KEYWORD, 'class'):
+                type_format = 'identifier-type'
+            elif last_token is not None and last_token.match(T_KEYWORD, 'func', 'function'):
+                type_format = 'identifier-function'
+            elif next_token is not None and next_token.type == T_LEFT_PARENTHESIS:
+                type_format = 'identifier-function'
             else:
-                j = i - 1
-                while j > 0 and tokens[j].type in T_WHITESPACES:
-                    j -= 1
-                last_is = tokens[j].match
-                if last_is(T_KEYWORD, 'class'):
-                    type_format = 'identifier-type'
-                elif last_is(T_KEYWORD, 'func', 'function'):
-                    type_format = 'identifier-function'
-                else:
-                    j = i + 1
-                    if (j < len(tokens) and tokens[j].type == T_LEFT_PARENTHESIS):
-                        type_format = 'identifier-function'
-                    else:
-                        type_format = 'identifier-constant' if tvalue.isupper() else 'identifier'
+                type_format = 'identifier-constant' if tvalue.isupper() else 'identifier'
 
         elif ttype == T_NUMBER:
             type_format = 'number'
@@ -553,13 +739,102 @@ def pys_highlight(
         else:
             type_format = 'default'
 
-        if space := text[last_index:token.position.start]:
-            result += formatter('default', PysPosition(file, last_index, token.position.start), space)
-        result += formatter(type_format, token.position, text[token.position.start:token.position.end])
+        start = token.position.start
+
+        if space := text[last_index:start]:
+            append(formatter('default', PysPosition(file, last_index, start), space))
+        append(formatter(type_format, token.position, text[start:token.position.end]))
 
         if ttype == T_NULL:
             break
 
+        if len(chunk) >= HIGHLIGHT_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk.clear()
+
+        if ttype not in T_WHITESPACES:
+            last_token = token
+
         last_index = token.position.end
+        token = next_token
+
+    yield ''.join(chunk)
+
+@typecheck
+def pys_highlight_iter(
+    source,
+    formatter: Optional[Callable[[str, PysPosition, str], str]] = None,
+    max_bracket_level: int = 3
+) -> Iterator[str]:
+    """
+    Highlight a PyScript code from source given, chunk by chunk.
+
+    Parameters
+    ----------
+    - source : A PyScript source code (tolerant of syntax errors).
+
+    - formatter : A function to format the code form.
+
+    - max_bracket_level : Maximum difference level of brackets (with circular indexing).
+
+    Returns
+    -------
+    An iterator of the highlighted code in chunks, made as the source is tokenized.
+    """
+
+    file = PysFileBuffer(source)
+
+    if max_bracket_level < 0:
+        raise ValueError("pys_highlight_iter(): max_bracket_level must be greater than or equal to 0")
+
+    if formatter is None:
+        formatter = HLFMT_HTML
+
+    return _iter_highlight(file, formatter, max_bracket_level)
+
+@runtime_checkable
+class PysWritable(Protocol):
+
+    """
+    Any object with a write(str) method, the stream type accepted by pys_highlight (a file, io.StringIO, sys.stdout).
+    """
+
+    def write(self, string: str, /) -> Any: ...
+
+@typecheck
+def pys_highlight(
+    source,
+    formatter: Optional[Callable[[str, PysPosition, str], str]] = None,
+    max_bracket_level: int = 3,
+    file: Optional[PysWritable] = None
+) -> str | None:
+    """
+    Highlight a PyScript code from source given.
+
+    Parameters
+    ----------
+    - source : A PyScript source code (tolerant of syntax errors).
+
+    - formatter : A function to format the code form.
+
+    - max_bracket_level : Maximum difference level of brackets (with circular indexing).
+
+    - file : A text stream (any object with a write method), the highlighted code is written to it as it is made
+             instead of being returned.
+
+    Returns
+    -------
+    Highlighted code as a string, or None if written to a file.
+    """
+
+    if max_bracket_level < 0:
+        raise ValueError("pys_highlight(): max_bracket_level must be greater than or equal to 0")
+
+    chunks = pys_highlight_iter(source, formatter, max_bracket_level)
+
+    if file is None:
+        return ''.join(chunks)
 
-    return result
\ No newline at end of file
+    write = file.write
+    for chunk in chunks:
+        write(chunk)
\ No newline at end of file
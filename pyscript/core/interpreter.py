@@ -2,10 +2,10 @@
 
 from .constants import DEBUG
 from .cache import undefined
-from .checks import is_sequence, is_equal, is_public_attribute
+from .checks import is_sequence, is_equal, is_public_attribute, is_jump_table_type
 from .context import PysContext, PysClassContext
 from .exceptions import PysTraceback
-from .handlers import handle_call
+from .handlers import handle_call, get_cached_method, is_handled_call, set_call_site
 from .mapping import GET_BINARY_FUNCTION, GET_UNARY_FUNCTION, GET_VALUE_FROM_CONSTANT_KEYWORDS
 from .nodes import *
 from .pysbuiltins import ce, nce, increment, decrement
@@ -47,9 +47,14 @@ def visit_IdentifierNode(node: PysIdentifierNode, context: PysContext) -> PysRun
     result._position = position = node.position
     name = node.name.value
     symbol_table = context.symbol_table
+    index = node.index
 
     with result:
-        value = symbol_table.get(name)
+        # local names are read from the slots of the function frame
+        value = undefined if index < 0 else symbol_table.values[index]
+
+        if value is undefined:
+            value = symbol_table.get(name)
 
         if value is undefined:
             closest_symbol = find_closest(symbol_table, name)
@@ -174,13 +179,19 @@ def visit_SubscriptNode(node: PysSubscriptNode, context: PysContext) -> PysRunTi
     should_return = result.should_return
     ntarget = node.target
 
-    target = register(get_visitor(ntarget.__class__)(ntarget, context))
-    if should_return():
-        return result
+    # fused a[i]: the constant and local operands are read without visiting them
+    target = get_operand_value(ntarget, context)
+    if target is undefined:
+        target = register(get_visitor(ntarget.__class__)(ntarget, context))
+        if should_return():
+            return result
 
-    slice = register(visit_slice_from_SubscriptNode(node.slice, context))
-    if should_return():
-        return result
+    nslice = node.slice
+    slice = get_operand_value(nslice, context)
+    if slice is undefined:
+        slice = register(visit_slice_from_SubscriptNode(nslice, context))
+        if should_return():
+            return result
 
     result._context = context
     result._position = node.position
@@ -195,10 +206,39 @@ def visit_CallNode(node: PysCallNode, context: PysContext) -> PysRunTimeResult:
     register = result.register
     should_return = result.should_return
     ntarget = node.target
+    method = None
 
-    target = register(get_visitor(ntarget.__class__)(ntarget, context))
-    if should_return():
-        return result
+    if ntarget.__class__ is PysAttributeNode:
+        # a PyScript method is called with the object, without binding it (see get_cached_method)
+        nobject = ntarget.target
+
+        object = get_operand_value(nobject, context)
+        if object is undefined:
+            object = register(get_visitor(nobject.__class__)(nobject, context))
+            if should_return():
+                return result
+
+        cache = node.method_cache
+        if cache is None:
+            cache = {}
+            setimuattr(node, 'method_cache', cache)
+
+        nattribute = ntarget.attribute
+        method = get_cached_method(cache, object, nattribute.value)
+
+        if method is None:
+            result._context = context
+            result._position = nattribute.position
+            with result:
+                target = getattr(object, nattribute.value)
+
+            if should_return():
+                return result
+
+    else:
+        target = register(get_visitor(ntarget.__class__)(ntarget, context))
+        if should_return():
+            return result
 
     args = []
     kwargs = {}
@@ -211,20 +251,35 @@ def visit_CallNode(node: PysCallNode, context: PysContext) -> PysRunTimeResult:
 
         if nargument.__class__ is b_tuple:
             keyword, nvalue = nargument
-            add_kwarg(keyword.value, register(get_visitor(nvalue.__class__)(nvalue, context)))
-            if should_return():
-                return result
+            value = get_operand_value(nvalue, context)
+            if value is undefined:
+                value = register(get_visitor(nvalue.__class__)(nvalue, context))
+                if should_return():
+                    return result
+
+            add_kwarg(keyword.value, value)
 
         else:
-            add_arg(register(get_visitor(nargument.__class__)(nargument, context)))
-            if should_return():
-                return result
+            value = get_operand_value(nargument, context)
+            if value is undefined:
+                value = register(get_visitor(nargument.__class__)(nargument, context))
+                if should_return():
+                    return result
+
+            add_arg(value)
 
     result._context = context
     result._position = nposition = node.position
     with result:
-        handle_call(target, context, nposition)
-        return result.success(target(*args, **kwargs))
+        if method is None:
+            handle_call(target, context, nposition)
+            return result.success(target(*args, **kwargs))
+
+        # the call site of a PyScript function (see handle_call)
+        code = method.__code__
+        code.call_site = site = (context, nposition)
+        set_call_site((code, site))
+        return result.success(method(object, *args, **kwargs))
 
     return result
 
@@ -396,13 +451,40 @@ def visit_AssignmentNode(node: PysAssignmentNode, context: PysContext) -> PysRun
 
     register = result.register
     should_return = result.should_return
+    ntarget = node.target
     nvalue = node.value
+    operand = node.operand.type
 
-    value = register(get_visitor(nvalue.__class__)(nvalue, context))
-    if should_return():
-        return result
+    value = get_operand_value(nvalue, context)
+    if value is undefined:
+        value = register(get_visitor(nvalue.__class__)(nvalue, context))
+        if should_return():
+            return result
+
+    if ntarget.__class__ is PysIdentifierNode:
+        # fused i = x and i += x of a local name, the other names are declared by
+        # visit_declaration_from_AssignmentNode (undefined names included, for the error)
+        index = ntarget.index
+
+        if index >= 0:
+            values = context.symbol_table.values
+
+            if is_equal(operand):
+                values[index] = value
+                return result.success(value)
 
-    register(visit_declaration_from_AssignmentNode(node.target, context, value, node.operand.type))
+            current = values[index]
+
+            if current is not undefined:
+                result._context = context
+                result._position = ntarget.position
+                with result:
+                    values[index] = GET_BINARY_FUNCTION(operand)(current, value)
+                    return result.success(value)
+
+                return result
+
+    register(visit_declaration_from_AssignmentNode(ntarget, context, value, operand))
     if should_return():
         return result
 
@@ -559,30 +641,62 @@ def visit_SwitchNode(node: PysSwitchNode, context: PysContext) -> PysRunTimeResu
     if should_return():
         return result
 
-    for ncondition, body in node.case_cases:
+    case_cases = node.case_cases
+    case_indexes = node.case_indexes
 
-        if not fall_through:
-            case = register(get_visitor(ncondition.__class__)(ncondition, context))
-            if should_return():
-                return result
+    if case_indexes is not None and is_jump_table_type(target.__class__):
+        # every label is a literal, jump to the cases equal to the target instead of comparing each label
+        matches = case_indexes.get(target, ())
+        length = len(case_cases)
+        index = matches[0] if matches else length
+        no_match_found = not matches
 
-        result._position = ncondition.position
-        with result:
-
-            if fall_through or target == case:
-                fall_through = True
-                no_match_found = False
+        while index < length:
+            ncondition, body = case_cases[index]
+            fall_through = True
+            index += 1
 
+            result._position = ncondition.position
+            with result:
                 register(get_visitor(body.__class__)(body, context))
                 if should_return():
                     if result.should_break:
                         result.should_break = False
                         fall_through = False
+                        # the following cases are still compared after a break
+                        index = next((match for match in matches if match >= index), length)
                     else:
                         return result
 
-        if should_return():
-            return result
+            if should_return():
+                return result
+
+    else:
+
+        for ncondition, body in case_cases:
+
+            if not fall_through:
+                case = register(get_visitor(ncondition.__class__)(ncondition, context))
+                if should_return():
+                    return result
+
+            result._position = ncondition.position
+            with result:
+
+                if fall_through or target == case:
+                    fall_through = True
+                    no_match_found = False
+
+                    register(get_visitor(body.__class__)(body, context))
+                    if should_return():
+                        if result.should_break:
+                            result.should_break = False
+                            fall_through = False
+                        else:
+                            return result
+
+            if should_return():
+                return result
 
     if (fall_through or no_match_found) and (default_body := node.default_body):
         register(get_visitor(default_body.__class__)(default_body, context))
@@ -840,6 +954,49 @@ def visit_ForNode(node: PysForNode, context: PysContext) -> PysRunTimeResult:
 
         b_StopIteration = StopIteration
 
+        if ndeclaration.__class__ is PysIdentifierNode and not is_handled_call(next):
+            # a name declared from a native iterator, loop natively and bind the name directly
+            symbol_table = context.symbol_table
+            set_symbol = symbol_table.set
+            name = ndeclaration.name.value
+            index = ndeclaration.index
+            values = symbol_table.values if index >= 0 else None
+            body = node.body
+            body_visitor = get_visitor(body.__class__)
+            end = object()
+
+            with result:
+                for value in iter(next, end):
+                    if values is None:
+                        set_symbol(name, value)
+                    else:
+                        values[index] = value
+
+                    register(body_visitor(body, context))
+                    if should_return():
+                        if result.should_continue:
+                            result.should_continue = False
+                        elif result.should_break:
+                            break
+                        else:
+                            return result
+
+            error = result.error
+            if error:
+                if not is_object_of(error.exception, b_StopIteration):
+                    return result
+                result.failure(None)
+
+            if result.should_break:
+                result.should_break = False
+
+            elif else_body := node.else_body:
+                register(get_visitor(else_body.__class__)(else_body, context))
+                if should_return():
+                    return result
+
+            return result.success(None)
+
         def condition():
             with result:
                 handle_call(next, context, niteration_position)
@@ -1158,7 +1315,8 @@ def visit_FunctionNode(node: PysFunctionNode, context: PysContext) -> PysRunTime
         parameters=parameters,
         body=node.body,
         context=context,
-        position=nposition
+        position=nposition,
+        local_names=node.local_names
     )
 
     for ndecorator in reversed(node.decorators):
@@ -1388,6 +1546,20 @@ def visit_ContinueNode(node: PysContinueNode, context: PysContext) -> PysRunTime
 def visit_BreakNode(node: PysBreakNode, context: PysContext) -> PysRunTimeResult:
     return PysRunTimeResult().success_break()
 
+def get_operand_value(node: PysNode | slice | tuple[PysNode | slice, ...], context: PysContext) -> Any:
+    # the value of a constant or of a local name set in the function frame, read without visiting the node, or
+    # undefined if the node must be visited (the other nodes, the global and undefined names)
+    ntype = node.__class__
+
+    if ntype is PysIdentifierNode:
+        index = node.index
+        return undefined if index < 0 else context.symbol_table.values[index]
+
+    elif ntype is PysNumberNode or ntype is PysStringNode:
+        return node.value.value
+
+    return undefined
+
 def visit_slice_from_SubscriptNode(
     node: PysNode | slice | tuple[PysNode | slice, ...],
     context: PysContext
@@ -1455,6 +1627,11 @@ def visit_declaration_from_AssignmentNode(
     if ntype is PysIdentifierNode:
         symbol_table = context.symbol_table
         name = node.name.value
+        index = node.index
+
+        if index >= 0 and is_equal(operand):
+            symbol_table.values[index] = value
+            return result.success(None)
 
         result._position = node.position
         with result:
@@ -7,13 +7,14 @@ from .context import PysContext
 from .exceptions import PysTraceback
 from .position import PysPosition, format_error_arrow
 from .token import TOKENS, PysToken
-from .utils.decorators import typecheck
+from .utils.decorators import debug_typecheck
 from .utils.string import indent
 
 from unicodedata import lookup as unicode_lookup
 from types import MappingProxyType
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
+import re
 import sys
 
 ESCAPE_CHARACTERS_MAP = MappingProxyType({
@@ -41,9 +42,88 @@ ESCAPE_LITERAL_LENGTH = MappingProxyType({
     'U': 8
 })
 
+SINGLE_CHARACTER_TOKENS = MappingProxyType({
+    '\n': TOKENS['NEWLINE'],
+    '(': TOKENS['LEFT_PARENTHESIS'],
+    ')': TOKENS['RIGHT_PARENTHESIS'],
+    '[': TOKENS['LEFT_SQUARE'],
+    ']': TOKENS['RIGHT_SQUARE'],
+    '{': TOKENS['LEFT_CURLY'],
+    '}': TOKENS['RIGHT_CURLY'],
+    ',': TOKENS['COMMA'],
+    ';': TOKENS['SEMICOLON']
+})
+
+# bulk scanning patterns, anything they do not cover exactly (non-ASCII identifiers, underscores, floats, bases,
+# complex and huge numbers, escapes and string ends) is scanned character by character
+WHITESPACE_PATTERN = re.compile(r'[^\S\n]+')
+ASCII_IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+DECIMAL_INTEGER_PATTERN = re.compile(r'[0-9]+(?![0-9_.eEjJiIbBoOxX])')
+OPERATOR_TOKENS = MappingProxyType({
+    '+': TOKENS['PLUS'],
+    '+=': TOKENS['EQUAL_PLUS'],
+    '++': TOKENS['DOUBLE_PLUS'],
+    '-': TOKENS['MINUS'],
+    '-=': TOKENS['EQUAL_MINUS'],
+    '--': TOKENS['DOUBLE_MINUS'],
+    '->': TOKENS['MINUS_GREATER_THAN'],
+    '*': TOKENS['STAR'],
+    '*=': TOKENS['EQUAL_STAR'],
+    '**': TOKENS['DOUBLE_STAR'],
+    '**=': TOKENS['EQUAL_DOUBLE_STAR'],
+    '/': TOKENS['SLASH'],
+    '/=': TOKENS['EQUAL_SLASH'],
+    '//': TOKENS['DOUBLE_SLASH'],
+    '//=': TOKENS['EQUAL_DOUBLE_SLASH'],
+    '%': TOKENS['PERCENT'],
+    '%=': TOKENS['EQUAL_PERCENT'],
+    '@': TOKENS['AT'],
+    '@=': TOKENS['EQUAL_AT'],
+    '&': TOKENS['AMPERSAND'],
+    '&=': TOKENS['EQUAL_AMPERSAND'],
+    '&&': TOKENS['DOUBLE_AMPERSAND'],
+    '|': TOKENS['PIPE'],
+    '|=': TOKENS['EQUAL_PIPE'],
+    '||': TOKENS['DOUBLE_PIPE'],
+    '^': TOKENS['CIRCUMFLEX'],
+    '^=': TOKENS['EQUAL_CIRCUMFLEX'],
+    '~': TOKENS['TILDE'],
+    '~=': TOKENS['EQUAL_TILDE'],
+    '~!': TOKENS['EXCLAMATION_TILDE'],
+    '=': TOKENS['EQUAL'],
+    '==': TOKENS['DOUBLE_EQUAL'],
+    '=>': TOKENS['EQUAL_ARROW'],
+    '!': TOKENS['EXCLAMATION'],
+    '!=': TOKENS['EQUAL_EXCLAMATION'],
+    '!>': TOKENS['EXCLAMATION_GREATER_THAN'],
+    '<': TOKENS['LESS_THAN'],
+    '<=': TOKENS['EQUAL_LESS_THAN'],
+    '<<': TOKENS['DOUBLE_LESS_THAN'],
+    '<<=': TOKENS['EQUAL_DOUBLE_LESS_THAN'],
+    '<>': TOKENS['LESS_THAN_GREATER_THAN'],
+    '>': TOKENS['GREATER_THAN'],
+    '>=': TOKENS['EQUAL_GREATER_THAN'],
+    '>>': TOKENS['DOUBLE_GREATER_THAN'],
+    '>>=': TOKENS['EQUAL_DOUBLE_GREATER_THAN'],
+    '?': TOKENS['QUESTION'],
+    '??': TOKENS['DOUBLE_QUESTION'],
+    ':': TOKENS['COLON'],
+    ':=': TOKENS['EQUAL_COLON']
+})
+
+# longest operator first, every prefix of an operator is also an operator
+OPERATOR_PATTERN = re.compile('|'.join(map(re.escape, sorted(OPERATOR_TOKENS, key=len, reverse=True))))
+
+STRING_CHUNK_PATTERNS = MappingProxyType({
+    ("'", False): re.compile(r"[^\\'\n]+"),
+    ('"', False): re.compile(r'[^\\"\n]+'),
+    ("'", True): re.compile(r"[^\\']+"),
+    ('"', True): re.compile(r'[^\\"]+')
+})
+
 class PysLexer(Pys):
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         file: PysFileBuffer,
@@ -59,120 +139,56 @@ class PysLexer(Pys):
         self.context_parent = context_parent
         self.context_parent_entry_position = context_parent_entry_position
 
-    @typecheck
+    @debug_typecheck
     def make_tokens(self) -> tuple[tuple[PysToken, ...] | tuple[PysToken], None] | tuple[None, PysTraceback]:
+        tokens = tuple(self.iter_tokens())
+        return (None, self.error) if self.error else (tokens, None)
+
+    def iter_tokens(self) -> Iterator[PysToken]:
+
+        """
+        Tokenizes the file lazily, the tokens are yielded as soon as they are made and are not kept by the lexer. The
+        tokens always end with a NULL token, after an error it is placed at the error and the error is in `self.error`
+        (consumers must check it once the tokens are exhausted).
+        """
+
         self.index = 0
-        self.tokens = []
+        self.tokens = tokens = []
         self.error = None
 
+        text = self.file.text
+        length = len(text)
+        handlers = CHARACTER_HANDLERS
+        single_character_tokens = SINGLE_CHARACTER_TOKENS
+
         self.update_current_character()
 
         while self.read_more():
+            if tokens:
+                yield from tokens
+                tokens.clear()
 
-            if self.current_character == '\n':
-                self.advance()
-                self.add_token(TOKENS['NEWLINE'])
+            character = self.current_character
+            type = single_character_tokens.get(character, None)
 
-            elif self.current_character == '\\':
-                self.make_back_slash()
+            if type is not None:
+                index = self.index = self.index + 1
+                self.current_character = text[index] if index < length else None
+                self.add_token(type)
+                continue
 
-            elif self.character_are('isspace'):
-                self.advance()
+            handler = handlers.get(character, None)
 
-            elif self.character_in('0123456789.'):
-                self.make_number()
+            if handler is not None:
+                handler(self)
 
-            elif self.character_in('BRbr"\''):
-                self.make_string()
+            elif character.isspace():
+                self.skip_whitespace()
 
-            elif self.character_are('isidentifier') or self.current_character == '$':
+            elif character.isidentifier():
                 self.make_identifier()
 
-            elif self.current_character == '+':
-                self.make_plus()
-
-            elif self.current_character == '-':
-                self.make_minus()
-
-            elif self.current_character == '*':
-                self.make_star()
-
-            elif self.current_character == '/':
-                self.make_slash()
-
-            elif self.current_character == '%':
-                self.make_percent()
-
-            elif self.current_character == '@':
-                self.make_at()
-
-            elif self.current_character == '&':
-                self.make_ampersand()
-
-            elif self.current_character == '|':
-                self.make_pipe()
-
-            elif self.current_character == '^':
-                self.make_circumflex()
-
-            elif self.current_character == '~':
-                self.make_tilde()
-
-            elif self.current_character == '=':
-                self.make_equal()
-
-            elif self.current_character == '!':
-                self.make_exclamation()
-
-            elif self.current_character == '<':
-                self.make_less_than()
-
-            elif self.current_character == '>':
-                self.make_greater_than()
-
-            elif self.current_character == '?':
-                self.make_question()
-
-            elif self.current_character == ':':
-                self.make_colon()
-
-            elif self.current_character == '#':
-                self.make_comment()
-
-            elif self.current_character == '(':
-                self.advance()
-                self.add_token(TOKENS['LEFT_PARENTHESIS'])
-
-            elif self.current_character == ')':
-                self.advance()
-                self.add_token(TOKENS['RIGHT_PARENTHESIS'])
-
-            elif self.current_character == '[':
-                self.advance()
-                self.add_token(TOKENS['LEFT_SQUARE'])
-
-            elif self.current_character == ']':
-                self.advance()
-                self.add_token(TOKENS['RIGHT_SQUARE'])
-
-            elif self.current_character == '{':
-                self.advance()
-                self.add_token(TOKENS['LEFT_CURLY'])
-
-            elif self.current_character == '}':
-                self.advance()
-                self.add_token(TOKENS['RIGHT_CURLY'])
-
-            elif self.current_character == ',':
-                self.advance()
-                self.add_token(TOKENS['COMMA'])
-
-            elif self.current_character == ';':
-                self.advance()
-                self.add_token(TOKENS['SEMICOLON'])
-
             else:
-                character = self.current_character
                 unicode = ord(character)
 
                 self.advance()
@@ -186,10 +202,16 @@ class PysLexer(Pys):
         self.advance()
         self.add_token(TOKENS['NULL'])
 
-        return (None if self.tokens is None else tuple(self.tokens)), self.error
+        yield from tokens
+
+        if self.error is not None:
+            start = self.error.position.start
+            yield PysToken(TOKENS['NULL'], PysPosition(self.file, start, start))
 
     def update_current_character(self) -> None:
-        self.current_character = self.file.text[self.index] if 0 <= self.index < len(self.file.text) else None
+        text = self.file.text
+        index = self.index
+        self.current_character = text[index] if 0 <= index < len(text) else None
 
     def advance(self) -> None:
         if self.error is None:
@@ -211,25 +233,11 @@ class PysLexer(Pys):
         return self.read_more() and getattr(self.current_character, string_method)(*args, **kwargs)
 
     def add_token(self, type: int, start: Optional[int] = None, value: Optional[Any] = None) -> None:
-        if self.error is None and self.tokens is not None:
+        tokens = self.tokens
 
-            if start is None:
-                start = self.index - 1
-                end = self.index
-            else:
-                end = self.index
-
-            self.tokens.append(
-                PysToken(
-                    type,
-                    PysPosition(
-                        self.file,
-                        start,
-                        end
-                    ),
-                    value
-                )
-            )
+        if self.error is None and tokens is not None:
+            end = self.index
+            tokens.append(PysToken(type, PysPosition(self.file, end - 1 if start is None else start, end), value))
 
     def warning(self, message: str) -> None:
         if not (self.flags & SILENT or self.parser_flags & LEXER_HIGHLIGHT):
@@ -256,6 +264,10 @@ class PysLexer(Pys):
                     PysPosition(self.file, start, end)
                 )
 
+    def skip_whitespace(self) -> None:
+        self.index = WHITESPACE_PATTERN.match(self.file.text, self.index).end()
+        self.update_current_character()
+
     def make_back_slash(self) -> None:
         self.advance()
 
@@ -266,6 +278,25 @@ class PysLexer(Pys):
 
     def make_number(self) -> None:
         start = self.index
+        match = DECIMAL_INTEGER_PATTERN.match(self.file.text, start)
+
+        if match is not None:
+            number = match.group()
+
+            if self.parser_flags & LEXER_HIGHLIGHT:
+                value = (number, lambda : int(number))
+            else:
+                try:
+                    value = intern_object(int(number))
+                except ValueError:
+                    # exceeds the limit of integer string conversion, the error is thrown below
+                    value = None
+
+            if value is not None:
+                self.index = match.end()
+                self.update_current_character()
+                self.add_token(TOKENS['NUMBER'], start, value)
+                return
 
         if self.current_character == '.':
             self.advance()
@@ -464,6 +495,9 @@ class PysLexer(Pys):
             self.advance()
             start_string = self.index
 
+        text = self.file.text
+        match_chunk = STRING_CHUNK_PATTERNS[prefix, is_triple_quote].match
+
         while self.read_more() and not end():
 
             if self.current_character == '\\':
@@ -574,8 +608,15 @@ class PysLexer(Pys):
                         self.advance()
 
             else:
-                string += self.current_character
-                self.advance()
+                match = match_chunk(text, self.index)
+
+                if match is None:
+                    string += self.current_character
+                    self.advance()
+                else:
+                    string += match.group()
+                    self.index = match.end()
+                    self.update_current_character()
 
         if not end_prefix():
             self.throw(
@@ -625,7 +666,14 @@ class PysLexer(Pys):
                 self.throw(self.index - 1, self.index, "expected identifier")
                 return
 
-        name = ''
+        match = ASCII_IDENTIFIER_PATTERN.match(self.file.text, self.index)
+
+        if match is None:
+            name = ''
+        else:
+            name = match.group()
+            self.index = match.end()
+            self.update_current_character()
 
         while self.read_more() and (name + self.current_character).isidentifier():
             name += self.current_character
@@ -637,275 +685,35 @@ class PysLexer(Pys):
             intern_object(name)
         )
 
-    def make_plus(self) -> None:
-        start = self.index
-        type = TOKENS['PLUS']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_PLUS']
-            self.advance()
-
-        elif self.current_character == '+':
-            type = TOKENS['DOUBLE_PLUS']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_minus(self) -> None:
-        start = self.index
-        type = TOKENS['MINUS']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_MINUS']
-            self.advance()
-
-        elif self.current_character == '-':
-            type = TOKENS['DOUBLE_MINUS']
-            self.advance()
-
-        elif self.current_character == '>':
-            type = TOKENS['MINUS_GREATER_THAN']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_star(self) -> None:
-        start = self.index
-        type = TOKENS['STAR']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_STAR']
-            self.advance()
-
-        elif self.current_character == '*':
-            type = TOKENS['DOUBLE_STAR']
-            self.advance()
-
-            if self.current_character == '=':
-                type = TOKENS['EQUAL_DOUBLE_STAR']
-                self.advance()
-
-        self.add_token(type, start)
-
-    def make_slash(self) -> None:
-        start = self.index
-        type = TOKENS['SLASH']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_SLASH']
-            self.advance()
-
-        elif self.current_character == '/':
-            type = TOKENS['DOUBLE_SLASH']
-            self.advance()
-
-            if self.current_character == '=':
-                type = TOKENS['EQUAL_DOUBLE_SLASH']
-                self.advance()
-
-        self.add_token(type, start)
-
-    def make_percent(self) -> None:
-        start = self.index
-        type = TOKENS['PERCENT']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_PERCENT']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_at(self) -> None:
-        start = self.index
-        type = TOKENS['AT']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_AT']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_ampersand(self) -> None:
-        start = self.index
-        type = TOKENS['AMPERSAND']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_AMPERSAND']
-            self.advance()
-
-        elif self.current_character == '&':
-            type = TOKENS['DOUBLE_AMPERSAND']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_pipe(self) -> None:
-        start = self.index
-        type = TOKENS['PIPE']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_PIPE']
-            self.advance()
-
-        elif self.current_character == '|':
-            type = TOKENS['DOUBLE_PIPE']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_circumflex(self) -> None:
-        start = self.index
-        type = TOKENS['CIRCUMFLEX']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_CIRCUMFLEX']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_tilde(self) -> None:
+    def make_operator(self) -> None:
         start = self.index
-        type = TOKENS['TILDE']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_TILDE']
-            self.advance()
-
-        elif self.current_character == '!':
-            type = TOKENS['EXCLAMATION_TILDE']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_equal(self) -> None:
-        start = self.index
-        type = TOKENS['EQUAL']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['DOUBLE_EQUAL']
-            self.advance()
+        operator = OPERATOR_PATTERN.match(self.file.text, start).group()
 
-        elif self.current_character == '>':
-            type = TOKENS['EQUAL_ARROW']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_exclamation(self) -> None:
-        start = self.index
-        type = TOKENS['EXCLAMATION']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_EXCLAMATION']
-            self.advance()
-
-        elif self.current_character == '>':
-            type = TOKENS['EXCLAMATION_GREATER_THAN']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_less_than(self) -> None:
-        start = self.index
-        type = TOKENS['LESS_THAN']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_LESS_THAN']
-            self.advance()
-
-        elif self.current_character == '<':
-            type = TOKENS['DOUBLE_LESS_THAN']
-            self.advance()
-
-            if self.current_character == '=':
-                type = TOKENS['EQUAL_DOUBLE_LESS_THAN']
-                self.advance()
-
-        elif self.current_character == '>':
-            type = TOKENS['LESS_THAN_GREATER_THAN']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_greater_than(self) -> None:
-        start = self.index
-        type = TOKENS['GREATER_THAN']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_GREATER_THAN']
-            self.advance()
-
-        elif self.current_character == '>':
-            type = TOKENS['DOUBLE_GREATER_THAN']
-            self.advance()
-
-            if self.current_character == '=':
-                type = TOKENS['EQUAL_DOUBLE_GREATER_THAN']
-                self.advance()
-
-        self.add_token(type, start)
-
-    def make_question(self) -> None:
-        start = self.index
-        type = TOKENS['QUESTION']
-
-        self.advance()
-
-        if self.current_character == '?':
-            type = TOKENS['DOUBLE_QUESTION']
-            self.advance()
-
-        self.add_token(type, start)
-
-    def make_colon(self) -> None:
-        start = self.index
-        type = TOKENS['COLON']
-
-        self.advance()
-
-        if self.current_character == '=':
-            type = TOKENS['EQUAL_COLON']
-            self.advance()
-
-        self.add_token(type, start)
+        self.index = start + len(operator)
+        self.update_current_character()
+        self.add_token(OPERATOR_TOKENS[operator], start)
 
     def make_comment(self) -> None:
         start = self.index
-        comment = ''
+        text = self.file.text
+        end = text.find('\n', start)
 
-        self.advance()
+        if end == -1:
+            end = len(text)
 
-        while self.read_more() and self.current_character != '\n':
-            comment += self.current_character
-            self.advance()
+        comment = text[start + 1:end]
+        self.index = end
+        self.update_current_character()
 
         if self.parser_flags & LEXER_HIGHLIGHT:
-            self.add_token(TOKENS['COMMENT'], start, comment)
\ No newline at end of file
+            self.add_token(TOKENS['COMMENT'], start, comment)
+
+CHARACTER_HANDLERS = MappingProxyType({
+    **dict.fromkeys(' \t\r\v\f', PysLexer.skip_whitespace),
+    **dict.fromkeys('0123456789.', PysLexer.make_number),
+    **dict.fromkeys('BRbr"\'', PysLexer.make_string),
+    **dict.fromkeys('ACDEFGHIJKLMNOPQSTUVWXYZacdefghijklmnopqstuvwxyz_$', PysLexer.make_identifier),
+    **dict.fromkeys('+-*/%@&|^~=!<>?:', PysLexer.make_operator),
+    '\\': PysLexer.make_back_slash,
+    '#': PysLexer.make_comment
+})
\ No newline at end of file
@@ -1,7 +1,7 @@
 from .bases import Pys
 from .position import PysPosition
 from .token import PysToken
-from .utils.decorators import typecheck, immutable, inheritable
+from .utils.decorators import debug_typecheck, immutable, inheritable
 from .utils.generic import setimuattr
 
 from typing import TYPE_CHECKING, Literal
@@ -15,7 +15,7 @@ class PysNode(Pys):
 
     __slots__ = ('position',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, position: PysPosition) -> None:
         setimuattr(self, 'position', position)
 
@@ -30,7 +30,7 @@ class PysNumberNode(PysNode):
 
     __slots__ = ('value',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, value: PysToken) -> None:
         super().__init__(value.position)
         setimuattr(self, 'value', value)
@@ -42,7 +42,7 @@ class PysStringNode(PysNode):
 
     __slots__ = ('value',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, value: PysToken) -> None:
         super().__init__(value.position)
         setimuattr(self, 'value', value)
@@ -54,7 +54,7 @@ class PysKeywordNode(PysNode):
 
     __slots__ = ('name',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, name: PysToken) -> None:
         super().__init__(name.position)
         setimuattr(self, 'name', name)
@@ -71,12 +71,14 @@ class PysDebugNode(PysNode):
 
 class PysIdentifierNode(PysNode):
 
-    __slots__ = ('name',)
+    __slots__ = ('name', 'index')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, name: PysToken) -> None:
         super().__init__(name.position)
         setimuattr(self, 'name', name)
+        # local slot index of the name in the function frame, resolved by the analyzer (-1 if not a local)
+        setimuattr(self, 'index', -1)
 
     def __repr__(self) -> str:
         return f'Identifier(name={self.name!r})'
@@ -85,7 +87,7 @@ class PysDictionaryNode(PysNode):
 
     __slots__ = ('pairs', 'class_type')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         pairs: list[tuple[PysNode, PysNode]],
@@ -104,7 +106,7 @@ class PysSetNode(PysNode):
 
     __slots__ = ('elements',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, elements: list[PysNode], position: PysPosition) -> None:
         super().__init__(position)
         setimuattr(self, 'elements', tuple(elements))
@@ -116,7 +118,7 @@ class PysListNode(PysNode):
 
     __slots__ = ('elements',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, elements: list[PysNode], position: PysPosition) -> None:
         super().__init__(position)
         setimuattr(self, 'elements', tuple(elements))
@@ -128,7 +130,7 @@ class PysTupleNode(PysNode):
 
     __slots__ = ('elements',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, elements: list[PysNode], position: PysPosition) -> None:
         super().__init__(position)
         setimuattr(self, 'elements', tuple(elements))
@@ -140,7 +142,7 @@ class PysAttributeNode(PysNode):
 
     __slots__ = ('target', 'attribute')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, target: PysNode, attribute: PysToken) -> None:
         super().__init__(PysPosition(target.position.file, target.position.start, attribute.position.end))
         setimuattr(self, 'target', target)
@@ -153,7 +155,7 @@ class PysSubscriptNode(PysNode):
 
     __slots__ = ('target', 'slice')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         target: PysNode,
@@ -170,9 +172,10 @@ class PysSubscriptNode(PysNode):
 
 class PysCallNode(PysNode):
 
-    __slots__ = ('target', 'arguments')
+    # method_cache is the inline cache of the interpreter for the method calls, it is not part of the tree
+    __slots__ = ('target', 'arguments', 'method_cache')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         target: PysNode,
@@ -183,6 +186,7 @@ class PysCallNode(PysNode):
         super().__init__(position)
         setimuattr(self, 'target', target)
         setimuattr(self, 'arguments', tuple(arguments))
+        setimuattr(self, 'method_cache', None)
 
     def __repr__(self) -> str:
         return f'Call(target={self.target!r}, arguments={self.arguments!r})'
@@ -191,7 +195,7 @@ class PysChainOperatorNode(PysNode):
 
     __slots__ = ('operations', 'expressions')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, operations: list[PysToken], expressions: list[PysNode]) -> None:
         super().__init__(
             PysPosition(
@@ -211,7 +215,7 @@ class PysTernaryOperatorNode(PysNode):
 
     __slots__ = ('condition', 'valid', 'invalid', 'style')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         condition: PysNode,
@@ -244,7 +248,7 @@ class PysBinaryOperatorNode(PysNode):
 
     __slots__ = ('left', 'operand', 'right')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, left: PysNode, operand: PysToken, right: PysNode) -> None:
         super().__init__(PysPosition(left.position.file, left.position.start, right.position.end))
         setimuattr(self, 'left', left)
@@ -258,7 +262,7 @@ class PysUnaryOperatorNode(PysNode):
 
     __slots__ = ('operand', 'value')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, operand: PysToken, value: PysNode) -> None:
         super().__init__(PysPosition(operand.position.file, operand.position.start, value.position.end))
         setimuattr(self, 'operand',  operand)
@@ -271,7 +275,7 @@ class PysIncrementalNode(PysNode):
 
     __slots__ = ('operand', 'target', 'operand_position')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, operand: PysToken, target: PysNode, operand_position: Literal['left', 'right']) -> None:
         super().__init__(
             PysPosition(operand.position.file, operand.position.start, target.position.end)
@@ -296,7 +300,7 @@ class PysStatementsNode(PysNode):
 
     __slots__ = ('body',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, body: list[PysNode], position: PysPosition) -> None:
         super().__init__(position)
         setimuattr(self, 'body', tuple(body))
@@ -308,7 +312,7 @@ class PysAssignmentNode(PysNode):
 
     __slots__ = ('target', 'operand', 'value')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, target: PysNode, operand: PysToken, value: PysNode) -> None:
         super().__init__(PysPosition(target.position.file, target.position.start, value.position.end))
         setimuattr(self, 'target', target)
@@ -322,7 +326,7 @@ class PysImportNode(PysNode):
 
     __slots__ = ('name', 'packages')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         name: tuple[PysToken, PysToken | None],
@@ -341,7 +345,7 @@ class PysIfNode(PysNode):
 
     __slots__ = ('cases_body', 'else_body')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         cases_body: list[tuple[PysNode, PysNode]],
@@ -358,9 +362,9 @@ class PysIfNode(PysNode):
 
 class PysSwitchNode(PysNode):
 
-    __slots__ = ('target', 'case_cases', 'default_body')
+    __slots__ = ('target', 'case_cases', 'default_body', 'case_indexes')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         target: PysNode,
@@ -373,6 +377,9 @@ class PysSwitchNode(PysNode):
         setimuattr(self, 'target', target)
         setimuattr(self, 'case_cases', tuple(case_cases))
         setimuattr(self, 'default_body', default_body)
+        # label value to the indexes of its cases when every label is a literal, resolved by the analyzer (None to
+        # compare the labels in order)
+        setimuattr(self, 'case_indexes', None)
 
     def __repr__(self) -> str:
         return f'Switch(target={self.target!r}, case_cases={self.case_cases!r}, default_body={self.default_body!r})'
@@ -381,7 +388,7 @@ class PysMatchNode(PysNode):
 
     __slots__ = ('target', 'cases', 'default')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         target: PysNode | None,
@@ -402,7 +409,7 @@ class PysTryNode(PysNode):
 
     __slots__ = ('body', 'catch_cases', 'else_body', 'finally_body')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         body: PysNode,
@@ -432,7 +439,7 @@ class PysWithNode(PysNode):
 
     __slots__ = ('contexts', 'body')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, contexts: list[tuple[PysNode, PysToken | None]], body: PysNode, position: PysPosition) -> None:
         super().__init__(position)
         setimuattr(self, 'contexts', tuple(contexts))
@@ -445,7 +452,7 @@ class PysForNode(PysNode):
 
     __slots__ = ('header', 'body', 'else_body')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         header: tuple[PysNode | None, PysNode | None, PysNode | None] |
@@ -467,7 +474,7 @@ class PysWhileNode(PysNode):
 
     __slots__ = ('condition', 'body', 'else_body')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         condition: PysNode,
@@ -488,7 +495,7 @@ class PysDoWhileNode(PysNode):
 
     __slots__ = ('body', 'condition', 'else_body')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         body: PysNode,
@@ -509,7 +516,7 @@ class PysRepeatNode(PysNode):
 
     __slots__ = ('body', 'condition', 'else_body')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         body: PysNode | None,
@@ -530,7 +537,7 @@ class PysClassNode(PysNode):
 
     __slots__ = ('decorators', 'name', 'bases', 'body')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         decorators: list[PysNode],
@@ -551,9 +558,9 @@ class PysClassNode(PysNode):
 
 class PysFunctionNode(PysNode):
 
-    __slots__ = ('decorators', 'name', 'parameters', 'body', 'constructor')
+    __slots__ = ('decorators', 'name', 'parameters', 'body', 'constructor', 'local_names')
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
         decorators: list[PysNode],
@@ -570,6 +577,8 @@ class PysFunctionNode(PysNode):
         setimuattr(self, 'parameters', tuple(parameters))
         setimuattr(self, 'body', body)
         setimuattr(self, 'constructor', bool(constructor))
+        # names of the local slots, resolved by the analyzer
+        setimuattr(self, 'local_names', ())
 
     def __repr__(self) -> str:
         return (
@@ -586,7 +595,7 @@ class PysGlobalNode(PysNode):
 
     __slots__ = ('identifiers',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, identifiers: list[PysToken], position: PysPosition) -> None:
         super().__init__(position)
         setimuattr(self, 'identifiers', tuple(frozenset(identifiers)))
@@ -598,7 +607,7 @@ class PysReturnNode(PysNode):
 
     __slots__ = ('value',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, value: PysNode | None, position: PysPosition) -> None:
         super().__init__(position)
         setimuattr(self, 'value', value)
@@ -610,7 +619,7 @@ class PysThrowNode(PysNode):
 
     __slots__ = ('target', 'primary')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, target: PysNode, primary: PysNode | None, position: PysPosition) -> None:
         super().__init__(
             PysPosition(
@@ -630,7 +639,7 @@ class PysAssertNode(PysNode):
 
     __slots__ = ('condition', 'message')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, condition: PysNode, message: PysNode | None) -> None:
         super().__init__(condition.position)
         setimuattr(self, 'condition', condition)
@@ -643,7 +652,7 @@ class PysDeleteNode(PysNode):
 
     __slots__ = ('targets',)
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, targets: list[PysNode], position: PysPosition) -> None:
         super().__init__(position)
         setimuattr(self, 'targets', tuple(targets))
@@ -0,0 +1,225 @@
+from .analyzer import get_case_indexes
+from .bases import Pys
+from .constants import DEFAULT, DEBUG
+from .mapping import GET_BINARY_FUNCTION, GET_UNARY_FUNCTION, GET_VALUE_FROM_CONSTANT_KEYWORDS
+from .nodes import *
+from .position import PysPosition
+from .token import TOKENS, PysToken
+from .utils.decorators import debug_typecheck
+from .utils.generic import setimuattr
+
+from typing import Any
+
+T_AND = TOKENS['DOUBLE_AMPERSAND']
+T_OR = TOKENS['DOUBLE_PIPE']
+T_NULLISH = TOKENS['DOUBLE_QUESTION']
+T_STAR = TOKENS['STAR']
+T_POWER = TOKENS['DOUBLE_STAR']
+T_LSHIFT = TOKENS['DOUBLE_LESS_THAN']
+T_PERCENT = TOKENS['PERCENT']
+
+# operators that are folded when both operands are constants (identity and membership operators are not folded)
+FOLDABLE_BINARY_OPERATORS = frozenset(
+    TOKENS[name] for name in (
+        'PERCENT', 'AMPERSAND', 'STAR', 'PLUS', 'MINUS', 'SLASH', 'LESS_THAN', 'GREATER_THAN', 'CIRCUMFLEX', 'PIPE',
+        'DOUBLE_STAR', 'DOUBLE_SLASH', 'DOUBLE_LESS_THAN', 'DOUBLE_EQUAL', 'DOUBLE_GREATER_THAN', 'EQUAL_EXCLAMATION',
+        'EQUAL_LESS_THAN', 'EQUAL_GREATER_THAN', 'LESS_THAN_GREATER_THAN'
+    )
+)
+
+# limits of folded values, larger results are computed at runtime (same limits as the CPython AST optimizer)
+MAXIMUM_INTEGER_SIZE = 128
+MAXIMUM_STRING_SIZE = 4096
+
+class PysOptimizer(Pys):
+
+    """
+    Optimizes an analyzed node tree: folds operations on literals and removes the branches of constant conditions.
+    Folded nodes keep the position of the original expression.
+    """
+
+    @debug_typecheck
+    def __init__(self, node: PysNode, flags: int = DEFAULT) -> None:
+        self.node = node
+        self.flags = flags
+
+    @debug_typecheck
+    def optimize(self) -> PysNode:
+        return self.visit(self.node)
+
+    def visit(self, node: PysNode) -> PysNode:
+        for slot in node.__slots__:
+            value = getattr(node, slot)
+            optimized_value = self.visit_value(value)
+            if optimized_value is not value:
+                setimuattr(node, slot, optimized_value)
+
+        func = getattr(self, 'visit_' + type(node).__name__.removeprefix('Pys'), None)
+        return func(node) if func else node
+
+    def visit_value(self, value: Any) -> Any:
+        type = value.__class__
+
+        if isinstance(value, PysNode):
+            return self.visit(value)
+
+        elif type is tuple or type is list:
+            elements = [self.visit_value(element) for element in value]
+            for element, optimized_element in zip(value, elements):
+                if element is not optimized_element:
+                    return type(elements)
+
+        elif type is slice:
+            start, stop, step = (
+                None if element is None else self.visit(element)
+                for element in (value.start, value.stop, value.step)
+            )
+            if start is not value.start or stop is not value.stop or step is not value.step:
+                return slice(start, stop, step)
+
+        return value
+
+    def get_constant(self, node: PysNode) -> tuple[bool, Any]:
+        type = node.__class__
+
+        if type is PysNumberNode or type is PysStringNode:
+            return True, node.value.value
+
+        elif type is PysKeywordNode:
+            return True, GET_VALUE_FROM_CONSTANT_KEYWORDS(node.name.value)
+
+        elif type is PysDebugNode:
+            return True, True if self.flags & DEBUG else False
+
+        return False, None
+
+    def new_constant(self, value: Any, position: PysPosition) -> PysNode | None:
+        type = value.__class__
+
+        if type is bool or value is None:
+            return PysKeywordNode(PysToken(TOKENS['KEYWORD'], position, repr(value)))
+
+        elif type in (int, float, complex):
+            if type is int and value.bit_length() > MAXIMUM_INTEGER_SIZE:
+                return None
+            return PysNumberNode(PysToken(TOKENS['NUMBER'], position, value))
+
+        elif type in (str, bytes):
+            if len(value) > MAXIMUM_STRING_SIZE:
+                return None
+            return PysStringNode(PysToken(TOKENS['STRING'], position, value))
+
+        return None
+
+    def is_safe_operation(self, operand: int, left: Any, right: Any) -> bool:
+        # avoid computing huge values while compiling, for example 2 ** 100000000, 'a' * 100000000 or
+        # '%0100000000d' % 1 (string formatting is never folded, like in the CPython AST optimizer)
+        if operand == T_POWER:
+            return not (
+                left.__class__ is int and right.__class__ is int and right > 0 and
+                left.bit_length() * right > MAXIMUM_INTEGER_SIZE
+            )
+
+        elif operand == T_LSHIFT:
+            return not (
+                left.__class__ is int and right.__class__ is int and
+                left.bit_length() + right > MAXIMUM_INTEGER_SIZE
+            )
+
+        elif operand == T_STAR:
+            for sequence, count in ((left, right), (right, left)):
+                if sequence.__class__ in (str, bytes) and count.__class__ is int:
+                    return len(sequence) * count <= MAXIMUM_STRING_SIZE
+
+        elif operand == T_PERCENT:
+            return left.__class__ not in (str, bytes)
+
+        return True
+
+    def visit_BinaryOperatorNode(self, node: PysBinaryOperatorNode) -> PysNode:
+        is_left_constant, left = self.get_constant(node.left)
+        if not is_left_constant:
+            return node
+
+        operand = node.operand.type
+
+        if operand == T_AND:
+            return node.right if left else node.left
+        elif operand == T_OR:
+            return node.left if left else node.right
+        elif operand == T_NULLISH:
+            return node.right if left is None else node.left
+
+        is_right_constant, right = self.get_constant(node.right)
+
+        if not is_right_constant or operand not in FOLDABLE_BINARY_OPERATORS or \
+           not self.is_safe_operation(operand, left, right):
+            return node
+
+        try:
+            value = GET_BINARY_FUNCTION(operand)(left, right)
+        except Exception:
+            # the error is thrown at runtime with its traceback
+            return node
+
+        return self.new_constant(value, node.position) or node
+
+    def visit_UnaryOperatorNode(self, node: PysUnaryOperatorNode) -> PysNode:
+        is_constant, value = self.get_constant(node.value)
+        if not is_constant:
+            return node
+
+        try:
+            value = GET_UNARY_FUNCTION(node.operand.type)(value)
+        except Exception:
+            return node
+
+        return self.new_constant(value, node.position) or node
+
+    def visit_TernaryOperatorNode(self, node: PysTernaryOperatorNode) -> PysNode:
+        is_constant, condition = self.get_constant(node.condition)
+        if not is_constant:
+            return node
+
+        return node.valid if condition else node.invalid
+
+    def visit_StatementsNode(self, node: PysStatementsNode) -> PysNode:
+        body = tuple(element for element in node.body if not self.is_removable_statement(element))
+        if len(body) != len(node.body):
+            setimuattr(node, 'body', body)
+        return node
+
+    def visit_IfNode(self, node: PysIfNode) -> PysNode:
+        cases_body = []
+        append_case = cases_body.append
+
+        for case in node.cases_body:
+            is_constant, condition = self.get_constant(case[0])
+
+            if not is_constant:
+                append_case(case)
+
+            elif condition:
+                # the following cases and the else body are never reached
+                setimuattr(node, 'else_body', case[1])
+                break
+
+        if len(cases_body) != len(node.cases_body):
+            setimuattr(node, 'cases_body', tuple(cases_body))
+
+        return node
+
+    def visit_SwitchNode(self, node: PysSwitchNode) -> PysNode:
+        # folded labels (-1, 'a' + 'b') can be looked up in the jump table too
+        setimuattr(node, 'case_indexes', get_case_indexes(node.case_cases))
+        return node
+
+    def is_removable_statement(self, node: PysNode) -> bool:
+        if node.__class__ is PysAssertNode:
+            # assertions are disabled in debug mode (see visit_AssertNode in the interpreter)
+            if self.flags & DEBUG:
+                return True
+            is_constant, condition = self.get_constant(node.condition)
+            return is_constant and bool(condition)
+
+        return False
\ No newline at end of file
@@ -0,0 +1,359 @@
+"""
+Multi-process map of PyScript functions. A PyScript function cannot be pickled, so it is shipped to the workers as its
+analyzed body (encoded like the node cache), its source file and the values of the names it uses from its closure.
+Every worker rebuilds the functions once and runs them in its own interpreter.
+"""
+
+from .buffer import PysFileBuffer
+from .cache import pys_sys, undefined
+from .constants import COMPILE_CLOSURE
+from .context import PysContext
+from .exceptions import PysTraceback, PysSignal
+from .handlers import handle_call
+from .nodes import PysNode, PysIdentifierNode
+from .position import PysPosition
+from .pystypes import PysFunction, PysPythonFunction
+from .results import PysRunTimeResult
+from .serializer import encode, decode, get_position
+from .symtab import new_module_namespace
+
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+from typing import Any, Callable, Iterable, Optional
+
+import os
+import pickle
+import sys
+
+WORKER_CONTEXT_NAME = '<parallel>'
+
+# the function run by the current worker process, set by _initialize_worker
+_worker_function = None
+
+def _get_free_names(node: PysNode) -> set[str]:
+    names = set()
+    stack = [node]
+
+    while stack:
+        value = stack.pop()
+        vtype = value.__class__
+
+        if vtype is PysIdentifierNode:
+            # locals have a frame slot, the other names come from the closure
+            if value.index < 0:
+                names.add(value.name.value)
+
+        elif isinstance(value, PysNode):
+            stack.extend(getattr(value, slot) for slot in value.__slots__)
+
+        elif vtype is tuple or vtype is list:
+            stack.extend(value)
+
+        elif vtype is slice:
+            stack.extend((value.start, value.stop, value.step))
+
+    return names
+
+class PysFunctionShipper:
+
+    """
+    Encodes PyScript functions (and the functions they use) into a picklable payload.
+    """
+
+    def __init__(self) -> None:
+        # circular import problem solved
+        from .pysbuiltins import pys_builtins
+
+        self.builtins = pys_builtins.__dict__
+        self.files = {}
+        self.functions = []
+        self.indexes = {}
+
+    def ship_function(self, function: PysFunction) -> int:
+        index = self.indexes.get(id(function), None)
+        if index is not None:
+            return index
+
+        code = function.__code__
+        file = code.file
+        name = function.__name__
+        qualname = function.__qualname__
+
+        index = self.indexes[id(function)] = len(self.functions)
+        self.functions.append(None)
+        self.files[file.name] = file
+
+        parameters = []
+
+        for parameter in code.parameters:
+            if parameter.__class__ is tuple:
+                parameter_name, value = parameter
+                try:
+                    value = pickle.dumps(value)
+                except Exception as exception:
+                    raise TypeError(
+                        f"parallel_map(): the default value of {parameter_name!r} of {qualname}() cannot be sent to "
+                        f"the workers: {exception}"
+                    ) from exception
+                parameter = (parameter_name, value)
+            parameters.append(parameter)
+
+        closure_symbol_table = code.closure_symbol_table
+        builtins = self.builtins
+        closure = {}
+
+        for free_name in sorted(_get_free_names(code.body)):
+            value = closure_symbol_table.get(free_name)
+            # the builtins are already in the workers
+            if value is undefined or value is builtins.get(free_name, undefined):
+                continue
+
+            shipped = self.ship_value(value)
+            if shipped is not None:
+                closure[free_name] = shipped
+
+        self.functions[index] = (
+            name,
+            None if qualname == name else qualname.removesuffix(f'.{name}'),
+            tuple(parameters),
+            encode(code.body),
+            file.name,
+            code.position.start,
+            code.position.end,
+            tuple(code.local_indexes),
+            closure
+        )
+
+        return index
+
+    def ship_value(self, value: Any) -> tuple[str, Any] | None:
+
+        """
+        Encodes a closure value. Returns None if the value cannot be sent, the name is then undefined in the workers.
+        """
+
+        if isinstance(value, PysFunction) and not isinstance(value, PysPythonFunction):
+            return 'function', self.ship_function(value)
+
+        elif isinstance(value, ModuleType):
+            for path, module in pys_sys.modules.items():
+                if module is value:
+                    return 'require', path
+
+            name = value.__name__
+            if sys.modules.get(name, None) is value:
+                return 'import', name
+
+            # builtins and sys of PyScript are already in the workers
+            return None
+
+        try:
+            return 'value', pickle.dumps(value)
+        except Exception:
+            return None
+
+    def get_payload(self, root: int) -> tuple:
+        return (
+            tuple((name, file.text) for name, file in self.files.items()),
+            tuple(self.functions),
+            root
+        )
+
+def _build_function(payload: tuple, flags: int) -> PysFunction:
+    # circular import problem solved
+    from .compiler import compile_function_body
+    from .pysbuiltins import require
+
+    files, specs, root = payload
+    files = {name: PysFileBuffer(text, name) for name, text in files}
+    positions = {name: {} for name in files}
+    functions = []
+    symbol_tables = []
+
+    for name, qualname, parameters, body, file_name, start, end, local_names, _ in specs:
+        file = files[file_name]
+        symbol_table, _ = new_module_namespace(file=file_name, name='__parallel__')
+        context = PysContext(file=file, name=WORKER_CONTEXT_NAME, flags=flags, symbol_table=symbol_table)
+        nbody = decode(body, file, positions[file_name])
+
+        functions.append(
+            PysFunction(
+                name=name,
+                qualname=qualname,
+                parameters=[
+                    (parameter[0], pickle.loads(parameter[1])) if parameter.__class__ is tuple else parameter
+                    for parameter in parameters
+                ],
+                body=nbody,
+                context=context,
+                position=get_position(file, positions[file_name], start, end),
+                get_visitor=compile_function_body(nbody) if flags & COMPILE_CLOSURE else None,
+                local_names=local_names
+            )
+        )
+
+        symbol_tables.append((symbol_table, context))
+
+    for (symbol_table, context), spec in zip(symbol_tables, specs):
+        for name, (kind, value) in spec[-1].items():
+            if kind == 'function':
+                value = functions[value]
+            elif kind == 'value':
+                value = pickle.loads(value)
+            elif kind == 'import':
+                value = __import__(value, fromlist=['*'])
+            else:
+                value = require.__func__(context, PysPosition(context.file, -1, -1), value)
+            symbol_table.set(name, value)
+
+    return functions[root]
+
+def _dump_exception(exception: BaseException | type[BaseException]) -> bytes:
+    try:
+        return pickle.dumps(exception)
+    except Exception:
+        return pickle.dumps(
+            RuntimeError(
+                exception.__name__
+                if isinstance(exception, type) else
+                type(exception).__name__ + (f': {message}' if (message := str(exception)) else '')
+            )
+        )
+
+def _encode_traceback(traceback: PysTraceback | None) -> tuple | None:
+    if traceback is None:
+        return None
+
+    frames = []
+    context = traceback.context
+    position = traceback.position
+
+    # the outermost context is the module created by _build_function, it is not a frame of the function
+    while context is not None and context.parent is not None:
+        frames.append((position.file.name, position.start, position.end, context.name, context.qualname))
+        position = context.parent_entry_position
+        context = context.parent
+
+    return (
+        _dump_exception(traceback.exception),
+        tuple(frames),
+        _encode_traceback(traceback.primary),
+        traceback.implicit
+    )
+
+def _decode_traceback(
+    encoded: tuple,
+    files: dict[str, PysFileBuffer],
+    context: PysContext,
+    position: PysPosition
+) -> PysTraceback:
+
+    exception, frames, primary, implicit = encoded
+
+    # the frames of the worker continue the traceback from the call of parallel_map
+    for name, start, end, context_name, qualname in reversed(frames):
+        frame_position = PysPosition(files.get(name, None) or PysFileBuffer('', name), start, end)
+        context = PysContext(
+            file=frame_position.file,
+            name=context_name,
+            qualname=qualname,
+            parent=context,
+            parent_entry_position=position
+        )
+        position = frame_position
+
+    return PysTraceback(
+        pickle.loads(exception),
+        context,
+        position,
+        None if primary is None else _decode_traceback(primary, files, context, position),
+        implicit
+    )
+
+def _initialize_worker(payload: tuple | bytes, flags: int) -> None:
+    global _worker_function
+
+    pys_sys.flags = flags
+    _worker_function = pickle.loads(payload) if payload.__class__ is bytes else _build_function(payload, flags)
+
+def _run_chunk(chunk: list[Any]) -> tuple[list[Any], tuple | None]:
+    function = _worker_function
+    results = []
+    append_result = results.append
+
+    for item in chunk:
+        try:
+            append_result(function(item))
+        except PysSignal as signal:
+            return results, _encode_traceback(signal.result.error)
+        except BaseException as exception:
+            return results, (_dump_exception(exception), (), None, False)
+
+    return results, None
+
+def run_parallel_map(
+    context: PysContext,
+    position: PysPosition,
+    function: Callable[[Any], Any],
+    iterable: Iterable[Any],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None
+) -> list[Any]:
+
+    """
+    Calls `function` on every item of `iterable` in a pool of `workers` processes (the number of CPUs by default) and
+    returns the results in order. The items are sent in chunks of `chunksize` items (by default, 4 chunks per worker).
+    The items, the results and the closure values used by the function must be picklable, the other closure values
+    are not defined in the workers. With 1 worker, the items are mapped in the current process.
+
+    An exception in a worker is raised again with its PyScript frames, following the frame of the call.
+    """
+
+    if not callable(function):
+        raise TypeError("parallel_map(): function must be callable")
+    if not (workers is None or (isinstance(workers, int) and workers > 0)):
+        raise ValueError("parallel_map(): workers must be a positive integer")
+    if not (chunksize is None or (isinstance(chunksize, int) and chunksize > 0)):
+        raise ValueError("parallel_map(): chunksize must be a positive integer")
+
+    items = list(iterable)
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(items)) or 1
+
+    if workers == 1 or len(items) <= 1:
+        handle_call(function, context, position)
+        return [function(item) for item in items]
+
+    if isinstance(function, PysFunction) and not isinstance(function, PysPythonFunction):
+        shipper = PysFunctionShipper()
+        payload = shipper.get_payload(shipper.ship_function(function))
+        files = shipper.files
+    else:
+        try:
+            payload = pickle.dumps(function)
+        except Exception as exception:
+            raise TypeError(
+                f"parallel_map(): {type(function).__name__!r} object cannot be sent to the workers: {exception}"
+            ) from exception
+        files = {}
+
+    if chunksize is None:
+        chunksize = max(1, -(-len(items) // (workers * 4)))
+
+    results = []
+
+    with ProcessPoolExecutor(workers, initializer=_initialize_worker, initargs=(payload, context.flags)) as executor:
+        for chunk_results, error in executor.map(
+            _run_chunk,
+            (items[start:start + chunksize] for start in range(0, len(items), chunksize))
+        ):
+            results.extend(chunk_results)
+
+            if error is not None:
+                executor.shutdown(cancel_futures=True)
+                raise PysSignal(
+                    PysRunTimeResult().failure(_decode_traceback(error, files, context, position))
+                )
+
+    return results
\ No newline at end of file
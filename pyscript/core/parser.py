@@ -10,12 +10,13 @@ from .position import PysPosition, format_error_arrow
 from .pystypes import jsdict
 from .results import PysParserResult
 from .token import TOKENS, PysToken
-from .utils.decorators import typecheck
+from .utils.decorators import debug_typecheck
 from .utils.generic import setimuattr
 from .utils.string import indent
 
+from functools import wraps
 from types import MappingProxyType
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Optional
 
 import sys
 
@@ -26,25 +27,120 @@ SEQUENCES_MAP = MappingProxyType({
     'tuple': (TOKENS['LEFT_PARENTHESIS'], PysTupleNode)
 })
 
+def memoize(rule: Callable[..., PysParserResult]) -> Callable[..., PysParserResult]:
+
+    """
+    Packrat memoization of a parser rule. The outcome of the rule is saved by token index (with the bracket level and
+    the parser flags, the only state the rules depend on), so parsing the rule again at the same index after a
+    backtrack returns immediately instead of re-running it over the same tokens.
+    """
+
+    name = rule.__name__
+
+    @wraps(rule)
+    def wrapper(self, *args):
+        key = (name, self.token_index, self.bracket_level, self.parser_flags) + args
+        entry = self.memo.get(key, None)
+
+        if entry is None:
+            result = rule(self, *args)
+            self.memo[key] = (
+                result.node, result.error, result.fatal, result.advance_count, result.last_registered_advance_count,
+                self.token_index, self.current_token, self.bracket_level
+            )
+            return result
+
+        result = PysParserResult()
+        (
+            result.node, result.error, result.fatal, result.advance_count, result.last_registered_advance_count,
+            self.token_index, self.current_token, self.bracket_level
+        ) = entry
+
+        return result
+
+    return wrapper
+
+class PysTokenWindow(Pys):
+
+    """
+    Bounded lookahead window over a stream of tokens (like `PysLexer.iter_tokens`). The tokens are pulled from the
+    stream when the parser reaches them and the tokens before a released index are dropped, so only the tokens of the
+    statement being parsed are kept in memory.
+    """
+
+    __slots__ = ('stream', 'tokens', 'offset', 'exhausted')
+
+    def __init__(self, tokens: Iterable[PysToken]) -> None:
+        self.stream = iter(tokens)
+        self.tokens = []
+        self.offset = 0
+        self.exhausted = False
+
+    def __repr__(self) -> str:
+        return f'<TokenWindow of {len(self.tokens)} tokens from {self.offset}>'
+
+    def get(self, index: int) -> PysToken | None:
+
+        """
+        Returns the token at an index of the stream, None if the index is before the start or after the end of the
+        stream.
+        """
+
+        tokens = self.tokens
+        position = index - self.offset
+
+        if position < len(tokens):
+            if position >= 0:
+                return tokens[position]
+            elif index >= 0:
+                raise IndexError(f"token {index} was released")
+            return None
+
+        if not self.exhausted:
+            append = tokens.append
+            next_token = self.stream.__next__
+
+            try:
+                while position >= len(tokens):
+                    append(next_token())
+                return tokens[position]
+            except StopIteration:
+                self.exhausted = True
+
+        return None
+
+    def release(self, index: int) -> None:
+
+        """
+        Drops the tokens before an index, the parser never goes back before it.
+        """
+
+        count = index - self.offset
+        if count > 0:
+            del self.tokens[:count]
+            self.offset = index
+
 class PysParser(Pys):
 
-    @typecheck
+    @debug_typecheck
     def __init__(
         self,
-        tokens: tuple[PysToken, ...] | tuple[PysToken],
+        tokens: tuple[PysToken, ...] | tuple[PysToken] | Iterable[PysToken],
         flags: int = DEFAULT,
         parser_flags: int = DEFAULT,
         context_parent: Optional[PysContext] = None,
         context_parent_entry_position: Optional[PysPosition] = None
     ) -> None:
 
+        # anything other than a tuple is a stream of tokens, read through a window
+        self.window = None if tokens.__class__ is tuple else PysTokenWindow(tokens)
         self.tokens = tokens
         self.flags = flags
         self.parser_flags = parser_flags
         self.context_parent = context_parent
         self.context_parent_entry_position = context_parent_entry_position
 
-    @typecheck
+    @debug_typecheck
     def parse(
         self,
         function: Optional[Callable[[], PysParserResult]] = None
@@ -52,10 +148,16 @@ class PysParser(Pys):
 
         self.token_index = 0
         self.bracket_level = 0
+        # only the statements of the whole file release the streamed tokens, not the statements inside a rule
+        self.statements_level = 0 if function is None else 1
+        self.memo = {}
 
         self.update_current_token()
 
-        result = (function or self.statements)()
+        try:
+            result = (function or self.statements)()
+        finally:
+            self.memo = {}
 
         if not result.error:
             if is_right_bracket(self.current_token.type):
@@ -66,8 +168,14 @@ class PysParser(Pys):
         return result.node, result.error
 
     def update_current_token(self) -> None:
-        if 0 <= self.token_index < len(self.tokens):
-            self.current_token = self.tokens[self.token_index]
+        window = self.window
+
+        if window is None:
+            if 0 <= self.token_index < len(self.tokens):
+                self.current_token = self.tokens[self.token_index]
+
+        elif (token := window.get(self.token_index)) is not None:
+            self.current_token = token
 
     def advance(self) -> None:
         self.token_index += 1
@@ -100,10 +208,17 @@ class PysParser(Pys):
         statements = []
         more_statements = True
         bracket_level = self.bracket_level
+        window = self.window if self.statements_level == 0 else None
 
         self.bracket_level = 0
+        self.statements_level += 1
 
         while True:
+            if window is not None:
+                # a parsed top-level statement is never backtracked over, its tokens and memos can be dropped
+                window.release(self.token_index)
+                self.memo.clear()
+
             advance_count = self.skip(result, TOKENS['NEWLINE'], TOKENS['SEMICOLON'])
 
             if not more_statements:
@@ -113,6 +228,7 @@ class PysParser(Pys):
 
             statement = result.try_register(self.statement())
             if result.error:
+                self.statements_level -= 1
                 return result
 
             if statement:
@@ -123,6 +239,7 @@ class PysParser(Pys):
             more_statements = False
 
         self.bracket_level = bracket_level
+        self.statements_level -= 1
 
         return result.success(
             statements[0] if len(statements) == 1 else PysStatementsNode(
@@ -136,75 +253,16 @@ class PysParser(Pys):
         )
 
     def statement(self) -> PysParserResult:
-        if self.current_token.match(TOKENS['KEYWORD'], 'from'):
-            return self.from_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'import'):
-            return self.import_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'if'):
-            return self.if_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'switch'):
-            return self.switch_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'try'):
-            return self.try_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'with'):
-            return self.with_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'for'):
-            return self.for_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'while'):
-            return self.while_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'do'):
-            return self.do_while_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'repeat'):
-            return self.repeat_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'class'):
-            return self.class_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'return'):
-            return self.return_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'global'):
-            return self.global_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'del', 'delete'):
-            return self.del_statement()
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'raise', 'throw'):
-            return self.throw_statement()
+        token = self.current_token
 
-        elif self.current_token.match(TOKENS['KEYWORD'], 'assert'):
-            return self.assert_statement()
+        if token.type == TOKENS['KEYWORD']:
+            rule = STATEMENT_RULES.get(token.value, None)
+            if rule is not None:
+                return rule(self)
 
-        elif self.current_token.type == TOKENS['AT']:
+        elif token.type == TOKENS['AT']:
             return self.decorator_statement()
 
-        elif self.current_token.match(TOKENS['KEYWORD'], 'continue'):
-            result = PysParserResult()
-            position = self.current_token.position
-
-            result.register_advancement()
-            self.advance()
-
-            return result.success(PysContinueNode(position))
-
-        elif self.current_token.match(TOKENS['KEYWORD'], 'break'):
-            result = PysParserResult()
-            position = self.current_token.position
-
-            result.register_advancement()
-            self.advance()
-
-            return result.success(PysBreakNode(position))
-
         result = PysParserResult()
 
         assignment_expression = result.register(self.assignment_statement())
@@ -276,6 +334,7 @@ class PysParser(Pys):
 
         return result.success(node)
 
+    @memoize
     def single_expression(self) -> PysParserResult:
         if self.current_token.match(TOKENS['KEYWORD'], 'match'):
             return self.match_expression()
@@ -2244,6 +2303,30 @@ class PysParser(Pys):
             )
         )
 
+    def continue_statement(self) -> PysParserResult:
+        result = PysParserResult()
+        position = self.current_token.position
+
+        if not self.current_token.match(TOKENS['KEYWORD'], 'continue'):
+            return result.failure(self.new_error("expected 'continue'"))
+
+        result.register_advancement()
+        self.advance()
+
+        return result.success(PysContinueNode(position))
+
+    def break_statement(self) -> PysParserResult:
+        result = PysParserResult()
+        position = self.current_token.position
+
+        if not self.current_token.match(TOKENS['KEYWORD'], 'break'):
+            return result.failure(self.new_error("expected 'break'"))
+
+        result.register_advancement()
+        self.advance()
+
+        return result.success(PysBreakNode(position))
+
     def decorator_statement(self) -> PysParserResult:
         result = PysParserResult()
 
@@ -2567,4 +2650,28 @@ class PysParser(Pys):
             self.parser_flags |= DICT_TO_JSDICT
             return result.success(True)
 
-        return result.failure(self.new_error(f"future feature {name} is not defined"))
\ No newline at end of file
+        return result.failure(self.new_error(f"future feature {name} is not defined"))
+
+# statement keyword to the rule parsing the statement (see PysParser.statement)
+STATEMENT_RULES = MappingProxyType({
+    'from': PysParser.from_statement,
+    'import': PysParser.import_statement,
+    'if': PysParser.if_statement,
+    'switch': PysParser.switch_statement,
+    'try': PysParser.try_statement,
+    'with': PysParser.with_statement,
+    'for': PysParser.for_statement,
+    'while': PysParser.while_statement,
+    'do': PysParser.do_while_statement,
+    'repeat': PysParser.repeat_statement,
+    'class': PysParser.class_statement,
+    'return': PysParser.return_statement,
+    'global': PysParser.global_statement,
+    'del': PysParser.del_statement,
+    'delete': PysParser.del_statement,
+    'raise': PysParser.throw_statement,
+    'throw': PysParser.throw_statement,
+    'assert': PysParser.assert_statement,
+    'continue': PysParser.continue_statement,
+    'break': PysParser.break_statement
+})
\ No newline at end of file
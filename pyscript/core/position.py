@@ -2,9 +2,11 @@ from .bases import Pys
 from .buffer import PysFileBuffer
 from .constants import ENV_PYSCRIPT_MAXIMUM_TRACEBACK_LINE
 from .mapping import GET_ACOLOR
-from .utils.decorators import typecheck, immutable
+from .utils.decorators import debug_typecheck, immutable
 from .utils.generic import setimuattr
 
+from bisect import bisect_right
+
 import os
 
 MAXIMUM_TRACEBACK_LINE = os.environ.get(ENV_PYSCRIPT_MAXIMUM_TRACEBACK_LINE)
@@ -19,21 +21,44 @@ else:
 @immutable
 class PysPosition(Pys):
 
-    __slots__ = ('file', 'start', 'end', 'start_line', 'start_column', 'end_line', 'end_column', 'is_positionless')
+    __slots__ = ('file', 'start', 'end', 'is_positionless')
 
-    @typecheck
+    @debug_typecheck
     def __init__(self, file: PysFileBuffer, start: int, end: int) -> None:
         is_positionless = start < 0 or end < 0 or start > end or end > len(file.text) + 1
 
         setimuattr(self, 'file', file)
         setimuattr(self, 'is_positionless', is_positionless)
 
-        setimuattr(self, 'start',        -1 if is_positionless else start)
-        setimuattr(self, 'end',          -1 if is_positionless else end)
-        setimuattr(self, 'start_line',   -1 if is_positionless else file.text.count('\n', 0, start) + 1)
-        setimuattr(self, 'start_column', -1 if is_positionless else start - file.text.rfind('\n', 0, start))
-        setimuattr(self, 'end_line',     -1 if is_positionless else file.text.count('\n', 0, end) + 1)
-        setimuattr(self, 'end_column',   -1 if is_positionless else end - file.text.rfind('\n', 0, end))
+        setimuattr(self, 'start', -1 if is_positionless else start)
+        setimuattr(self, 'end',   -1 if is_positionless else end)
+
+    # lines and columns are only needed by tracebacks and tools, so they are resolved on access from the line offsets
+    # of the file buffer
+
+    @property
+    def start_line(self) -> int:
+        return -1 if self.is_positionless else bisect_right(self.file.line_starts, self.start)
+
+    @property
+    def start_column(self) -> int:
+        if self.is_positionless:
+            return -1
+        line_starts = self.file.line_starts
+        start = self.start
+        return start - line_starts[bisect_right(line_starts, start) - 1] + 1
+
+    @property
+    def end_line(self) -> int:
+        return -1 if self.is_positionless else bisect_right(self.file.line_starts, self.end)
+
+    @property
+    def end_column(self) -> int:
+        if self.is_positionless:
+            return -1
+        line_starts = self.file.line_starts
+        end = self.end
+        return end - line_starts[bisect_right(line_starts, end) - 1] + 1
 
     def __repr__(self) -> str:
         return f'<Position({self.start!r}, {self.end!r}) from {self.file.name!r}>'
@@ -0,0 +1,364 @@
+from .bases import Pys
+from .nodes import PysNode
+from .position import PysPosition
+from .pystypes import PysFunction
+
+from collections import Counter
+from threading import Event, Thread, local, get_ident
+from time import perf_counter
+from types import CodeType, FunctionType, ModuleType
+from typing import Any, IO, Literal, Optional
+
+import marshal
+import sys
+
+ROOT_LABEL = '<program>'
+SORT_KEYS = {
+    'cumulative': lambda item : item[1][3],
+    'tottime': lambda item : item[1][2],
+    'ncalls': lambda item : item[1][1]
+}
+
+def _collect_codes(*modules: ModuleType) -> frozenset[CodeType]:
+    codes = set()
+    stack = [
+        value.__code__
+        for module in modules
+        for value in vars(module).values()
+        if isinstance(value, FunctionType) and value.__module__ == module.__name__
+    ]
+
+    while stack:
+        code = stack.pop()
+        codes.add(code)
+        stack.extend(constant for constant in code.co_consts if isinstance(constant, CodeType))
+
+    return frozenset(codes)
+
+class PysProfiler(Pys):
+
+    """
+    Profiler of PyScript code. Calls of PyScript functions are traced (call counts, own and cumulative time per
+    function) while a sampling thread records the PyScript call stack and the source line being executed by the
+    profiled thread at every interval.
+
+    Only the thread that starts the profiler is sampled, calls are traced in every thread.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.total_time = 0.0
+        self.line_samples = Counter()
+        self.stack_samples = Counter()
+        self.files = {}
+
+        self._keys = {}
+        self._thread_stats = []
+        self._local = None
+        self._original_call = None
+        self._sampler = None
+        self._stop_event = None
+        self._start_time = None
+
+    def __enter__(self) -> 'PysProfiler':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._original_call is not None
+
+    def start(self) -> None:
+        # circular import problem solved
+        from . import compiler, interpreter
+
+        global POSITION_CODES
+
+        if self.is_running:
+            raise RuntimeError("profiler is already running")
+        elif PysFunction.__call__ is not CALL:
+            raise RuntimeError("another profiler is still running")
+
+        if POSITION_CODES is None:
+            # code objects of the interpreter visitors and compiled closures, their `node` or `position` local is the
+            # node being executed
+            POSITION_CODES = _collect_codes(interpreter, compiler)
+
+        self._local = local()
+        self._original_call = original_call = CALL
+        self._stop_event = Event()
+
+        PysFunction.__call__ = self._get_traced_call(original_call)
+
+        self._sampler = Thread(target=self._sample_loop, args=(get_ident(),), name='pyscript-profiler', daemon=True)
+        self._start_time = perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        if not self.is_running:
+            return
+
+        self.total_time += perf_counter() - self._start_time
+        self._stop_event.set()
+        self._sampler.join()
+
+        PysFunction.__call__ = self._original_call
+
+        self._original_call = None
+        self._sampler = None
+        self._stop_event = None
+        self._local = None
+
+    def get_key(self, function: PysFunction) -> tuple[str, int, str]:
+        code = function.__code__
+        key = self._keys.get(code, None)
+
+        if key is None:
+            file = code.file
+            position = code.position
+            key = self._keys[code] = (file.name, position.start_line, function.__qualname__)
+            self.files.setdefault(file.name, file)
+
+        return key
+
+    def _get_traced_call(self, original_call: Any) -> Any:
+        get_key = self.get_key
+        thread_local = self._local
+        thread_stats = self._thread_stats
+
+        def __call__(function, *args, **kwargs):
+            try:
+                stack = thread_local.stack
+            except AttributeError:
+                stack = thread_local.stack = []
+                thread_local.active = Counter()
+                thread_local.stats = stats = {}
+                thread_stats.append(stats)
+
+            key = get_key(function)
+            active = thread_local.active
+            active[key] += 1
+
+            frame = [key, 0.0]
+            stack.append(frame)
+            start = perf_counter()
+
+            try:
+                return original_call(function, *args, **kwargs)
+
+            finally:
+                elapsed = perf_counter() - start
+                stack.pop()
+                active[key] -= 1
+
+                own = elapsed - frame[1]
+                primitive = active[key] == 0
+                cumulative = elapsed if primitive else 0.0
+
+                stats = thread_local.stats
+                entry = stats.get(key, None)
+                if entry is None:
+                    entry = stats[key] = [0, 0, 0.0, 0.0, {}]
+
+                entry[0] += primitive
+                entry[1] += 1
+                entry[2] += own
+                entry[3] += cumulative
+
+                if stack:
+                    caller = stack[-1]
+                    caller[1] += elapsed
+
+                    callers = entry[4]
+                    caller_entry = callers.get(caller[0], None)
+                    if caller_entry is None:
+                        caller_entry = callers[caller[0]] = [0, 0, 0.0, 0.0]
+
+                    caller_entry[0] += primitive
+                    caller_entry[1] += 1
+                    caller_entry[2] += own
+                    caller_entry[3] += cumulative
+
+        __call__.__wrapped__ = original_call
+        return __call__
+
+    def _sample_loop(self, thread_id: int) -> None:
+        wait = self._stop_event.wait
+        interval = self.interval
+        current_frames = sys._current_frames
+
+        while not wait(interval):
+            frame = current_frames().get(thread_id, None)
+            if frame is None:
+                break
+            self._sample(frame)
+
+    def _sample(self, frame: Any) -> None:
+        b_isinstance = isinstance
+        get_key = self.get_key
+        position = None
+        stack = []
+
+        while frame is not None:
+            code = frame.f_code
+
+            if code is CALL_CODE:
+                function = frame.f_locals.get('self', None)
+                if b_isinstance(function, PysFunction):
+                    stack.append(get_key(function))
+
+            elif position is None and code in POSITION_CODES:
+                locals = frame.f_locals
+                node = locals.get('node', None)
+                position = node.position if b_isinstance(node, PysNode) else locals.get('position', None)
+                if not b_isinstance(position, PysPosition) or position.is_positionless:
+                    position = None
+
+            frame = frame.f_back
+
+        stack.reverse()
+        self.stack_samples[tuple(stack)] += 1
+
+        if position is not None:
+            file = position.file
+            self.files.setdefault(file.name, file)
+            self.line_samples[(file.name, position.start_line)] += 1
+
+    def get_stats(self) -> dict[tuple[str, int, str], tuple[int, int, float, float, dict]]:
+
+        """
+        Returns the traced calls in the format of pstats: {function: (primitive calls, calls, own time, cumulative
+        time, {caller: (primitive calls, calls, own time, cumulative time)})}.
+        """
+
+        merged = {}
+
+        for stats in list(self._thread_stats):
+            for key, (primitive, calls, own, cumulative, callers) in list(stats.items()):
+                entry = merged.get(key, None)
+                if entry is None:
+                    entry = merged[key] = [0, 0, 0.0, 0.0, {}]
+
+                entry[0] += primitive
+                entry[1] += calls
+                entry[2] += own
+                entry[3] += cumulative
+
+                merged_callers = entry[4]
+                for caller, values in list(callers.items()):
+                    merged_callers[caller] = tuple(map(sum, zip(merged_callers.get(caller, (0, 0, 0.0, 0.0)), values)))
+
+        return {key: (cc, nc, tt, ct, callers) for key, (cc, nc, tt, ct, callers) in merged.items()}
+
+    def get_line(self, name: str, line: int) -> str:
+        file = self.files.get(name, None)
+        if file is None:
+            return ''
+
+        text = file.text
+        line_starts = file.line_starts
+        if not (0 < line <= len(line_starts)):
+            return ''
+
+        start = line_starts[line - 1]
+        end = text.find('\n', start)
+        return text[start:] if end == -1 else text[start:end]
+
+    def print_stats(
+        self,
+        sort: Literal['cumulative', 'tottime', 'ncalls'] = 'cumulative',
+        limit: Optional[int] = 30,
+        file: Optional[IO[str]] = None
+    ) -> None:
+
+        """
+        Prints the traced functions sorted by `sort` and the most sampled source lines.
+        """
+
+        if file is None:
+            file = sys.stdout
+
+        stats = self.get_stats()
+        total_calls = sum(entry[1] for entry in stats.values())
+        primitive_calls = sum(entry[0] for entry in stats.values())
+        total_samples = sum(self.line_samples.values())
+
+        print(
+            f"         {total_calls} function calls ({primitive_calls} primitive calls) in {self.total_time:.3f} "
+            f"seconds, {total_samples} line samples\n\n"
+            f"   Ordered by: {'cumulative time' if sort == 'cumulative' else sort}\n\n"
+            "   ncalls  tottime  percall  cumtime  percall filename:lineno(function)",
+            file=file
+        )
+
+        for (name, line, qualname), (cc, nc, tt, ct, _) in sorted(
+            stats.items(),
+            key=SORT_KEYS[sort],
+            reverse=True
+        )[:limit]:
+            ncalls = str(nc) if cc == nc else f'{nc}/{cc}'
+            print(
+                f"{ncalls:>9} {tt:8.3f} {tt / nc:8.3f} {ct:8.3f} {ct / cc if cc else 0:8.3f} "
+                f"{name}:{line}({qualname})",
+                file=file
+            )
+
+        if total_samples:
+            print("\n  samples  percent filename:lineno", file=file)
+
+            for (name, line), count in self.line_samples.most_common(limit):
+                print(
+                    f"{count:>9} {count / total_samples:7.1%}  {name}:{line}  {self.get_line(name, line).strip()}",
+                    file=file
+                )
+
+        print(file=file)
+
+    def dump_stats(self, path: str) -> None:
+
+        """
+        Writes the traced calls to a file readable by pstats (`pstats.Stats(path)`) and tools like snakeviz.
+        """
+
+        with open(path, 'wb') as file:
+            marshal.dump(
+                {
+                    key: (cc, nc, tt, ct, {caller: tuple(values) for caller, values in callers.items()})
+                    for key, (cc, nc, tt, ct, callers) in self.get_stats().items()
+                },
+                file
+            )
+
+    def dump_collapsed(self, path: str) -> None:
+
+        """
+        Writes the sampled stacks in the collapsed format (one `frame;frame;... count` line per stack) used by
+        flamegraph.pl, speedscope, inferno, etc.
+        """
+
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in sorted(self.stack_samples.items()):
+                file.write(
+                    ';'.join(
+                        [ROOT_LABEL] + [f'{qualname} ({name}:{line})' for name, line, qualname in stack]
+                    ) + f' {count}\n'
+                )
+
+    def dump(self, path: str) -> None:
+
+        """
+        Writes the profile to a file, in the collapsed stack format if the path ends with `.folded` or `.collapsed`,
+        otherwise in the pstats format.
+        """
+
+        if path.endswith(('.folded', '.collapsed')):
+            self.dump_collapsed(path)
+        else:
+            self.dump_stats(path)
+
+CALL = PysFunction.__call__
+CALL_CODE = CALL.__code__
+POSITION_CODES = None
\ No newline at end of file
@@ -8,9 +8,8 @@ from .exceptions import PysSignal
 from .handlers import handle_call
 from .mapping import GET_ACOLOR
 from .position import PysPosition
-from .pystypes import PysFunction, PysPythonFunction, PysBuiltinFunction
+from .pystypes import PysCompiledCode, PysFunction, PysPythonFunction, PysBuiltinFunction
 from .results import PysRunTimeResult
-from .shell import PysClassicLineShell, PysPromptToolkitLineShell, ADVANCE_LINE_SHELL_SUPPORT
 from .symtab import new_module_namespace
 from .utils.debug import import_readline
 from .utils.generic import dkeys, get_sequence, is_object_of as isobjectof
@@ -20,7 +19,6 @@ from .utils.string import normstr
 
 from math import inf, nan, isclose
 from importlib import import_module
-from inspect import signature
 from types import BuiltinFunctionType, BuiltinMethodType, FunctionType, MethodType, ModuleType, NoneType
 from typing import Any, Callable
 
@@ -79,6 +77,8 @@ def _unpack_comprehension_function(context: PysContext, position: PysPosition, f
                 return function(*item)
 
     elif isinstance(check, python_function):
+        # inspect is slow to import, it is only needed here
+        from inspect import signature
         parameters = signature(check).parameters
         length = max(len(parameters) - offset, 0)
         if length == 0:
@@ -208,7 +208,8 @@ def require(context, position, name):
                     mode='exec',
                     symbol_table=symbol_table,
                     context_parent=context,
-                    context_parent_entry_position=position
+                    context_parent_entry_position=position,
+                    use_cache=True
                 )
 
                 if result.error:
@@ -259,6 +260,8 @@ def breakpoint(context, position):
 
     # circular import problem solved
     from .runner import pys_runner
+    # the shells import prompt_toolkit, they are only loaded when a shell runs
+    from .shell import PysClassicLineShell, PysPromptToolkitLineShell, ADVANCE_LINE_SHELL_SUPPORT
 
     flags = context.flags
     symbol_table = context.symbol_table
@@ -421,11 +424,11 @@ def dir(context, position, *args):
 def exec(context, position, source, globals=None):
 
     """
-    exec(source: str | bytes, globals: Optional[dict]) -> None
+    exec(source: str | bytes | PysCompiledCode, globals: Optional[dict]) -> None
 
     Executes PyScript code statements from the given source.
 
-    source: A string containing the code statements to be executed.
+    source: A string containing the code statements to be executed, or a compiled code object.
     globals: The namespace scope for the code that can be accessed, modified, and deleted. If not provided, the current
              local scope will be used.
     """
@@ -437,11 +440,12 @@ def exec(context, position, source, globals=None):
     from .runner import pys_runner
 
     result = pys_runner(
-        file=PysFileBuffer(source, '<exec>'),
+        file=source if isinstance(source, PysCompiledCode) else PysFileBuffer(source, '<exec>'),
         mode='exec',
         symbol_table=context.symbol_table if globals is None else new_module_namespace(symbols=globals)[0],
         context_parent=context,
-        context_parent_entry_position=position
+        context_parent_entry_position=position,
+        compile_cache=True
     )
 
     if result.error:
@@ -451,11 +455,11 @@ def exec(context, position, source, globals=None):
 def eval(context, position, source, globals=None):
 
     """
-    eval(source: str | bytes, globals: Optional[dict]) -> None
+    eval(source: str | bytes | PysCompiledCode, globals: Optional[dict]) -> None
 
     Executes a PyScript code expression from the given source.
 
-    source: A string containing the code statements to be executed.
+    source: A string containing the code statements to be executed, or a compiled code object.
     globals: The namespace scope for the code that can be accessed, modified, and deleted. If not provided, the current
              local scope will be used.
     """
@@ -467,11 +471,12 @@ def eval(context, position, source, globals=None):
     from .runner import pys_runner
 
     result = pys_runner(
-        file=PysFileBuffer(source, '<eval>'),
+        file=source if isinstance(source, PysCompiledCode) else PysFileBuffer(source, '<eval>'),
         mode='eval',
         symbol_table=context.symbol_table if globals is None else new_module_namespace(symbols=globals)[0],
         context_parent=context,
-        context_parent_entry_position=position
+        context_parent_entry_position=position,
+        compile_cache=True
     )
 
     if result.error:
@@ -642,6 +647,32 @@ def comprehension(context, position, init, wrap, condition=None):
         init if condition is None else filter(_unpack_comprehension_function(context, position, condition), init)
     )
 
+@PysBuiltinFunction
+def parallel_map(context, position, function, iterable, workers=None, chunksize=None):
+
+    """
+    parallel_map(
+        function: Callable[[Any], Any],
+        iterable: Iterable[Any],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None
+    ) -> list[Any]
+
+    A multi-process replacement of `list(map(function, iterable))` for CPU-bound functions. The function runs in a pool
+    of worker processes and the results are returned in order.
+
+    function: The function called on every item. A PyScript function is sent with its source and the picklable values
+              of its closure.
+    iterable: The items to be mapped (must be picklable).
+    workers: The number of processes (the number of CPUs by default, 1 runs in the current process).
+    chunksize: The number of items sent to a worker at once (by default, 4 chunks per worker).
+    """
+
+    # circular import problem solved
+    from .parallel import run_parallel_map
+
+    return run_parallel_map(context, position, function, iterable, workers, chunksize)
+
 _pyincrement = increment.__func__
 _pydecrement = decrement.__func__
 
@@ -686,5 +717,6 @@ pys_builtins.__dict__.update({
     'decrement': decrement,
     'unpack': unpack,
     'comprehension': comprehension,
+    'parallel_map': parallel_map,
     'isobjectof': isobjectof
 })
\ No newline at end of file
@@ -1,17 +1,29 @@
 from .bases import Pys
+from .buffer import PysFileBuffer
+from .cache import undefined
 from .context import PysContext, PysClassContext
 from .exceptions import PysTraceback, PysSignal
 from .nodes import PysNode
 from .position import PysPosition
 from .results import PysRunTimeResult
-from .symtab import PysSymbolTable
+from .symtab import PysFrameSymbolTable
 from .utils.decorators import immutable
 from .utils.generic import setimuattr, dinit, drepr, dor, dsetitem, ddelitem, ditems
 from .utils.similarity import get_closest
 from .utils.string import join
 
+from contextvars import ContextVar
 from types import MethodType
-from typing import Any, Callable, Union
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+if TYPE_CHECKING:
+    # circular import problem solved
+    from .compact import PysCompactTree
+
+# call site of the last function registered by handle_call in the current thread (or asyncio task), as a tuple of
+# (code, (context, position))
+call_site = ContextVar('call_site', default=None)
+get_call_site = call_site.get
 
 class PysObject(Pys):
     __slots__ = ()
@@ -57,6 +69,86 @@ class PysCode(PysObject):
     def __init__(self, **kwargs) -> None:
         self.__dict__ = kwargs
 
+@immutable
+class PysCompiledCode(PysObject):
+
+    """
+    An analyzed (and optimized with OPTIMIZE) PyScript code, returned by pys_compile. It can be executed many times by
+    pys_exec, pys_eval, exec and eval without compiling the source again.
+    """
+
+    __slots__ = ('file', 'mode', 'node', 'flags', 'parser_flags', '_closure')
+
+    def __init__(
+        self,
+        file: PysFileBuffer,
+        mode: str,
+        node: Union[PysNode, 'PysCompactTree'],
+        flags: int,
+        parser_flags: int
+    ) -> None:
+
+        setimuattr(self, 'file', file)
+        setimuattr(self, 'mode', mode)
+        setimuattr(self, 'node', node)
+        setimuattr(self, 'flags', flags)
+        setimuattr(self, 'parser_flags', parser_flags)
+        setimuattr(self, '_closure', None)
+
+    def __repr__(self) -> str:
+        return f'<compiled code {self.mode} from {self.file.name!r} at 0x{id(self):016X}>'
+
+    def get_node(self) -> PysNode:
+
+        """
+        Returns the node. A compact code object expands its node on the first call and replaces the compact form with
+        it, so the code object never keeps both forms.
+        """
+
+        node = self.node
+
+        if not isinstance(node, PysNode):
+            node = node.expand()
+            setimuattr(self, 'node', node)
+
+        return node
+
+    def compact(self) -> 'PysCompiledCode':
+
+        """
+        Returns a copy of the code object that keeps its node in compact form (`pyscript.core.compact`), for code
+        objects kept for a long time but rarely executed. The memory is only saved at rest: the code object goes back
+        to the full node when it is executed for the first time (see get_node).
+        """
+
+        # circular import problem solved
+        from .compact import compact_node
+
+        node = self.node
+        return PysCompiledCode(
+            self.file,
+            self.mode,
+            compact_node(node, self.file) if isinstance(node, PysNode) else node,
+            self.flags,
+            self.parser_flags
+        )
+
+    def get_closure(self) -> Callable[[PysContext], PysRunTimeResult]:
+
+        """
+        Returns the node compiled into a closure (COMPILE_CLOSURE), compiled once per code object.
+        """
+
+        closure = self._closure
+
+        if closure is None:
+            # circular import problem solved
+            from .compiler import compile_node
+            closure = compile_node(self.get_node())
+            setimuattr(self, '_closure', closure)
+
+        return closure
+
 class PysFunction(PysObject):
 
     def __init__(
@@ -66,11 +158,14 @@ class PysFunction(PysObject):
         parameters: list[str | tuple[str, Any]],
         body: PysNode,
         context: PysContext,
-        position: PysPosition
+        position: PysPosition,
+        get_visitor: Callable[[type[PysNode]], Callable[[PysNode, PysContext], PysRunTimeResult]] | None = None,
+        local_names: tuple[str, ...] = ()
     ) -> None:
 
-        # circular import problem solved
-        from .interpreter import get_visitor
+        if get_visitor is None:
+            # circular import problem solved
+            from .interpreter import get_visitor
 
         context = context.parent if isinstance(context, PysClassContext) else context
 
@@ -95,6 +190,11 @@ class PysFunction(PysObject):
                 append_paramnames(parameter)
                 append_argnames(parameter)
 
+        # the parameters take the first slots of the frame, in the order they are bound by position
+        local_names = b_tuple(argument_names) + b_tuple(keyword_argument_names) + b_tuple(
+            name for name in local_names if name not in keyword_arguments and name not in argument_names
+        )
+
         self.__name__ = name = '<function>' if name is None else name
         self.__qualname__ = name if qualname is None else f'{qualname}.{name}'
         self.__module__ = 'pyscript'
@@ -103,6 +203,7 @@ class PysFunction(PysObject):
             body=body,
             context=context,
             position=position,
+            call_site=(context, position),
             file=context.file,
             closure_symbol_table=context.symbol_table,
             get_visitor=get_visitor,
@@ -110,6 +211,8 @@ class PysFunction(PysObject):
             argument_names=b_tuple(argument_names),
             keyword_argument_names=b_tuple(keyword_argument_names),
             parameter_names=b_tuple(parameter_names),
+            local_indexes={name: index for index, name in enumerate(local_names)},
+            unbound_locals=[undefined] * (len(local_names) - len(parameters)),
             combine_keyword_arguments=keyword_arguments.__or__
         )
 
@@ -121,55 +224,112 @@ class PysFunction(PysObject):
 
     def __call__(self, *args, **kwargs) -> Any:
         code = self.__code__
-        context = code.context
-        position = code.position
+        site = get_call_site()
+        context, position = site[1] if site is not None and site[0] is code else code.call_site
 
         b_zip = zip
         b_len = len
 
         result = PysRunTimeResult()
-        symbol_table = PysSymbolTable(code.closure_symbol_table)
-        registered_arguments = set()
+        code_parameters_length = code.parameters_length
+        arguments_length = b_len(args)
+
+        if not kwargs and arguments_length == code_parameters_length:
+            # every parameter is given positionally, the arguments take the first slots of the frame
+            symbol_table = PysFrameSymbolTable(
+                code.closure_symbol_table,
+                code.local_indexes,
+                [*args, *code.unbound_locals]
+            )
+
+        else:
+            symbol_table = PysFrameSymbolTable(
+                code.closure_symbol_table,
+                code.local_indexes,
+                [undefined] * (code_parameters_length + b_len(code.unbound_locals))
+            )
+            registered_arguments = set()
 
-        set_symbol = symbol_table.set
-        add_argument = registered_arguments.add
+            set_symbol = symbol_table.set
+            add_argument = registered_arguments.add
 
-        for name, arg in b_zip(code.argument_names, args):
-            set_symbol(name, arg)
-            add_argument(name)
+            for name, arg in b_zip(code.argument_names, args):
+                set_symbol(name, arg)
+                add_argument(name)
+
+            combined_keyword_arguments = code.combine_keyword_arguments(kwargs)
+            pop_keyword_arguments = combined_keyword_arguments.pop
+
+            for name, arg in b_zip(code.keyword_argument_names, args[b_len(registered_arguments):]):
+                set_symbol(name, arg)
+                add_argument(name)
+                pop_keyword_arguments(name, None)
+
+            code_parameter_names = code.parameter_names
+
+            for name, value in combined_keyword_arguments.items():
+
+                if name in registered_arguments:
+                    raise PysSignal(
+                        result.failure(
+                            PysTraceback(
+                                TypeError(f"{self.__qualname__}() got multiple values for argument {name!r}"),
+                                context,
+                                position
+                            )
+                        )
+                    )
 
-        combined_keyword_arguments = code.combine_keyword_arguments(kwargs)
-        pop_keyword_arguments = combined_keyword_arguments.pop
+                elif name not in code_parameter_names:
+                    closest_argument = get_closest(set(code_parameter_names), name)
+                    hint_message = "" if closest_argument is None else f". Did you mean {closest_argument!r}?"
+
+                    raise PysSignal(
+                        result.failure(
+                            PysTraceback(
+                                TypeError(
+                                    f"{self.__qualname__}() got an unexpected keyword argument {name!r}{hint_message}"
+                                ),
+                                context,
+                                position
+                            )
+                        )
+                    )
 
-        for name, arg in b_zip(code.keyword_argument_names, args[b_len(registered_arguments):]):
-            set_symbol(name, arg)
-            add_argument(name)
-            pop_keyword_arguments(name, None)
+                set_symbol(name, value)
+                add_argument(name)
 
-        code_parameter_names = code.parameter_names
+            total_registered = b_len(registered_arguments)
 
-        for name, value in combined_keyword_arguments.items():
+            if total_registered < code_parameters_length:
+                missing_arguments = [repr(name) for name in code_parameter_names if name not in registered_arguments]
+                total_missing = b_len(missing_arguments)
 
-            if name in registered_arguments:
                 raise PysSignal(
                     result.failure(
                         PysTraceback(
-                            TypeError(f"{self.__qualname__}() got multiple values for argument {name!r}"),
+                            TypeError(
+                                f"{self.__qualname__}() missing {total_missing} required positional argument"
+                                f"{'' if total_missing == 1 else 's'}: {join(missing_arguments, conjunction='and')}"
+                            ),
                             context,
                             position
                         )
                     )
                 )
 
-            elif name not in code_parameter_names:
-                closest_argument = get_closest(set(code_parameter_names), name)
-                hint_message = "" if closest_argument is None else f". Did you mean {closest_argument!r}?"
+            elif total_registered > code_parameters_length or \
+                (arguments_exceeding := arguments_length > code_parameters_length):
+                given_arguments = arguments_length if arguments_exceeding else total_registered
 
                 raise PysSignal(
                     result.failure(
                         PysTraceback(
                             TypeError(
-                                f"{self.__qualname__}() got an unexpected keyword argument {name!r}{hint_message}"
+                                f"{self.__qualname__}() takes no arguments ({given_arguments} given)"
+                                if code_parameters_length == 0 else
+                                f"{self.__qualname__}() takes {code_parameters_length} positional argument"
+                                f"{'' if code_parameters_length == 1 else 's'} but {given_arguments} were given"
                             ),
                             context,
                             position
@@ -177,49 +337,6 @@ class PysFunction(PysObject):
                     )
                 )
 
-            set_symbol(name, value)
-            add_argument(name)
-
-        code_parameters_length = code.parameters_length
-        arguments_length = b_len(args)
-        total_registered = b_len(registered_arguments)
-
-        if total_registered < code_parameters_length:
-            missing_arguments = [repr(name) for name in code_parameter_names if name not in registered_arguments]
-            total_missing = b_len(missing_arguments)
-
-            raise PysSignal(
-                result.failure(
-                    PysTraceback(
-                        TypeError(
-                            f"{self.__qualname__}() missing {total_missing} required positional argument"
-                            f"{'' if total_missing == 1 else 's'}: {join(missing_arguments, conjunction='and')}"
-                        ),
-                        context,
-                        position
-                    )
-                )
-            )
-
-        elif total_registered > code_parameters_length or \
-            (arguments_exceeding := arguments_length > code_parameters_length):
-            given_arguments = arguments_length if arguments_exceeding else total_registered
-
-            raise PysSignal(
-                result.failure(
-                    PysTraceback(
-                        TypeError(
-                            f"{self.__qualname__}() takes no arguments ({given_arguments} given)"
-                            if code_parameters_length == 0 else
-                            f"{self.__qualname__}() takes {code_parameters_length} positional argument"
-                            f"{'' if code_parameters_length == 1 else 's'} but {given_arguments} were given"
-                        ),
-                        context,
-                        position
-                    )
-                )
-            )
-
         code_body = code.body
 
         result.register(
@@ -258,6 +375,7 @@ class PysPythonFunction(PysFunction):
         setimuattr(self, '__code__',     PysCode(
             context=None,
             position=None,
+            call_site=(None, None),
             handle_call=handle_call
         ))
 
@@ -269,8 +387,8 @@ class PysPythonFunction(PysFunction):
 
     def __call__(self, *args, **kwargs) -> Any:
         code = self.__code__
-        context = code.context
-        position = code.position
+        site = get_call_site()
+        context, position = site[1] if site is not None and site[0] is code else code.call_site
         func = self.__func__
 
         code.handle_call(func, context, position)
@@ -174,7 +174,10 @@ class PysExecuteResult(PysResult):
                     return 0, True
                 elif type(self.error.exception) is SystemExit:
                     return self.error.exception.code, True
-                elif (excepthook := pys_sys.excepthook) is not None:
+
+                self.error.set_last()
+
+                if (excepthook := pys_sys.excepthook) is not None:
                     # circular import problem solved
                     from .handlers import handle_call
                     handle_call(excepthook, context, position)
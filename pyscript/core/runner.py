@@ -2,8 +2,8 @@ from .analyzer import PysAnalyzer
 from .buffer import PysFileBuffer
 from .cache import pys_sys, undefined, PysUndefined
 from .constants import (
-    LIBRARIES_PATH, OTHER_PATH, SITE_PACKAGES_PATH, DEFAULT, SILENT, RETURN_RESULT, NO_COLOR, DONT_SHOW_BANNER_ON_SHELL,
-    CLASSIC_LINE_SHELL, NO_COLOR_PROMPT
+    LIBRARIES_PATH, OTHER_PATH, SITE_PACKAGES_PATH, DEFAULT, DEBUG, SILENT, RETURN_RESULT, NO_COLOR,
+    DONT_SHOW_BANNER_ON_SHELL, CLASSIC_LINE_SHELL, NO_COLOR_PROMPT, COMPILE_CLOSURE, OPTIMIZE
 )
 from .context import PysContext
 from .exceptions import PysTraceback, PysSignal
@@ -11,30 +11,44 @@ from .handlers import handle_call
 from .interpreter import get_visitor
 from .lexer import PysLexer
 from .mapping import GET_ACOLOR
+from .nodes import PysNode
+from .optimizer import PysOptimizer
 from .parser import PysParser
 from .position import PysPosition
+from .profiler import PysProfiler
+from .pystypes import PysCompiledCode
 from .pysbuiltins import require
 from .results import PysRunTimeResult, PysExecuteResult
-from .shell import PysClassicLineShell, PysPromptToolkitLineShell, ADVANCE_LINE_SHELL_SUPPORT
+from .serializer import load_cache, save_cache
 from .symtab import PysSymbolTable, new_module_namespace
 from .utils.debug import import_readline
 from .utils.decorators import TYPECHECK_STACK, typecheck
 from .utils.generic import dclear, get_frame, get_locals
 from .version import version
 
+from collections import OrderedDict
+from threading import Lock
 from types import ModuleType
 from typing import Any, Literal, Optional
 
 import os
 import sys
 
+# maximum number of compiled string sources kept by pys_exec, pys_eval, exec and eval
+COMPILE_CACHE_SIZE = 256
+
+_compile_cache = OrderedDict()
+_compile_cache_lock = Lock()
+
 def _namespace_to_symbol_table(
     namespace: PysUndefined | PysSymbolTable | dict | None,
-    file: PysFileBuffer
+    file: PysFileBuffer | PysCompiledCode
 ) -> PysSymbolTable:
     if namespace is None:
         symbol_table, _ = new_module_namespace(symbols=get_locals(2 + TYPECHECK_STACK))
     elif namespace is undefined:
+        if isinstance(file, PysCompiledCode):
+            file = file.file
         symbol_table, _ = new_module_namespace(file=file.name, name='__main__')
     elif isinstance(namespace, dict):
         symbol_table, _ = new_module_namespace(symbols=namespace)
@@ -44,15 +58,124 @@ def _namespace_to_symbol_table(
         raise TypeError('non-namespace object')
     return symbol_table
 
+def _compile(
+    file: PysFileBuffer,
+    mode: Literal['exec', 'eval', 'single'],
+    context: PysContext,
+    parser_flags: int,
+    use_cache: bool
+) -> tuple[PysNode, int, None] | tuple[None, int, PysTraceback]:
+
+    context_parent = context.parent
+    context_parent_entry_position = context.parent_entry_position
+
+    lexer = PysLexer(
+        file=file,
+        flags=context.flags,
+        context_parent=context_parent,
+        context_parent_entry_position=context_parent_entry_position
+    )
+
+    # the parser reads the tokens while they are made, the whole file is never held as tokens
+    tokens = lexer.iter_tokens()
+
+    parser = PysParser(
+        tokens=tokens,
+        flags=context.flags,
+        parser_flags=parser_flags,
+        context_parent=context_parent,
+        context_parent_entry_position=context_parent_entry_position
+    )
+
+    node, error = parser.parse(parser.expression if mode == 'eval' else None)
+
+    if error and lexer.error is None:
+        # a lexer error is reported first, as if the file had been tokenized before parsing
+        for _ in tokens:
+            pass
+
+    if lexer.error:
+        return None, parser_flags, lexer.error
+    elif error:
+        return None, parser_flags, error
+
+    analyzer = PysAnalyzer(
+        node=node,
+        flags=parser.flags,
+        context_parent=context_parent,
+        context_parent_entry_position=context_parent_entry_position
+    )
+
+    error = analyzer.analyze()
+    if error:
+        return None, parser_flags, error
+
+    if parser.parser_flags & OPTIMIZE:
+        # optimized before it is cached, the cache is keyed by the flags the optimizer depends on (DEBUG)
+        node = PysOptimizer(node, context.flags).optimize()
+
+    if use_cache:
+        save_cache(file, parser_flags, node, parser.parser_flags, context.flags)
+
+    return node, parser.parser_flags, None
+
+def _compile_code(
+    file: PysFileBuffer,
+    mode: Literal['exec', 'eval', 'single'],
+    context: PysContext,
+    parser_flags: int,
+    use_cache: bool = False,
+    compile_cache: bool = False
+) -> tuple[PysCompiledCode, None] | tuple[None, PysTraceback]:
+
+    if compile_cache:
+        key = (file.text, file.name, mode, context.flags, parser_flags)
+        with _compile_cache_lock:
+            code = _compile_cache.get(key, None)
+            if code is not None:
+                _compile_cache.move_to_end(key)
+                return code, None
+
+    cached = load_cache(file, parser_flags, context.flags) if use_cache else None
+
+    try:
+
+        if cached is None:
+            node, result_parser_flags, error = _compile(file, mode, context, parser_flags, use_cache)
+            if error:
+                return None, error
+        else:
+            node, result_parser_flags = cached
+
+    except RecursionError:
+        return None, PysTraceback(
+            RecursionError("maximum recursion depth exceeded during complication"),
+            context,
+            PysPosition(file, -1, -1)
+        )
+
+    code = PysCompiledCode(file, mode, node, context.flags, result_parser_flags)
+
+    if compile_cache:
+        with _compile_cache_lock:
+            _compile_cache[key] = code
+            if len(_compile_cache) > COMPILE_CACHE_SIZE:
+                _compile_cache.popitem(last=False)
+
+    return code, None
+
 @typecheck
 def pys_runner(
-    file: PysFileBuffer,
+    file: PysFileBuffer | PysCompiledCode,
     mode: Literal['exec', 'eval', 'single'],
     symbol_table: PysSymbolTable,
     flags: Optional[int] = None,
     parser_flags: int = DEFAULT,
     context_parent: Optional[PysContext] = None,
-    context_parent_entry_position: Optional[PysPosition] = None
+    context_parent_entry_position: Optional[PysPosition] = None,
+    use_cache: bool = False,
+    compile_cache: bool = False,
+    profiler: Optional[PysProfiler] = None
 ) -> PysExecuteResult:
 
     """
@@ -60,7 +183,10 @@ def pys_runner(
 
     Parameters
     ----------
-    - file : Buffer object from PysFileBuffer (`pyscript.core.buffer.PysFileBuffer`).
+    - file : Buffer object from PysFileBuffer (`pyscript.core.buffer.PysFileBuffer`), or a compiled code object from
+             pys_compile (`pyscript.core.pystypes.PysCompiledCode`) which is executed without compiling it again. A
+             code compiled in 'eval' mode is only run in 'eval' mode and the other codes are not, ValueError is raised
+             otherwise. A compiled code always runs with the DEBUG flag it was compiled with.
 
     - mode : Complication and execution mode. 'exec' to compile a whole code block, 'eval' to compile a single
              expression. 'single' is typically used for interactive shells (prints the result value, compile within a
@@ -69,9 +195,11 @@ def pys_runner(
     - symbol_table : Symbol table scope (`pyscript.core.symtab.PysSymbolTable`).
 
     - flags : A special flag (If None then it automatically uses flags from context_parent, and if not available then
-              flags are set to DEFAULT).
+              flags are set to DEFAULT). With COMPILE_CLOSURE, the node is compiled into Python closures before it is
+              executed instead of walking the tree.
 
-    - parser_flags : A special parser flag.
+    - parser_flags : A special parser flag. With OPTIMIZE, constant expressions are folded and unreachable branches
+                     are removed before the node is executed.
 
     - context_parent : The parent context object, useful for linking tracebacks (context_parent_entry_position is
                        required).
@@ -79,6 +207,16 @@ def pys_runner(
     - context_parent_entry_position : The last parent position object, useful for specifying the row and column
                                       sections in the traceback (context_parent is required).
 
+    - use_cache : Load the analyzed node from the `__pyscache__` directory next to the file, and save it there after
+                  it is analyzed and optimized (used by require to import modules).
+
+    - compile_cache : Keep the compiled code in an in-memory LRU cache keyed by the source text, file name, mode and
+                      flags, so executing the same source again skips the complication (used by pys_exec, pys_eval,
+                      exec and eval).
+
+    - profiler : A profiler object (`pyscript.core.profiler.PysProfiler`) that profiles the execution of the node, the
+                 compilation is not profiled.
+
     Returns
     -------
     A PysExecuteResult object (`pyscript.core.results.PysExecuteResult`), which contains the execution result value,
@@ -88,6 +226,23 @@ def pys_runner(
     if TYPECHECK_STACK > 0 and (context_parent is None) != (context_parent_entry_position is None):
         raise TypeError("context_parent and context_parent_entry_position both must be filled in")
 
+    if isinstance(file, PysCompiledCode):
+        code = file
+        file = code.file
+
+        # an expression and a block of statements are not interchangeable ('exec' and 'single' are)
+        if (code.mode == 'eval') != (mode == 'eval'):
+            raise ValueError(f"code compiled in {code.mode!r} mode cannot be run in {mode!r} mode")
+
+        if flags is None:
+            flags = DEFAULT if context_parent is None else context_parent.flags
+
+        # the optimizer folded __debug__ and removed the asserts with the DEBUG flag of the compilation
+        flags = (flags & ~DEBUG) | (code.flags & DEBUG)
+
+    else:
+        code = None
+
     context = PysContext(
         file=file,
         name='<program>',
@@ -104,61 +259,31 @@ def pys_runner(
     runtime_result._position = position = PysPosition(file, -1, -1)
     with runtime_result:
 
-        try:
-
-            lexer = PysLexer(
-                file=file,
-                flags=context.flags,
-                context_parent=context_parent,
-                context_parent_entry_position=context_parent_entry_position
-            )
-
-            tokens, error = lexer.make_tokens()
-            if error:
-                return result.failure(error)
-
-            parser = PysParser(
-                tokens=tokens,
-                flags=context.flags,
-                parser_flags=parser_flags,
-                context_parent=context_parent,
-                context_parent_entry_position=context_parent_entry_position
-            )
-
-            node, error = parser.parse(parser.expression if mode == 'eval' else None)
+        if code is None:
+            code, error = _compile_code(file, mode, context, parser_flags, use_cache and mode == 'exec', compile_cache)
             if error:
                 return result.failure(error)
 
-            analyzer = PysAnalyzer(
-                node=node,
-                flags=parser.flags,
-                context_parent=context_parent,
-                context_parent_entry_position=context_parent_entry_position
-            )
-
-            error = analyzer.analyze()
-            if error:
-                return result.failure(error)
-
-        except RecursionError:
-            return result.failure(
-                PysTraceback(
-                    RecursionError("maximum recursion depth exceeded during complication"),
-                    context,
-                    position
-                )
-            )
-
-        result.parser_flags = parser.parser_flags
+        result.parser_flags = code.parser_flags
         pys_sys.flags = context.flags
 
         try:
-            del file, flags, symbol_table, context_parent, context_parent_entry_position, \
-                lexer, tokens, error, parser, analyzer
+            del file, flags, symbol_table, context_parent, context_parent_entry_position
         except:
             pass
 
-        visitor_result = get_visitor(node.__class__)(node, context)
+        if profiler is not None:
+            profiler.start()
+
+        try:
+            if context.flags & COMPILE_CLOSURE:
+                visitor_result = code.get_closure()(context)
+            else:
+                node = code.get_node()
+                visitor_result = get_visitor(node.__class__)(node, context)
+        finally:
+            if profiler is not None:
+                profiler.stop()
 
         if visitor_result.error:
             return result.failure(visitor_result.error)
@@ -171,6 +296,49 @@ def pys_runner(
 
     return result.failure(runtime_result.error) if runtime_result.error else result
 
+@typecheck
+def pys_compile(
+    source,
+    mode: Literal['exec', 'eval', 'single'] = 'exec',
+    flags: int = DEFAULT,
+    parser_flags: int = DEFAULT
+) -> PysCompiledCode:
+
+    """
+    Compile a PyScript code from source given into a code object, which can be executed many times by pys_exec,
+    pys_eval, exec and eval without compiling the source again.
+
+    Parameters
+    ----------
+    - source : A valid PyScript source code.
+
+    - mode : Complication mode. 'exec' to compile a whole code block, 'eval' to compile a single expression, 'single'
+             for interactive code.
+
+    - flags : A special flags.
+
+    - parser_flags : A special parser flags. With OPTIMIZE, the code is optimized once here.
+
+    Returns
+    -------
+    A PysCompiledCode object (`pyscript.core.pystypes.PysCompiledCode`). A PysSignal is raised if the source is not
+    valid.
+    """
+
+    file = PysFileBuffer(source)
+    code, error = _compile_code(
+        file=file,
+        mode=mode,
+        context=PysContext(file=file, name='<program>', flags=flags),
+        parser_flags=parser_flags,
+        compile_cache=True
+    )
+
+    if error:
+        raise PysSignal(PysRunTimeResult().failure(error))
+
+    return code
+
 @typecheck
 def pys_exec(
     source,
@@ -184,7 +352,8 @@ def pys_exec(
 
     Parameters
     ----------
-    - source : A valid PyScript source code.
+    - source : A valid PyScript source code or a compiled code object from pys_compile. Compiled string sources are
+               kept in an LRU cache, so executing the same source again only costs the execution.
 
     - globals : A namespace dictionary or symbol table that can be accessed.
                 If it is None, it uses the current global namespace at the Python level.
@@ -200,14 +369,15 @@ def pys_exec(
     which contains the execution result value, error, and the context after execution. Otherwise, it returns None.
     """
 
-    file = PysFileBuffer(source)
+    file = source if isinstance(source, PysCompiledCode) else PysFileBuffer(source)
 
     result = pys_runner(
         file=file,
         mode='exec',
         symbol_table=_namespace_to_symbol_table(globals, file),
         flags=flags,
-        parser_flags=parser_flags
+        parser_flags=parser_flags,
+        compile_cache=True
     )
 
     if flags & RETURN_RESULT:
@@ -229,7 +399,8 @@ def pys_eval(
 
     Parameters
     ----------
-    - source : A valid PyScript (Expression) source code.
+    - source : A valid PyScript (Expression) source code or a compiled code object from pys_compile. Compiled string
+               sources are kept in an LRU cache, so evaluating the same source again only costs the execution.
 
     - globals : A namespace dictionary or symbol table that can be accessed.
                 If it is None, it uses the current global namespace at the Python level.
@@ -246,14 +417,15 @@ def pys_eval(
     execution result value directly.
     """
 
-    file = PysFileBuffer(source)
+    file = source if isinstance(source, PysCompiledCode) else PysFileBuffer(source)
 
     result = pys_runner(
         file=file,
         mode='eval',
         symbol_table=_namespace_to_symbol_table(globals, file),
         flags=flags,
-        parser_flags=parser_flags
+        parser_flags=parser_flags,
+        compile_cache=True
     )
 
     if flags & RETURN_RESULT:
@@ -313,6 +485,9 @@ def pys_shell(
     if getattr(pys_sys, '__running_shell__', False):
         raise RuntimeError("another shell is still running")
 
+    # the shells import prompt_toolkit, they are only loaded when a shell runs
+    from .shell import PysClassicLineShell, PysPromptToolkitLineShell, ADVANCE_LINE_SHELL_SUPPORT
+
     line = 0
     current_parser_flags = parser_flags
     file = PysFileBuffer('', '<pyscript-shell>')
@@ -0,0 +1,230 @@
+from .buffer import PysFileBuffer
+from .cache import intern_object
+from .constants import DEFAULT, DEBUG, ENV_PYSCRIPT_NO_CACHE, ENV_PYSCRIPT_CACHE_PATH
+from .nodes import PysNode
+from .position import PysPosition
+from .pystypes import jsdict
+from .token import PysToken
+from .utils.generic import setimuattr, is_environ
+from .utils.path import base
+from .version import __version__, version
+
+from hashlib import blake2b
+from typing import Any
+
+import marshal
+import os
+
+CACHE_DIRECTORY = '__pyscache__'
+CACHE_EXTENSION = '.pysc'
+CACHE_TAG = 'pyscript-' + __version__.replace('.', '')
+CACHE_PATH = os.environ.get(ENV_PYSCRIPT_CACHE_PATH)
+NO_CACHE = is_environ(ENV_PYSCRIPT_NO_CACHE)
+# flags that change a cached node (the optimizer removes the branches of __debug__), they are part of the cache key
+CACHE_FLAGS = DEBUG
+
+S_NODE = 0
+S_TOKEN = 1
+S_POSITION = 2
+S_TUPLE = 3
+S_LIST = 4
+S_SLICE = 5
+S_TYPE = 6
+S_DICT = 7
+
+# slots of runtime state (the inline caches of the interpreter), they are not encoded and start empty
+TRANSIENT_SLOTS = frozenset(['method_cache'])
+
+NODE_CLASSES = {class_node.__name__: class_node for class_node in PysNode.__subclasses__()}
+NODE_SLOTS = {
+    class_node: ('position',) + tuple(
+        slot for slot in class_node.__slots__
+        if slot != 'position' and slot not in TRANSIENT_SLOTS
+    )
+    for class_node in NODE_CLASSES.values()
+}
+NODE_TRANSIENT_SLOTS = {
+    class_node: tuple(slot for slot in class_node.__slots__ if slot in TRANSIENT_SLOTS)
+    for class_node in NODE_CLASSES.values()
+}
+TYPES = {'dict': dict, 'jsdict': jsdict}
+
+# caches written with a different node layout (added or removed node slots) are outdated
+NODE_LAYOUT = blake2b(
+    repr(sorted((class_node.__name__, slots) for class_node, slots in NODE_SLOTS.items())).encode('utf-8'),
+    digest_size=8
+).digest()
+
+PRIMITIVES = frozenset([type(None), bool, int, float, complex, str, bytes, type(...)])
+
+def encode(value: Any) -> Any:
+    vtype = value.__class__
+
+    if vtype in PRIMITIVES:
+        return value
+
+    elif vtype is PysToken:
+        position = value.position
+        return (S_TOKEN, value.type, position.start, position.end, encode(value.value))
+
+    elif vtype is PysPosition:
+        return (S_POSITION, value.start, value.end)
+
+    elif vtype is tuple:
+        return (S_TUPLE,) + tuple(encode(element) for element in value)
+
+    elif vtype is list:
+        return (S_LIST,) + tuple(encode(element) for element in value)
+
+    elif vtype is slice:
+        return (S_SLICE, encode(value.start), encode(value.stop), encode(value.step))
+
+    elif vtype is type and value.__name__ in TYPES:
+        return (S_TYPE, value.__name__)
+
+    elif vtype is dict:
+        return (S_DICT,) + tuple((encode(key), encode(element)) for key, element in value.items())
+
+    elif vtype in NODE_SLOTS:
+        return (S_NODE, vtype.__name__) + tuple(encode(getattr(value, slot)) for slot in NODE_SLOTS[vtype])
+
+    raise TypeError(f"cannot serialize {vtype.__name__!r} object")
+
+def decode(value: Any, file: PysFileBuffer, positions: dict[tuple[int, int], PysPosition]) -> Any:
+    if value.__class__ is not tuple:
+        return intern_object(value) if value.__class__ in (int, float, complex, str, bytes) else value
+
+    tag = value[0]
+
+    if tag == S_NODE:
+        class_node = NODE_CLASSES[value[1]]
+        node = object.__new__(class_node)
+        for slot, element in zip(NODE_SLOTS[class_node], value[2:]):
+            setimuattr(node, slot, decode(element, file, positions))
+        for slot in NODE_TRANSIENT_SLOTS[class_node]:
+            setimuattr(node, slot, None)
+        return node
+
+    elif tag == S_TOKEN:
+        return PysToken(value[1], get_position(file, positions, value[2], value[3]), decode(value[4], file, positions))
+
+    elif tag == S_POSITION:
+        return get_position(file, positions, value[1], value[2])
+
+    elif tag == S_TUPLE:
+        return tuple(decode(element, file, positions) for element in value[1:])
+
+    elif tag == S_LIST:
+        return [decode(element, file, positions) for element in value[1:]]
+
+    elif tag == S_SLICE:
+        return slice(*(decode(element, file, positions) for element in value[1:]))
+
+    elif tag == S_TYPE:
+        return TYPES[value[1]]
+
+    elif tag == S_DICT:
+        return {decode(key, file, positions): decode(element, file, positions) for key, element in value[1:]}
+
+    raise ValueError(f"invalid serialized tag: {tag!r}")
+
+def get_position(
+    file: PysFileBuffer,
+    positions: dict[tuple[int, int], PysPosition],
+    start: int,
+    end: int
+) -> PysPosition:
+    key = (start, end)
+    position = positions.get(key, None)
+    if position is None:
+        position = positions[key] = PysPosition(file, start, end)
+    return position
+
+def get_source_hash(file: PysFileBuffer) -> bytes:
+    return blake2b(file.text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+def get_cache_path(path: str) -> str:
+
+    """
+    Returns the path of the cache file from a module path.
+    If the PYSCRIPT_CACHE_PATH environment is set, the cache tree is created under that directory.
+    """
+
+    directory, name = os.path.split(os.path.abspath(path))
+    filename = f'{base(name)}.{CACHE_TAG}{CACHE_EXTENSION}'
+
+    if CACHE_PATH:
+        drive, directory = os.path.splitdrive(directory)
+        return os.path.join(CACHE_PATH, drive.replace(':', ''), directory.lstrip(os.path.sep), filename)
+
+    return os.path.join(directory, CACHE_DIRECTORY, filename)
+
+def load_cache(file: PysFileBuffer, parser_flags: int, flags: int = DEFAULT) -> tuple[PysNode, int] | None:
+
+    """
+    Load the analyzed (and optimized with OPTIMIZE) node of a file from the cache. Returns a tuple of node and parser
+    flags after parsing, or None if the cache is not available, outdated or made with other flags.
+    """
+
+    if NO_CACHE:
+        return None
+
+    try:
+        with open(get_cache_path(file.name), 'rb') as cache:
+            (
+                cache_version, node_layout, source_hash, cache_parser_flags, cache_flags, result_parser_flags, data
+            ) = marshal.load(cache)
+
+        if (
+            cache_version != version or
+            node_layout != NODE_LAYOUT or
+            cache_parser_flags != parser_flags or
+            cache_flags != flags & CACHE_FLAGS or
+            source_hash != get_source_hash(file)
+        ):
+            return None
+
+        return decode(data, file, {}), result_parser_flags
+
+    except Exception:
+        return None
+
+def save_cache(
+    file: PysFileBuffer,
+    parser_flags: int,
+    node: PysNode,
+    result_parser_flags: int,
+    flags: int = DEFAULT
+) -> bool:
+
+    """
+    Save the analyzed (and optimized with OPTIMIZE) node of a file to the cache. Returns whether the cache was written.
+    """
+
+    if NO_CACHE:
+        return False
+
+    path = get_cache_path(file.name)
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+
+    try:
+        data = marshal.dumps(
+            (
+                version, NODE_LAYOUT, get_source_hash(file), parser_flags, flags & CACHE_FLAGS, result_parser_flags,
+                encode(node)
+            )
+        )
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary_path, 'wb') as cache:
+            cache.write(data)
+        os.replace(temporary_path, path)
+
+        return True
+
+    except Exception:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        return False
\ No newline at end of file
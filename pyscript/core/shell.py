@@ -7,7 +7,7 @@ from .utils.debug import print_traceback
 from .utils.decorators import singleton
 from .utils.path import normpath
 
-from typing import Iterable, Literal, Optional
+from typing import Iterable, Literal
 
 import os
 import sys
@@ -232,6 +232,37 @@ try:
         except:
             MAXIMUM_HISTORY_LINE = 1000
 
+    # the history file is an append-only log of records, a record starts with '\x1e' at the beginning of a line. The
+    # records past the maximum are dropped by a compaction once they exceed it by a quarter, so that the rewrite of
+    # the file is amortized over the appends
+    HISTORY_COMPACTION_SLACK = max(MAXIMUM_HISTORY_LINE // 4, 1)
+
+    if sys.platform == 'win32':
+        from msvcrt import locking, LK_LOCK, LK_UNLCK
+
+        def lock_file(file) -> None:
+            file.seek(0)
+            locking(file.fileno(), LK_LOCK, 1)
+
+        def unlock_file(file) -> None:
+            file.seek(0)
+            locking(file.fileno(), LK_UNLCK, 1)
+
+    else:
+        from fcntl import flock, LOCK_EX, LOCK_UN
+
+        def lock_file(file) -> None:
+            flock(file.fileno(), LOCK_EX)
+
+        def unlock_file(file) -> None:
+            flock(file.fileno(), LOCK_UN)
+
+    def decode_history_record(record: bytes) -> str:
+        return '\n'.join(
+            line.removesuffix('\r')
+            for line in record.removeprefix(b'\x1e').removesuffix(b'\n').decode('utf-8', 'replace').split('\n')
+        )
+
     @singleton
     class PysHistory(Pys, History):
 
@@ -240,67 +271,171 @@ try:
                 return super().__new__(cls)
             raise NotImplementedError('not using file history')
 
-        def update_history(self, append_string: Optional[str] = None) -> list[str]:
+        def __init__(self) -> None:
+            History.__init__(self)
+            # index of the file: the offsets of the records, the end of the indexed part and the last record, which
+            # tells whether the file was rewritten by another session
+            self._offsets = []
+            self._end = 0
+            self._last_record = b''
+
+        def open_history(self):
+            file = open(HISTORY_PATH, 'a+b')
+
             try:
+                lock_file(file)
+            except:
+                file.close()
+                raise
 
-                if MAXIMUM_HISTORY_LINE == 0:
-                    with open(HISTORY_PATH, 'w', encoding='utf-8') as file:
-                        file.write('')
-                    return []
+            return file
 
-                strings = []
-                lines = []
-                update_history = False
+        def close_history(self, file) -> None:
+            try:
+                file.flush()
+                unlock_file(file)
+            finally:
+                file.close()
+
+        def reset_index(self) -> None:
+            self._offsets.clear()
+            self._end = 0
+            self._last_record = b''
+
+        def scan_history(self, file, start: int) -> list[bytes]:
 
-                if os.path.isfile(HISTORY_PATH):
+            """
+            Indexes the records of the file from the offset `start` to the end, returns them.
+            """
 
-                    def add_to_string():
-                        if not lines:
-                            return
-                        strings.append('\n'.join(lines))
+            offsets = self._offsets
+            records = []
+            lines = []
+            position = start
+
+            file.seek(start)
+
+            for line in file:
+                if line.startswith(b'\x1e') or not offsets:
+                    if lines:
+                        records.append(b''.join(lines))
                         lines.clear()
+                    offsets.append(position)
 
-                    with open(HISTORY_PATH, 'r', encoding='utf-8') as file:
+                lines.append(line)
+                position += len(line)
 
-                        for line in file:
-                            line = line[:-1]
-                            if line.startswith('\x1e'):
-                                add_to_string()
-                                line = line[1:]
-                            lines.append(line)
+            if lines:
+                records.append(b''.join(lines))
 
-                        add_to_string()
+            self._end = position
 
-                else:
-                    update_history = True
+            if offsets:
+                file.seek(offsets[-1])
+                self._last_record = file.read(position - offsets[-1])
+
+            return records
+
+        def synchronize_history(self, file) -> None:
+
+            """
+            Brings the index up to date with the records appended by the other sessions since the last access, or
+            indexes the file again if it was compacted or cleared.
+            """
+
+            size = file.seek(0, os.SEEK_END)
+            end = self._end
+
+            if self._offsets and size >= end:
+                last = self._offsets[-1]
+                file.seek(last)
+
+                if file.read(end - last) == self._last_record:
+                    if size > end:
+                        self.scan_history(file, end)
+                    return
+
+            self.reset_index()
+            self.scan_history(file, 0)
+
+        def compact_history(self, file) -> None:
+            offsets = self._offsets
+            if len(offsets) <= MAXIMUM_HISTORY_LINE + HISTORY_COMPACTION_SLACK:
+                return
+
+            start = offsets[-MAXIMUM_HISTORY_LINE]
+            file.seek(start)
+            data = file.read()
+
+            # the file is opened for appending, the kept records are written from the beginning once it is truncated
+            file.seek(0)
+            file.truncate()
+            file.write(data)
+
+            self._offsets = [offset - start for offset in offsets[-MAXIMUM_HISTORY_LINE:]]
+            self._end = len(data)
+
+        def clear_history(self, file) -> None:
+            file.seek(0)
+            file.truncate()
+            self.reset_index()
+
+        def load_history_strings(self) -> Iterable[str]:
+            try:
+                file = self.open_history()
+
+                try:
 
-                if append_string is not None:
-                    strings.append(append_string)
-                    update_history = True
+                    if MAXIMUM_HISTORY_LINE == 0:
+                        self.clear_history(file)
+                        return []
 
-                if MAXIMUM_HISTORY_LINE > 0 and len(strings) > MAXIMUM_HISTORY_LINE:
-                    del strings[:-MAXIMUM_HISTORY_LINE]
-                    update_history = True
+                    self.reset_index()
+                    records = self.scan_history(file, 0)
 
-                if update_history:
-                    with open(HISTORY_PATH, 'w', encoding='utf-8') as file:
-                        file.writelines(f'\x1e{line}\n' for line in strings)
+                    if MAXIMUM_HISTORY_LINE > 0:
+                        self.compact_history(file)
+                        del records[:-MAXIMUM_HISTORY_LINE]
 
-                return strings
+                finally:
+                    self.close_history(file)
 
             except:
                 return []
 
-        def load_history_strings(self) -> Iterable[str]:
-            return reversed(self.update_history())
+            return map(decode_history_record, reversed(records))
 
         def store_string(self, string: str) -> None:
-            self.update_history(string)
+            try:
+                file = self.open_history()
+
+                try:
+
+                    if MAXIMUM_HISTORY_LINE == 0:
+                        self.clear_history(file)
+                        return
+
+                    self.synchronize_history(file)
+
+                    record = f'\x1e{string}\n'.encode('utf-8', 'replace')
+                    self._offsets.append(self._end)
+                    self._end += len(record)
+                    self._last_record = record
+                    file.write(record)
+
+                    if MAXIMUM_HISTORY_LINE > 0:
+                        self.compact_history(file)
+
+                finally:
+                    self.close_history(file)
+
+            except:
+                pass
 
         def append_string(self, string: str) -> None:
             if MAXIMUM_HISTORY_LINE == 0:
                 self._loaded_strings.clear()
-                self.update_history()
+                self.store_string(string)
                 return
 
             elif MAXIMUM_HISTORY_LINE > 0:
@@ -311,7 +446,7 @@ try:
                     del self._loaded_strings[:-MAXIMUM_HISTORY_LINE]
 
             self._loaded_strings.insert(0, string)
-            self.update_history(string)
+            self.store_string(string)
 
     history = (PysHistory if USE_FILE_HISTORY else InMemoryHistory)()
 
@@ -71,6 +71,135 @@ class PysClassSymbolTable(PysSymbolTable):
     def __init__(self, parent: PysSymbolTable) -> None:
         super().__init__(parent)
 
+class PysFrameSymbolTable(PysSymbolTable):
+
+    """
+    Symbol table of a function call. Local names resolved by the analyzer are stored by index in the `values` list,
+    other names (globals, names created by exec, etc.) are kept in the dictionary like a regular symbol table.
+    """
+
+    __slots__ = ('indexes', 'values')
+
+    # the dictionary slot of PysSymbolTable, `symbols` is redefined below as a property
+    _symbols = PysSymbolTable.symbols
+
+    def __init__(self, parent: PysSymbolTable, indexes: dict[str, int], values: list[Any]) -> None:
+        setimuattr(self, 'parent', parent)
+        setimuattr(self, '_symbols', {})
+        setimuattr(self, 'globals', set())
+        setimuattr(self, 'indexes', indexes)
+        setimuattr(self, 'values', values)
+
+    @property
+    def symbols(self) -> dict[str, Any]:
+        values = self.values
+
+        if values.__class__ is list:
+            # the dictionary is exposed (locals(), vars(), etc.) and can be modified, so the local values are moved
+            # into it and the slots are redirected to the dictionary
+            symbols = self._symbols
+            names = tuple(self.indexes)
+
+            for name, value in zip(names, values):
+                if value is not undefined:
+                    dsetitem(symbols, name, value)
+
+            setimuattr(self, 'values', PysSpilledValues(symbols, names))
+
+        return self._symbols
+
+    def get(self, name: str) -> Any | PysUndefined:
+        index = dget(self.indexes, name, None)
+        value = dget(self._symbols, name, undefined) if index is None else self.values[index]
+
+        if value is undefined:
+            parent = self.parent
+            if parent:
+                return parent.get(name)
+
+        return value
+
+    def set(self, name: str, value: Any, *, operand: int = TOKENS['EQUAL']) -> bool:
+        index = dget(self.indexes, name, None)
+
+        if index is None:
+            symbols = self._symbols
+
+            if is_equal(operand):
+                if name in self.globals and (parent := self.parent):
+                    return parent.set(name, value, operand=operand)
+                dsetitem(symbols, name, value)
+                return True
+
+            elif not dcontains(symbols, name):
+                return (
+                    parent.set(name, value, operand=operand)
+                    if name in self.globals and (parent := self.parent) else
+                    False
+                )
+
+            dsetitem(symbols, name, GET_BINARY_FUNCTION(operand)(dgetitem(symbols, name), value))
+            return True
+
+        values = self.values
+
+        if is_equal(operand):
+            values[index] = value
+            return True
+
+        current = values[index]
+        if current is undefined:
+            return False
+
+        values[index] = GET_BINARY_FUNCTION(operand)(current, value)
+        return True
+
+    def remove(self, name: str) -> bool:
+        index = dget(self.indexes, name, None)
+
+        if index is None:
+            symbols = self._symbols
+
+            if not dcontains(symbols, name):
+                return (
+                    parent.remove(name)
+                    if name in self.globals and (parent := self.parent) else
+                    False
+                )
+
+            ddelitem(symbols, name)
+            return True
+
+        values = self.values
+
+        if values[index] is undefined:
+            return False
+
+        values[index] = undefined
+        return True
+
+class PysSpilledValues(Pys):
+
+    """
+    Replaces the values list of a PysFrameSymbolTable once its dictionary is exposed, the slots are read and written
+    through the dictionary.
+    """
+
+    __slots__ = ('symbols', 'names')
+
+    def __init__(self, symbols: dict[str, Any], names: tuple[str, ...]) -> None:
+        self.symbols = symbols
+        self.names = names
+
+    def __getitem__(self, index: int) -> Any | PysUndefined:
+        return dget(self.symbols, self.names[index], undefined)
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        if value is undefined:
+            self.symbols.pop(self.names[index], None)
+        else:
+            dsetitem(self.symbols, self.names[index], value)
+
 def find_closest(symbol_table: PysSymbolTable, name: str) -> str | None:
     symbols = set(dkeys(symbol_table.symbols))
     update = symbols.update
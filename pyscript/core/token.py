@@ -1,5 +1,5 @@
 from .bases import Pys
-from .utils.decorators import TYPECHECK_STACK, immutable
+from .utils.decorators import DEBUG_TYPECHECK, immutable
 from .utils.generic import setimuattr
 
 from types import MappingProxyType
@@ -97,10 +97,10 @@ class PysToken(Pys):
 
     __slots__ = ('type', 'position', 'value')
 
-    # cannot use @pyscript.core.utils.decorator.typecheck because the 'PysPosition' annotation is unknown at runtime
-    # so checking arguments is doing manually.
+    # cannot use @pyscript.core.utils.decorator.debug_typecheck because the 'PysPosition' annotation is unknown at
+    # runtime so checking arguments is doing manually.
     def __init__(self, type: int, position: 'PysPosition', value: Optional[Any] = None) -> None:
-        if TYPECHECK_STACK > 0:
+        if DEBUG_TYPECHECK:
             if not isinstance(type, int):
                 raise TypeError('type must be integer')
             # circular import problem solved
@@ -2,7 +2,6 @@ from ..constants import ENV_PYSCRIPT_NO_EXCEPTHOOK, ENV_PYSCRIPT_NO_READLINE
 from ..exceptions import PysTraceback, PysSignal
 from .generic import is_environ
 
-from subprocess import run
 from sys import excepthook
 from types import TracebackType
 from typing import Any, Literal
@@ -18,6 +17,7 @@ def print_traceback(exc_type: type[BaseException], exc_value: BaseException | No
 
 def pys_excepthook(exc_type: type[BaseException], exc_value: BaseException | None, exc_tb: TracebackType) -> None:
     if exc_type is PysSignal and (traceback := exc_value.result.error) is not None:
+        traceback.set_last()
         print_traceback(None, None, traceback)
         print('\nThe above PyScript exception was the direct cause of the following exception:\n', file=sys.stderr)
     excepthook(exc_type, exc_value, exc_tb)
@@ -31,8 +31,10 @@ def import_readline() -> Literal[False]:
 USE_NOTEBOOK = False
 
 try:
-    from IPython import get_ipython
-    if type(get_ipython()).__name__ in (
+    # a shell of IPython runs with IPython already imported, importing it here would only slow down the startup (and
+    # raise the recursion limit to 3000 as a side effect of importing it, see the change log)
+    IPython = sys.modules.get('IPython', None)
+    if IPython is not None and type(IPython.get_ipython()).__name__ in (
         'ZMQInteractiveShell',     # Jupyter Notebook / Lab
         'Shell',                   # Google Colab
         'TerminalInteractiveShell' # IPython Terminal
@@ -49,10 +51,12 @@ if USE_NOTEBOOK:
 
 elif sys.platform == 'win32':
     def clear_shell() -> None:
+        from subprocess import run
         run('cls', shell=True)
 
 else:
     def clear_shell() -> None:
+        from subprocess import run
         run('clear', shell=True)
 
     if not is_environ(ENV_PYSCRIPT_NO_READLINE):
@@ -1,5 +1,5 @@
 from ..bases import Pys
-from ..constants import ENV_PYSCRIPT_NO_TYPECHECK
+from ..constants import ENV_PYSCRIPT_NO_TYPECHECK, ENV_PYSCRIPT_DEBUG_TYPECHECK
 from .generic import is_environ
 
 from types import MethodType
@@ -27,6 +27,7 @@ class _PysNameSpaceUtilities(Pys):
 
 TYPECHECK_STACK = 0
 BEARTYPE = False
+DEBUG_TYPECHECK = False
 
 def typecheck(func, *args, **kwargs):
     return func
@@ -36,9 +37,15 @@ if not is_environ(ENV_PYSCRIPT_NO_TYPECHECK):
         from beartype import beartype as typecheck
         TYPECHECK_STACK += 1
         BEARTYPE = True
+        DEBUG_TYPECHECK = is_environ(ENV_PYSCRIPT_DEBUG_TYPECHECK)
     except:
         pass
 
+def debug_typecheck(func, *args, **kwargs):
+    # the internal constructors and methods (positions, tokens, nodes, lexer, parser...) are called for every token and
+    # node, they are only checked in the debug mode (PYSCRIPT_DEBUG_TYPECHECK), the public API is always checked
+    return typecheck(func, *args, **kwargs) if DEBUG_TYPECHECK else func
+
 def immutable(cls):
     cls.__setattr__ = _PysNameSpaceUtilities.readonly_attribute
     cls.__delattr__ = _PysNameSpaceUtilities.readonly_attribute
@@ -1,4 +1,4 @@
-from inspect import currentframe
+from sys import _getframe
 from types import FrameType, UnionType
 from typing import Any, Optional, Sequence
 
@@ -21,7 +21,7 @@ ditems = dict.items
 
 def get_frame(deep: int = 0) -> FrameType | None:
     deep += 1
-    frame = currentframe()
+    frame = _getframe()
     while deep > 0 and frame:
         frame = frame.f_back
         deep -= 1
@@ -1,3 +1,4 @@
+from pyscript.core.compact import PysCompactTree
 from pyscript.core.nodes import *
 from pyscript.core.utils.string import indent
 
@@ -426,7 +427,7 @@ class DumpNode:
         return self._node_representation(node, [])
 
 def dump(
-    node: PysNode,
+    node: PysNode | PysCompactTree,
     *,
     annotate_fields: bool = True,
     include_attributes: bool = False,
@@ -438,4 +439,4 @@ def dump(
         include_attributes=include_attributes,
         indent=indent,
         show_empty=show_empty
-    ).visit(node)
\ No newline at end of file
+    ).visit(node.expand() if isinstance(node, PysCompactTree) else node)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from pyscript.core.checks import is_keyword
+from pyscript.core.compact import PysCompactTree
 from pyscript.core.mapping import SYMBOLS_TOKEN_MAP
 from pyscript.core.nodes import *
 from pyscript.core.token import TOKENS
@@ -12,7 +13,9 @@ def indent(string: str) -> str:
 def identifier(name: str) -> str:
     return f'${name}' if is_keyword(name) else name
 
-def unparse(ast_obj: PysNode) -> str:
+def unparse(ast_obj: PysNode | PysCompactTree) -> str:
+    if isinstance(ast_obj, PysCompactTree):
+        ast_obj = ast_obj.expand()
     return get_visitor(ast_obj.__class__)(ast_obj)
 
 def visit_NumberNode(node: PysNumberNode) -> str:
@@ -1,10 +1,14 @@
+from pyscript.core.compact import PysCompactTree
 from pyscript.core.nodes import *
 
 from typing import Generator
 
-def walk(node: PysNode) -> Generator[PysNode, None, None]:
+def walk(node: PysNode | PysCompactTree) -> Generator[PysNode, None, None]:
 
-    if isinstance(node, PysDictionaryNode):
+    if isinstance(node, PysCompactTree):
+        yield from walk(node.expand())
+
+    elif isinstance(node, PysDictionaryNode):
         yield node
 
         for key, value in node.pairs:
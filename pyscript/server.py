@@ -0,0 +1,336 @@
+"""
+Fork server of the launcher. `python -m pyscript --server` imports and warms up the whole core once, then waits on a
+Unix socket. With the `PYSCRIPT_SERVER` environment variable set to the path of that socket, `python -m pyscript`
+connects to the server before importing the core: the server forks a process that takes the standard streams, the
+arguments, the working directory and the environment of the client, and runs the launcher there, so the client only
+pays the startup of Python.
+
+This module is imported by `pyscript/__init__.py` before the core when `PYSCRIPT_SERVER` is set, the client side only
+imports the few modules of the standard library it needs, the others are imported by the server.
+"""
+
+import marshal
+import os
+import runpy
+import signal
+import socket
+import struct
+import sys
+
+ENV_PYSCRIPT_SERVER = 'PYSCRIPT_SERVER'
+
+SERVER_SUPPORT = hasattr(os, 'fork') and hasattr(socket, 'AF_UNIX') and hasattr(socket, 'send_fds')
+
+# the environment variables read when Python and the core are imported, a client must have the same as the server
+IMPORT_TIME_ENVIRON_PREFIXES = ('PYTHON', 'PYSCRIPT_')
+
+WARM_UP_SOURCE = """
+func add(a, b = 1) {
+    return a + b
+}
+
+class Counter {
+    constructor(start) {
+        self.count = start
+    }
+
+    func next(self) {
+        return self.count++
+    }
+}
+
+counter = Counter(0)
+for (i of range(3)) {
+    add(counter.next(), i)
+}
+"""
+
+HEADER = struct.Struct('!i')
+
+def get_default_path() -> str:
+    path = os.environ.get(ENV_PYSCRIPT_SERVER)
+    if path:
+        return path
+
+    from tempfile import gettempdir
+    return os.path.join(gettempdir(), f'pyscript-server-{os.getuid() if hasattr(os, "getuid") else 0}.sock')
+
+def _get_import_time_environ(environ: dict[str, str]) -> dict[str, str]:
+    return {
+        name: value
+        for name, value in environ.items()
+        if name.startswith(IMPORT_TIME_ENVIRON_PREFIXES) and name != ENV_PYSCRIPT_SERVER
+    }
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    data = b''
+
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed by the other side")
+        data += chunk
+
+    return data
+
+def _get_exit_code(exit: SystemExit) -> int:
+    code = exit.code
+
+    if code is None:
+        return 0
+    elif isinstance(code, int):
+        return code
+
+    print(code, file=sys.stderr)
+    return 1
+
+def _is_listening(path: str) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path)
+        return True
+    except OSError:
+        return False
+
+def is_server_client() -> bool:
+
+    """
+    Returns whether the current process is `python -m pyscript` started with the `PYSCRIPT_SERVER` environment
+    variable, that is a client of the server (the server itself excluded).
+    """
+
+    if not (SERVER_SUPPORT and os.environ.get(ENV_PYSCRIPT_SERVER) and sys.argv[:1] == ['-m']):
+        return False
+
+    # sys.argv[0] is '-m' while the module to run is imported, the module must be pyscript and not a submodule
+    orig_argv = sys.orig_argv
+    try:
+        index = orig_argv.index('-m')
+    except ValueError:
+        return False
+
+    return orig_argv[index + 1:index + 2] == ['pyscript'] and '--server' not in sys.argv
+
+def run_client(path: str | None = None) -> int | None:
+
+    """
+    Runs the arguments of the current process in the server listening on `path` (the `PYSCRIPT_SERVER` environment
+    variable by default). Returns the exit code, or None if the server is not running or refused the client (a
+    different environment or Python executable), the launcher is then started normally.
+    """
+
+    try:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path or get_default_path())
+    except OSError:
+        return None
+
+    with connection:
+        request = marshal.dumps({
+            'executable': sys.executable,
+            'argv': sys.argv[1:],
+            'cwd': os.getcwd(),
+            'path': sys.path[0] if sys.path else '',
+            'environ': dict(os.environ)
+        })
+
+        try:
+            socket.send_fds(connection, [HEADER.pack(len(request))], [0, 1, 2])
+            connection.sendall(request)
+            pid, = HEADER.unpack(_receive_exactly(connection, HEADER.size))
+        except OSError:
+            return None
+
+        if pid <= 0:
+            return None
+
+        # the process of the server is not in the process group of the terminal, the signals are forwarded to it
+        def forward_signal(signum, frame):
+            try:
+                os.kill(pid, signum)
+            except OSError:
+                pass
+
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(signum, forward_signal)
+
+        try:
+            code, = HEADER.unpack(_receive_exactly(connection, HEADER.size))
+        except OSError:
+            code = 1
+
+    return code
+
+def run_as_client() -> None:
+
+    """
+    Exits with the exit code of the arguments run in the server if the current process is a client (see
+    `is_server_client`) and the server accepted it, otherwise returns and the launcher is started normally.
+    """
+
+    if is_server_client():
+        code = run_client()
+        if code is not None:
+            sys.exit(code)
+
+def _run_forked(
+    connection: socket.socket,
+    listener: socket.socket,
+    request: dict,
+    fds: list[int],
+    default_path: str
+) -> None:
+
+    listener.close()
+
+    try:
+        connection.sendall(HEADER.pack(os.getpid()))
+    except OSError:
+        os._exit(1)
+
+    for signum in (signal.SIGCHLD, signal.SIGTERM, signal.SIGHUP):
+        signal.signal(signum, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    for fd, target in zip(fds, (0, 1, 2)):
+        if fd != target:
+            os.dup2(fd, target)
+            os.close(fd)
+
+    from .core.cache import pys_sys
+
+    # the streams of the server write to the descriptors of the client now, only the buffering of stdout depends on
+    # whether it is a terminal
+    for fd, name in ((0, 'stdin'), (1, 'stdout'), (2, 'stderr')):
+        stream = getattr(sys, name)
+
+        if stream is None:
+            stream = open(fd, 'r' if fd == 0 else 'w', buffering=1 if fd == 2 else -1, closefd=False)
+            setattr(sys, name, stream)
+            setattr(sys, f'__{name}__', stream)
+            setattr(pys_sys, name, stream)
+
+        elif fd == 1:
+            stream.reconfigure(line_buffering=os.isatty(1))
+
+    os.chdir(request['cwd'])
+    os.environ.clear()
+    os.environ.update(request['environ'])
+
+    if sys.path and sys.path[0] == default_path:
+        sys.path[0] = request['path']
+
+    sys.argv = ['-m', *request['argv']]
+
+    code = 0
+
+    try:
+        runpy.run_module('pyscript', run_name='__main__', alter_sys=True)
+    except SystemExit as exit:
+        code = _get_exit_code(exit)
+    except BaseException:
+        from traceback import print_exc
+        print_exc()
+        code = 1
+
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except BaseException:
+            pass
+
+    try:
+        connection.sendall(HEADER.pack(code))
+    except OSError:
+        pass
+
+    os._exit(code & 0xFF)
+
+def pys_server(path: str | None = None, quiet: bool = False) -> int:
+
+    """
+    Runs the fork server on the Unix socket `path` (the `PYSCRIPT_SERVER` environment variable, or a file of the
+    temporary directory by default) until it is interrupted. The socket can only be used by the current user.
+    """
+
+    if not SERVER_SUPPORT:
+        raise OSError("the PyScript server is not supported on this platform")
+
+    # the core is imported by the server only, the clients start without it
+    from .core.constants import DEFAULT, COMPILE_CLOSURE
+    from .core.runner import pys_exec
+
+    # the first run of each mode imports and fills what is loaded lazily
+    for flags in (DEFAULT, COMPILE_CLOSURE):
+        pys_exec(WARM_UP_SOURCE, flags=flags)
+
+    path = path or get_default_path()
+
+    if os.path.exists(path):
+        if _is_listening(path):
+            raise OSError(f"a PyScript server is already listening on {path!r}")
+        os.unlink(path)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(umask)
+
+    listener.listen()
+
+    # the forked processes are not waited by the server
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    if not quiet:
+        print(f"PyScript server listening on {path}, set {ENV_PYSCRIPT_SERVER}={path} to use it", flush=True)
+
+    default_path = sys.path[0] if sys.path else ''
+    environ = _get_import_time_environ(os.environ)
+
+    try:
+        while True:
+            connection, _ = listener.accept()
+
+            with connection:
+                fds = []
+
+                try:
+                    data, fds, _, _ = socket.recv_fds(connection, HEADER.size, 3)
+                    request = marshal.loads(_receive_exactly(connection, HEADER.unpack(data)[0]))
+
+                    if (
+                        len(fds) != 3 or
+                        request['executable'] != sys.executable or
+                        _get_import_time_environ(request['environ']) != environ
+                    ):
+                        connection.sendall(HEADER.pack(0))
+                        continue
+
+                    # the forked process answers the client, with its pid and then the exit code
+                    if os.fork() == 0:
+                        # the forked process never goes back to the loop of the server
+                        try:
+                            _run_forked(connection, listener, request, fds, default_path)
+                        finally:
+                            os._exit(1)
+
+                except (OSError, EOFError, ValueError, TypeError, KeyError, struct.error):
+                    continue
+
+                finally:
+                    for fd in fds:
+                        os.close(fd)
+
+    except KeyboardInterrupt:
+        return 0
+
+    finally:
+        listener.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
\ No newline at end of file
@@ -20,6 +20,112 @@ def pyscript_highlight_tester():
     sys.stdout.write(result)
     sys.stdout.flush()
 
+def pyscript_highlight_stream_tester():
+    import io
+
+    # the stream gets the same code as the returned string, also with beartype (any object with write is accepted)
+    stream = io.StringIO()
+    pyscript.pys_highlight(source, pyscript.HLFMT_ANSI, file=stream)
+    assert stream.getvalue() == pyscript.pys_highlight(source, pyscript.HLFMT_ANSI)
+
+def pyscript_compile_tester():
+    # a compiled code runs only in the mode it was compiled for ('exec' and 'single' are interchangeable)
+    for code, run in (
+        (pyscript.pys_compile('x = 1', 'exec'), pyscript.pys_eval),
+        (pyscript.pys_compile('1 + 1', 'eval'), pyscript.pys_exec)
+    ):
+        try:
+            run(code, pyscript.undefined)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{run.__name__}() ran a code compiled in {code.mode!r} mode")
+
+    assert pyscript.pys_eval(pyscript.pys_compile('1 + 1', 'eval'), pyscript.undefined) == 2
+
+    # a compiled code keeps the DEBUG flag of the compilation, the optimizer folded __debug__ and the asserts with it
+    for compile_flags in (pyscript.DEFAULT, pyscript.DEBUG):
+        for run_flags in (pyscript.DEFAULT, pyscript.DEBUG):
+            for parser_flags in (pyscript.DEFAULT, pyscript.OPTIMIZE):
+                code = pyscript.pys_compile('__debug__', 'eval', flags=compile_flags, parser_flags=parser_flags)
+                result = pyscript.pys_eval(code, pyscript.undefined, run_flags | pyscript.RETURN_RESULT)
+                assert result.value is bool(compile_flags & pyscript.DEBUG)
+
+                code = pyscript.pys_compile('assert false', flags=compile_flags, parser_flags=parser_flags)
+                result = pyscript.pys_exec(code, pyscript.undefined, run_flags | pyscript.RETURN_RESULT)
+                # the asserts are disabled in debug mode
+                assert (result.error is None) == bool(compile_flags & pyscript.DEBUG)
+
+def pyscript_compact_tester():
+    import io
+    import contextlib
+    from pyscript.core.nodes import PysNode
+
+    def run(code):
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            pyscript.pys_exec(code, pyscript.undefined)
+        output = stream.getvalue()
+        assert output
+        return output
+
+    code = pyscript.pys_compile(
+        "class Point {\n"
+        "    func __init__(self, x, y) {\n"
+        "        self.x = x\n"
+        "        self.y = y\n"
+        "    }\n"
+        "}\n"
+        "\n"
+        "func fibonacci(n) {\n"
+        "    return n < 2 ? n : fibonacci(n - 1) + fibonacci(n - 2)\n"
+        "}\n"
+        "\n"
+        "for (i of range(10)) {\n"
+        "    point = Point(i, fibonacci(i))\n"
+        "    print(point.x, point.y, i % 2 == 0 ? 'even' : 'odd', [i, 'i', 1.5, none])\n"
+        "}\n"
+    )
+    compact = code.compact()
+    assert not isinstance(compact.node, PysNode)
+
+    # the compact code gives the same output as the code it comes from, and it keeps only the expanded node after it
+    assert run(compact) == run(code)
+    assert isinstance(compact.node, PysNode)
+    assert run(compact) == run(code)
+
+def pyscript_optimizer_tester():
+    from pyscript.core.nodes import PysNumberNode, PysBinaryOperatorNode, PysIdentifierNode, PysKeywordNode, \
+                                    PysAssertNode
+
+    def optimize(source, mode='eval', flags=pyscript.DEFAULT):
+        return pyscript.pys_compile(source, mode, flags, pyscript.OPTIMIZE).node
+
+    # arithmetic is folded into a constant
+    node = optimize('1 + 2 * 3 - -4')
+    assert isinstance(node, PysNumberNode) and node.value.value == 11
+
+    # string formatting with % is left to the runtime (its result size is not bounded by the operands)
+    node = optimize('"%05d" % 1')
+    assert isinstance(node, PysBinaryOperatorNode)
+    assert pyscript.pys_eval(pyscript.pys_compile('"%05d" % 1', 'eval', parser_flags=pyscript.OPTIMIZE)) == '00001'
+
+    # short-circuit operators with a constant left operand are pruned
+    for source, cls in (
+        ('false && x', PysKeywordNode),
+        ('true || x', PysKeywordNode),
+        ('true && x', PysIdentifierNode),
+        ('false || x', PysIdentifierNode)
+    ):
+        assert isinstance(optimize(source), cls), source
+    assert isinstance(optimize('x && y'), PysBinaryOperatorNode)
+
+    # the asserts are removed in debug mode (where they are disabled) and kept otherwise, unless always true
+    source = 'x = 1\nassert x\nassert true'
+    asserts = lambda node: [element for element in node.body if isinstance(element, PysAssertNode)]
+    assert len(asserts(optimize(source, 'exec'))) == 1
+    assert len(asserts(optimize(source, 'exec', pyscript.DEBUG))) == 0
+
 def pyscript_doc():
     subprocess.run(
         args='clip',